@@ -226,6 +226,7 @@ from .krylov import diagonalize
 from .krylov import rediagonalize
 from .krylov import most_mixed_wf
 from .krylov import krylov_eigenstates
+from .krylov import linear_combination
 
 
 
@@ -244,9 +245,7 @@ def selectwf(es,vs,wfs,fe,ne=1):
         del vlist[ie] # ignore in the next iteration
     wfout = [] # output wavefunctions
     for v0 in vstore: # loop over WF
-        wf = 0
-        for i in range(len(wfs)): 
-            wf = wf + np.conjugate(v0[i])*wfs[i] # add
+        wf = linear_combination(np.conjugate(v0),wfs) # add
         wf = wf.normalize()
         wfout.append(wf.copy()) # store wavefunction
     eout = np.array(estore) # convert to array
@@ -1,5 +1,6 @@
 import numpy as np
 import scipy.linalg as lg
+from ..mps import in_backend
 
 def krylov_matrix_representation(H,wfs):
     """Given a Krylov subspace, return the matrix representation"""
@@ -13,10 +14,19 @@ def krylov_matrix_representation(H,wfs):
         for i in range(nw-1):
             mh[i+1,i] = wfs[i+1].aMb(H,wfs[i]) # compute representation
             mh[i,i+1] = wfs[i].aMb(H,wfs[i+1]) # compute representation
-    else:
-        for i in range(nw):
-          for j in range(nw):
-              mh[i,j] = wfs[j].aMb(H,wfs[i]) # compute representation
+    else: mh = representation(H,wfs) # compute representation
+    return mh
+
+
+def representation(H,wfs):
+    """Matrix with the elements <wfs[j]|H|wfs[i]>"""
+    nw = len(wfs) # number of wavefunctions
+    if in_backend(wfs): # all the elements in a single call
+        return wfs[0].MBO.matrix_elements(wfs,H,wfs).T
+    mh = np.zeros((nw,nw),dtype=np.complex) # output matrix
+    for i in range(nw):
+      for j in range(nw):
+          mh[i,j] = wfs[j].aMb(H,wfs[i]) # compute representation
     return mh
 
 
@@ -25,9 +35,7 @@ def recompute_energies(H,vs,wfs):
     """Given certain eigenvectors, recompute the energies"""
     eout = [] # empty list
     for v0 in vs: # loop over WF
-        wf = 0
-        for i in range(len(wfs)):
-            wf = wf + np.conjugate(v0[i])*wfs[i] # add
+        wf = linear_combination(np.conjugate(v0),wfs) # add
         wf = wf.normalize()
         eout.append(wf.aMb(H,wf)) # compute expectation value
     return np.array(eout) # return energies
@@ -35,12 +43,25 @@ def recompute_energies(H,vs,wfs):
 
 
 
+def linear_combination(cs,wfs):
+    """Compute sum_i cs[i]*wfs[i]"""
+    if in_backend(wfs): # single call
+        return wfs[0].MBO.linear_combination(cs,wfs)
+    wf = 0
+    for i in range(len(wfs)): wf = wf + cs[i]*wfs[i] # add
+    return wf
+
+
 def gram_smith_single(w,ws):
     """Gram smith orthogonalization for a single wavefunction"""
     if len(ws)==0: return w
     out = []
     n = len(ws)
     w = w.normalize()
+    if in_backend([w]+ws): # remove all the overlaps at once
+        cs = w.MBO.matrix_elements(ws,None,[w])[:,0] # overlaps
+        w = w.MBO.linear_combination(np.concatenate([[1.],-cs]),[w]+ws)
+        return w.normalize()
     for wj in ws: # loop over stored wavefunctions
         w = w - wj.dot(w)*wj # remove the overlap with each WF
     return w.normalize()
@@ -68,17 +89,12 @@ def diagonalize(mh):
 def rediagonalize(H,wfs):
     """Given certain eigenfunctions, rediagonalize a Hamiltonian"""
     n = len(wfs) # number of wavefunctions
-    mh = np.zeros((n,n),dtype=np.complex) # empty Hamiltonian
-    for i in range(n):
-      for j in range(n):
-          mh[i,j] = wfs[j].aMb(H,wfs[i]) # compute representation
+    mh = representation(H,wfs) # compute representation
     (es,vs) = diagonalize(mh) # diagonalize
     wfout = [] # empty list
     for j in range(n):
         v0 = vs.T[j] # get the wavefunction
-        wf = 0
-        for i in range(n): # loop over components
-            wf = wf + np.conjugate(v0[i])*wfs[i] # add
+        wf = linear_combination(np.conjugate(v0),wfs) # add
         wfout.append(wf.copy()) # store wavefunction
     return wfout
 
@@ -116,9 +132,7 @@ def unitary_transformation(vs,wfs):
     """Perform a unitary transformation"""
     wfout = [] # storage
     for v0 in vs: # loop over WF
-        wf = 0
-        for i in range(len(wfs)):
-            wf = wf + np.conjugate(v0[i])*wfs[i] # add
+        wf = linear_combination(np.conjugate(v0),wfs) # add
         wf = wf.normalize()
         wfout.append(wf.copy()) # store wavefunction
     return wfout # return transformed wavefunctions
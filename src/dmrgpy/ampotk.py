@@ -85,6 +85,6 @@ def write_all(self):
     h = h + hubbard2ampo(self) # get hubbard
     h = h + pairing2ampo(self) # get pairing
     h = h + vijkl2ampo(self) # get Vijkl
-    self.execute(lambda: h.write(name="hamiltonian.in"))
+    h.write(name=self.filename("hamiltonian.in"))
 
 
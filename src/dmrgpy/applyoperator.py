@@ -8,10 +8,10 @@ def applyoperator(self,A,wf):
             "applyoperator_multioperator":"applyoperator_multioperator.in",
             "applyoperator_wf1":"applyoperator_wf1.mps",
             }
-    self.execute(lambda: A.write(name="applyoperator_multioperator.in"))
+    A.write(name=self.filename("applyoperator_multioperator.in"))
     self.task = task
-    self.execute( lambda : taskdmrg.write_tasks(self)) # write tasks
-    self.execute( lambda : self.run()) # run calculation
+    taskdmrg.write_tasks(self) # write tasks
+    self.run() # run calculation
     return mps.MPS(self,name="applyoperator_wf1.mps").copy() # copy
 
 random_mps = mps.random_mps
@@ -0,0 +1,114 @@
+# run several independent calculations in a single call of the backend
+
+import numpy as np
+from . import mps
+from .multioperator import obj2MO
+
+
+class Result():
+    """Value of a calculation in a batch, available after running it"""
+    def __init__(self):
+        self.value = None # not computed yet
+    def get(self): return self.value
+
+
+class Batch():
+    """
+    Object to collect overlaps, VEVs and operator applications,
+    and compute all of them in a single call of the backend
+    """
+    def __init__(self,MBO):
+        self.MBO = MBO # many body object
+        self.tasks = [] # list of tasks
+        self.pending = [] # results and functions to read them
+    def __enter__(self): return self
+    def __exit__(self,exc_type,exc_value,traceback):
+        if exc_type is None: self.run() # run if nothing went wrong
+    def name(self,label):
+        """Name of a file for the current task"""
+        return "batch_"+str(len(self.tasks))+"_"+label
+    def direct(self,wf):
+        """Check if a calculation is done directly, without the batch (ED
+        mode, and the Julia backend that runs a single task per call)"""
+        if self.MBO.itensor_version not in [2,"2","v2","C++","cpp","c","C"]:
+            return True
+        return type(wf)!=mps.MPS
+    def computed(self,value):
+        """Result that does not require the backend (ED mode)"""
+        out = Result()
+        out.value = value
+        return out
+    def add(self,task,reader):
+        """Add a task, and the function that reads its result"""
+        self.tasks.append(task) # store
+        out = Result() # result of this task
+        self.pending.append((out,reader)) # store
+        return out
+    def write_wf(self,wf,label):
+        """Wavefunction for the current task, its file is already there"""
+        return wf.name
+    def write_operator(self,A,label):
+        """Write an operator for the current task"""
+        name = self.name(label)
+        A = obj2MO(A) # convert to a multioperator
+        A.write(name=self.MBO.filename(name))
+        return name
+    def overlap(self,wf1,wf2):
+        """Overlap <wf1|wf2>"""
+        if self.direct(wf1): return self.computed(self.MBO.overlap(wf1,wf2))
+        task = {"overlap":"true",
+                "overlap_wf1":self.write_wf(wf1,"wf1.mps"),
+                "overlap_wf2":self.write_wf(wf2,"wf2.mps"),
+                "overlap_output":self.name("OVERLAP.OUT"),
+                }
+        return self.add(task,read_complex(task["overlap_output"]))
+    def aMb(self,wf1,A,wf2):
+        """Matrix element <wf1|A|wf2>"""
+        if self.direct(wf1): return self.computed(self.MBO.aMb(wf1,A,wf2))
+        task = {"overlap_aMb":"true",
+                "overlap_aMb_wf1":self.write_wf(wf1,"wf1.mps"),
+                "overlap_aMb_wf2":self.write_wf(wf2,"wf2.mps"),
+                "overlap_aMb_M":self.write_operator(A,"M.in"),
+                "overlap_aMb_output":self.name("OVERLAP_aMb.OUT"),
+                }
+        return self.add(task,read_complex(task["overlap_aMb_output"]))
+    def vev(self,A,wf=None,npow=1):
+        """Expectation value <wf|A^npow|wf>"""
+        if wf is None: wf = self.MBO.get_gs() # ground state
+        if self.direct(wf): 
+            return self.computed(self.MBO.vev(A,wf=wf,npow=npow))
+        task = {"vev":"true",
+                "wf_vev":self.write_wf(wf,"wf_vev.mps"),
+                "pow_vev":int(npow),
+                "vev_multioperator":self.write_operator(A,"vev.in"),
+                "vev_output":self.name("VEV.OUT"),
+                }
+        return self.add(task,read_complex(task["vev_output"]))
+    def applyoperator(self,A,wf):
+        """Wavefunction A|wf>"""
+        if self.direct(wf): 
+            return self.computed(self.MBO.applyoperator(A,wf))
+        task = {"applyoperator":"true",
+                "applyoperator_wf0":self.write_wf(wf,"wf0.mps"),
+                "applyoperator_multioperator":self.write_operator(A,"A.in"),
+                "applyoperator_wf1":self.name("wf1.mps"),
+                }
+        name = task["applyoperator_wf1"]
+        return self.add(task,lambda MBO: mps.MPS(MBO,name=name).copy())
+    def run(self):
+        """Perform all the calculations"""
+        if len(self.tasks)==0: return # nothing to do
+        MBO = self.MBO
+        task0 = MBO.task # store
+        MBO.task = {"batch":True,"batch_n":len(self.tasks),
+                "batch_tasks":self.tasks} # all the tasks in a single file
+        MBO.run() # perform the calculation
+        MBO.task = task0 # restore
+        for (r,f) in self.pending: r.value = f(MBO) # read the results
+        self.tasks,self.pending = [],[] # already computed
+
+
+
+def read_complex(name):
+    """Function that reads a complex number from a file"""
+    return lambda MBO: MBO.get_results(name)[0]
@@ -7,54 +7,88 @@ from . import taskdmrg
 def get_correlator(self,pairs=[[]],name="SS",
         apply_hamiltonian=False,**kwargs):
     """Compute a certain static correlator in the spin chain"""
-    if name=="SS":
-        def getop(i,j): 
-            m = self.Sx[i]*self.Sx[j]
-            m = m + self.Sy[i]*self.Sy[j]
-            m = m + self.Sz[i]*self.Sz[j]
-            return m
+    if name=="SS": ops = [(self.Sx,self.Sx),(self.Sy,self.Sy),(self.Sz,self.Sz)]
     else:
       namei,namej = operatornames.recognize(name) # return that one
       opi = operatornames.name2MO(namei,self)
       opj = operatornames.name2MO(namej,self)
-      def getop(i,j): 
-          return opi[i]*opj[j]
-    return np.array([self.vev(getop(i,j),**kwargs) for (i,j) in pairs])
-#    ########################################
-#    # workaround for total spin correlator #
-#    ########################################
-#    if name=="SS":
-#        if apply_hamiltonian: raise
-#        m0 = get_correlator(self,pairs=pairs,name="XX")
-#        m1 = get_correlator(self,pairs=pairs,name="YY")
-#        m2 = get_correlator(self,pairs=pairs,name="ZZ")
-#        return m0+m1+m2
-#    ###################
-#    # normal workflow #
-#    ###################
-#    namei,namej = operatornames.recognize(name) # return that one
-#    task = {"correlator":"true",
-#            "correlator_operator_i":namei,
-#            "correlator_operator_j":namej
-#            }
-#    if apply_hamiltonian: task["correlator_apply_hamiltonian"] = "true"
-#    self.task = task # override tasks
-#    self.execute( lambda : taskdmrg.write_tasks(self))
-#    # write the Hamiltonian to a file
-#    self.execute( lambda: self.write_hamiltonian())
-#    self.execute( lambda: write_correlators(pairs)) # write the input file
-#    self.run() # perform the calculation
-#    # return the correlators
-#    m = self.execute(lambda: np.genfromtxt("CORRELATORS.OUT").transpose())
-#    return m[1]+1j*m[2] # return correlator
-
-
-def write_correlators(pairs):
-  """Write the pairs of correlators in a file"""
-  fo = open("correlators.in","w") # open the file
-  fo.write(str(len(pairs))+"\n") # write in a file
-  for p in pairs:
-    # the first has to be smaller than the second
-    fo.write(str(p[0])+"  "+str(p[1])+"\n")
-  fo.close()
+      ops = [(opi,opj)]
+    return sum([get_pairs(self,A,B,pairs,**kwargs) for (A,B) in ops])
 
+
+def get_pairs(self,A,B,pairs,**kwargs):
+    """Compute <A_i B_j> for a list of pairs, using the full matrix if
+    there are many of them"""
+    if len(pairs)>=len(A) and len(A)==self.ns:
+        m = correlation_matrix(self,A,B,**kwargs)
+        return np.array([m[i,j] for (i,j) in pairs])
+    return self.vev_many([A[i]*B[j] for (i,j) in pairs],**kwargs)
+
+
+def local_operator(ops):
+    """Name of the local operator in each site, and the coefficients,
+    if the list contains an operator in each site"""
+    from .multioperator import MultiOperator
+    name,cs = None,[] # name and coefficients
+    for (i,A) in enumerate(ops):
+        if type(A)!=MultiOperator or A.tree is not None: return None
+        (c,off,co,ss) = A.get_arrays()
+        if len(c)!=1 or len(co)!=1 or ss[0]!=i: return None # not local
+        n = A.op[0][1][0] # name of the operator
+        if name is not None and n!=name: return None # different ones
+        name = n
+        cs.append(c[0])
+    return name,np.array(cs)
+
+
+def correlation_matrix(self,A,B,**kwargs):
+    """
+    Compute the matrix <A_i B_j> for two lists of operators in each
+    site, in a single run of the backend. Fermionic operators include
+    their Jordan-Wigner strings
+    """
+    return correlation_matrices(self,[(A,B)],**kwargs)[0]
+
+
+def correlation_matrices(self,ops,wf=None,mode="DMRG",**kwargs):
+    """
+    Compute the matrices <A_i B_j> for a list of pairs (A,B) of lists of
+    operators in each site. Pairs of local operators are computed in the
+    same sweep of the backend, the rest with all their VEVs
+    """
+    from . import mps
+    from .multioperatortk.jordanwigner import local
+    mode = self.get_mode(mode=mode) # overwrite mode
+    if wf is None and mode=="DMRG": wf = self.get_gs() # ground state
+    out = [None for p in ops] # matrices
+    fast = [] # pairs for the backend, with their names
+    for (k,(A,B)) in enumerate(ops):
+        la,lb = local_operator(A),local_operator(B)
+        if mode=="DMRG" and type(wf)==mps.MPS and la is not None and \
+                lb is not None and len(A)==self.ns and len(B)==self.ns and \
+                (la[0] in local)==(lb[0] in local) and \
+                self.itensor_version not in ["julia","Julia","jl"]:
+            fast.append((k,la,lb)) # computed in the backend
+            continue
+        n = len(A) # all the VEVs
+        kw = dict(kwargs)
+        if wf is not None: kw["wf"] = wf
+        ps = [A[i]*B[j] for i in range(n) for j in range(len(B))]
+        out[k] = self.vev_many(ps,mode=mode,**kw).reshape((n,len(B)))
+    if len(fast)==0: return out
+    n = self.ns # number of sites
+    names = tuple([(la[0],lb[0]) for (k,la,lb) in fast]) # operators
+    def f(): # compute them
+        self.task = {"correlation_matrix":"true",
+                "correlation_matrix_wf":wf.name,
+                "correlation_matrix_A":",".join([local.get(a,a) for (a,b) in names]),
+                "correlation_matrix_B":",".join([local.get(b,b) for (a,b) in names]),
+                "correlation_matrix_fermionic":",".join([str(int(a in local))
+                    for (a,b) in names]),
+                }
+        self.run() # perform the calculation
+        return self.get_results("CORRELATION_MATRIX.OUT").reshape((-1,n,n))
+    ms = self.cached(self.cache_key(("correlation_matrix",names),wf),f)
+    for (m,(k,la,lb)) in zip(ms,fast): # include the coefficients
+        out[k] = m*la[1][:,None]*lb[1][None,:]
+    return out
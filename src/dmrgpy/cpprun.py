@@ -1,9 +1,92 @@
 from .manybodychain import dmrgpath
 import os
+import atexit
+import subprocess
+import threading
 
-def run(self):
-    if self.itensor_version in [2,"2","v2","C++","cpp","c","C"]:
-        mpscpp = dmrgpath+"/mpscpp2/mpscpp.x"
-    else: raise
-    self.execute(lambda : os.system(mpscpp+" > status.txt"))
+mpscpp = dmrgpath+"/mpscpp2/mpscpp.x" # C++ executable
+
+workers = dict() # persistent processes, one per folder
+lock = threading.Lock() # protect workers when running from several threads
+server_mode = True # False once mpscpp.x failed to start as a server
+
+
+class Worker():
+    """Persistent mpscpp.x process running in a certain folder"""
+    def __init__(self,path):
+        self.path = path # folder of the calculations
+        self.alive = False # not started yet
+        self.output = None # output of a version without server mode
+        try:
+            self.process = subprocess.Popen([mpscpp,"--server"],cwd=path,
+                stdin=subprocess.PIPE,stdout=subprocess.PIPE,
+                universal_newlines=True) # errors go to the terminal
+        except OSError: return # it could not be started
+        first = self.answer() # first line of the output
+        if first=="ready": self.alive = True # server mode
+        else: # old versions just run tasks.in once
+            self.output = first+"\n"+self.process.communicate()[0]
+    def answer(self):
+        """Read the answer of the process"""
+        return self.process.stdout.readline().strip()
+    def run(self):
+        """Run the tasks in tasks.in"""
+        try:
+            self.process.stdin.write("run\n")
+            self.process.stdin.flush()
+            self.alive = self.answer()=="done"
+        except (BrokenPipeError,OSError): self.alive = False
+        if not self.alive: # the process stopped during the tasks
+            self.close()
+            raise RuntimeError("backend failed in "+self.path)
+    def close(self):
+        """Stop the process"""
+        self.alive = False
+        try:
+            self.process.stdin.write("quit\n")
+            self.process.stdin.close()
+        except (BrokenPipeError,OSError,ValueError): pass
+        try: self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired: self.process.kill()
+
+
+def get_worker(self):
+    """Return the persistent process of this object"""
+    path = os.path.realpath(self.path) # folder of the object
+    with lock:
+        if path in workers: # already running
+            if workers[path].alive: return workers[path]
+        w = Worker(path) # start a new one
+        if w.alive: workers[path] = w # store
+        return w
 
+
+def stop_worker(path):
+    """Stop the persistent process running in a folder, if any"""
+    path = os.path.realpath(path) # folder of the object
+    with lock: worker = workers.pop(path,None)
+    if worker is not None: worker.close()
+
+
+@atexit.register
+def stop_all():
+    """Stop all the persistent processes"""
+    with lock: 
+        ws = list(workers.values())
+        workers.clear()
+    for w in ws: w.close()
+
+
+def run(self):
+    if self.itensor_version not in [2,"2","v2","C++","cpp","c","C"]: raise
+    global server_mode
+    if self.backend_server and server_mode: # use a persistent process
+        w = get_worker(self)
+        if w.alive: return w.run()
+        server_mode = False # not available, do not try again
+        if w.output is not None: # an old version already ran the tasks
+            open(self.filename("status.txt"),"w").write(w.output)
+            return
+    status = open(self.filename("status.txt"),"w") # output of the program
+    subprocess.call([mpscpp],cwd=self.path,stdout=status) # run in the folder
+    status.close()
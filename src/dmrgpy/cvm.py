@@ -47,10 +47,10 @@ def cvm_dmrg(self,name="XX",delta=1e-1,e=0.0,**kwargs):
 #    name[0] = name[0].get_dagger()
     A = name[0]
     B = name[1]
-    self.execute(lambda: A.write(name="dc_multioperator_i.in"))
-    self.execute(lambda: B.write(name="dc_multioperator_j.in"))
-    self.execute( lambda : taskdmrg.write_tasks(self)) # write tasks
-    self.execute( lambda : self.run()) # run calculation
+    A.write(name=self.filename("dc_multioperator_i.in"))
+    B.write(name=self.filename("dc_multioperator_j.in"))
+    taskdmrg.write_tasks(self) # write tasks
+    self.run() # run calculation
     cs = self.get_file("CVM.OUT") # read the correlator
     return cs[0] + 1j*cs[1] # return the correlator
 
@@ -15,10 +15,10 @@ def dynamical_correlator(self,name="XX",i=0,j=0,delta=2e-2,
             }
     self.task = task # override tasks
     name[0] = name[0].get_dagger()
-    self.execute(lambda: name[0].write(name="dc_multioperator_i.in"))
-    self.execute(lambda: name[1].write(name="dc_multioperator_j.in"))
-    self.execute( lambda : taskdmrg.write_tasks(self)) # write tasks
-    self.execute( lambda : self.run()) # run calculation
+    name[0].write(name=self.filename("dc_multioperator_i.in"))
+    name[1].write(name=self.filename("dc_multioperator_j.in"))
+    taskdmrg.write_tasks(self) # write tasks
+    self.run() # run calculation
     # now read the data
     eex = self.get_file("EXCITED.OUT").T[0] # excitation energies
     eex = eex[1:len(eex)] - eex[0] # substract GS energy
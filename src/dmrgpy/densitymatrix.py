@@ -14,8 +14,7 @@ def reduced_dm(self,i=0):
     self.task = task # add the tasks
     self.write_task() # write the tasks
     self.run() # run the calculation
-    out = self.execute(lambda: np.genfromtxt("DM.OUT").T) # read density matrix
-    m = out[0] + out[1]*1j # get matrix
+    m = self.get_results("DM.OUT") # read density matrix
     n = int(np.sqrt(m.shape[0]))
     m = m.reshape((n,n)) # transform to matrix
     return m # return the density matrix
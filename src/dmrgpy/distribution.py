@@ -15,13 +15,12 @@ def get_moments_distribution(self,X=None,num_p=None):
                 "kpm_num_polynomials":str(num_p),
                 "kpm_cutoff":str(self.kpmcutoff),
                 }
-  self.execute(lambda: X.write(name="kpm_distribution_multioperator.in")) 
+  X.write(name=self.filename("kpm_distribution_multioperator.in")) 
   self.task = task # assign tasks
   self.write_task()
   self.write_hamiltonian() # write the Hamiltonian to a file
   self.run() # perform the calculation
-  m = self.execute(lambda: np.genfromtxt("KPM_MOMENTS.OUT").transpose())
-  return m[0]+1j*m[1]
+  return self.get_results("KPM_MOMENTS.OUT") # return the moments
 
 
 
@@ -16,8 +16,7 @@ def get_moments_dos_dmrg(self,delta=1e-1):
   self.write_task()
   self.write_hamiltonian() # write the Hamiltonian to a file
   self.run() # perform the calculation
-  m = self.execute(lambda: np.genfromtxt("KPM_MOMENTS.OUT").transpose())
-  return m[0]+1j*m[1] # return the moments
+  return self.get_results("KPM_MOMENTS.OUT") # return the moments
 
 
 
@@ -28,11 +27,11 @@ def get_dos(self,delta=2e-2,**kwargs):
   """
   mus = get_moments_dos_dmrg(self,delta=delta,**kwargs)
   # scale of the dos
-  kpmscales = self.execute(lambda: np.genfromtxt("KPM_SCALE.OUT"))
+  kpmscales = np.genfromtxt(self.filename("KPM_SCALE.OUT"))
   emin = kpmscales[0] # minimum energy
   emax = kpmscales[1] # maximum energy
   scale = kpmscales[2] # scaling of the energies
-  n = self.execute(lambda: np.genfromtxt("KPM_NUM_POLYNOMIALS.OUT"))
+  n = np.genfromtxt(self.filename("KPM_NUM_POLYNOMIALS.OUT"))
   xs = 0.99*np.linspace(-1.0,1.0,n*10,endpoint=True) # energies
   # generate the DOS
   ys = generate_profile(mus,xs,use_fortran=False,kernel="jackson").real
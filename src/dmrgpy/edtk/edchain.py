@@ -11,6 +11,7 @@ class EDchain():
         self.operators = dict() # empty dictionary
         self.localdim = [] # empty list
         self.computed_gs = False
+        self.MO_matrices = dict() # matrices of multioperators
     def get_operator(self,name,i=0):
         """Return an operator"""
         if type(name)==multioperator.MultiOperator: # input is a MO
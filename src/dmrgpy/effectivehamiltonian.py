@@ -106,6 +106,9 @@ def get_representation(ws,op):
     """Return the representation of a certain operator"""
     ne = len(ws)
     h = np.zeros((ne,ne),dtype=np.complex)
+    from .mps import in_backend
+    if in_backend(ws): # compute all the elements in a single call
+        return ws[0].MBO.matrix_elements(ws,op,ws) # return matrix
     for i in range(ne):
         for j in range(ne):
             h[i,j] = ws[i].overlap(op*ws[j])
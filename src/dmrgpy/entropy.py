@@ -4,7 +4,7 @@ import numpy as np
 
 def dynamical_correlator_kpm(self):
     """Return the entropies of the dynamical correlator"""
-    s = self.execute(lambda: np.genfromtxt("KPM_ENTROPY.OUT"))
+    s = np.genfromtxt(self.filename("KPM_ENTROPY.OUT"))
     return s
 
 try:
@@ -29,14 +29,14 @@ def compute_entropy(self,psi,b=1):
 def compute_entropy_single(self,psi,b=1):
     """Compute entanglement entropy in a bond"""
     if b<1 or b>self.ns: raise
-    self.execute(lambda: psi.write(name="wavefunction.mps"))
     # write the task
     task = {    "entropy": "true",
+                "entropy_wf": psi.name,
                 "bond_entropy":str(b),
                 }
     self.task = task # assign tasks
     self.run() # perform the calculation
-    entr = self.execute(lambda: np.genfromtxt("ENTROPY.OUT"))
+    entr = np.genfromtxt(self.filename("ENTROPY.OUT"))
     return np.abs(entr)
 
 
@@ -34,9 +34,12 @@ def get_correlation_matrix_zeroT(self,operators=None,
                               wf=None,**kwargs):
     """Compute the correlation matrix of a ground state"""
     from .. import fermionchain
+    from .. import mps
     if wf is None: wf = self.get_gs(**kwargs) # compute ground state
     if operators is None: # no operators provided
         if fermionchain.isfermion(self):
+            if dmmode=="fast" and type(wf)==mps.MPS: # single sweep
+                return correlation_matrix_local(self,basis,wf)
             if basis=="Nambu": 
               operators = [o for o in self.C] 
               operators += [o for o in self.Cdag] 
@@ -68,6 +71,18 @@ def get_correlation_matrix_zeroT(self,operators=None,
 
 
 
+def correlation_matrix_local(self,basis,wf):
+    """Compute the matrix <c_i^dagger c_j>, or its Nambu version, with
+    all the elements computed in a single sweep of the MPS"""
+    if basis=="Nambu":
+        ms = self.correlation_matrices([(self.Cdag,self.C),
+            (self.Cdag,self.Cdag),(self.C,self.C),(self.C,self.Cdag)],wf=wf)
+        cm = np.block([[ms[0],ms[1]],[ms[2],ms[3]]])
+    else: cm = self.correlation_matrix(self.Cdag,self.C,wf=wf)
+    return (cm + np.conjugate(cm.T))/2. # Hermitian
+
+
+
 def correlation_matrix_clean(operators,wf,self):
     """Compute the correlation matrix of a wavefunction with the fastest 
     algorithm"""
@@ -90,8 +105,22 @@ def correlation_matrix_fast(operators,wf):
     algorithm"""
     # create the matrix
     n = len(operators)
-    wfs = [o*wf for o in operators] # compute all the wavefunctions
     cm = np.zeros((n,n),dtype=np.complex)
+    from ..mps import in_backend
+    if in_backend([wf]): # use a single call for each step
+        MBO = wf.MBO # many body object
+        with MBO.batch() as b: # compute all the wavefunctions
+            rs = [b.applyoperator(o,wf) for o in operators]
+        wfs = [r.value for r in rs]
+        with MBO.batch() as b: # compute all the overlaps
+            rs = [[b.overlap(wfs[i],wfs[j]) for j in range(i,n)] 
+                    for i in range(n)]
+        for i in range(n):
+            for j in range(i,n):
+                cm[i,j] = rs[i][j-i].value
+                cm[j,i] = np.conjugate(cm[i,j])
+        return cm # return matrix
+    wfs = [o*wf for o in operators] # compute all the wavefunctions
     for i in range(n):
         for j in range(i,n):
             out = wfs[i].dot(wfs[j]) # overlap
@@ -22,7 +22,7 @@ def get_excited_states_dmrg(self,n=2,noise=0.0,scale=10.0):
     for i in range(n):
         wf = mps.MPS(MBO=self,name="wavefunction_"+str(i)+".mps").copy() 
         wfs.append(wf) # store this one
-    out = self.execute(lambda: np.genfromtxt("EXCITED.OUT").T)
+    out = np.genfromtxt(self.filename("EXCITED.OUT")).T
     return out[0],wfs # return energies and wavefunctions 
 
 
@@ -48,11 +48,7 @@ def get_excited_states(self,n=2,purify=True,**kwargs):
     else: # purify the states
         es,ws = get_excited_states_dmrg(self,n=n+2,**kwargs) # compute 
         ws = gram_smith(ws) # orthogonalize the MPS
-        ne = len(es)
-        h = np.zeros((ne,ne),dtype=np.complex)
-        for i in range(ne):
-          for j in range(ne):
-              h[i,j] = ws[i].overlap(self.hamiltonian*ws[j])
+        h = self.matrix_elements(ws,self.hamiltonian,ws) # representation
         es = lg.eigvalsh(h) # redefine eigenvalues
         # redefine also the eigenvectors
         from .algebra.arnolditk import rediagonalize
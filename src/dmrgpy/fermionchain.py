@@ -21,6 +21,14 @@ class Fermionic_Chain(Many_Body_Chain):
         Many_Body_Chain.__init__(self,[0 for i in range(n)])
         self.fermionic = True
         self.use_ampo_hamiltonian = True # use ampo
+        self.normal_order_hamiltonian = True # normal order if it is shorter
+    def set_hamiltonian(self,MO,**kwargs):
+        """Set the Hamiltonian, normal ordered if that reduces the terms"""
+        from . import multioperator
+        from .multioperatortk import normalorder
+        if self.normal_order_hamiltonian and type(MO)==multioperator.MultiOperator:
+            if MO.tree is None: MO = normalorder.reduce_terms(MO)
+        Many_Body_Chain.set_hamiltonian(self,MO,**kwargs)
     def get_charge_gap(self,**kwargs):
         """Return the charge gap"""
         return gap.sector_gap(self,sum(self.N),**kwargs)
@@ -121,14 +129,14 @@ class Fermionic_Chain(Many_Body_Chain):
         MBf = mbfermion.MBFermion(self.ns) # create object
         MBf.add_multioperator(self.hamiltonian) 
         return MBf # return the object
-    def execute(self,f):
+    def filename(self,name):
         """
         This is a temporal fix to use the C operators in Julia ITensor
         """
         if self.itensor_version=="julia": # use the fermionic representation
             from . import multioperator
             multioperator.use_jordan_wigner = False
-        return Many_Body_Chain.execute(self,f)
+        return Many_Body_Chain.filename(self,name)
 
 
 
@@ -43,16 +43,14 @@ def convolve(x,y,delta=None):
 
 def naive_get_dos(mbc,i=0,n=20,delta=0.1):
     """Compute the density of states"""
-    mbc.to_folder() # go to the folder
     mbc.setup_sweep("fast")
     mbc.write_hamiltonian() # write the hamiltonian
     task = {"nexcited":str(n),"dos_site":str(i)}
     mbc.setup_task("dos",task=task)
     mbc.run() # run calculation
-    es = np.genfromtxt("EXCITED.OUT") # get energies
+    es = np.genfromtxt(mbc.filename("EXCITED.OUT")) # get energies
     es = [es[i]-es[0] for i in range(0,len(es))] # excitation energies
-    cs = np.genfromtxt("DOS_ELEMENT.OUT").transpose() # matrix elements
-    mbc.to_origin() # go back
+    cs = np.genfromtxt(mbc.filename("DOS_ELEMENT.OUT")).transpose() # matrix elements
     cs = cs[0]**2 + cs[1]**2 # moduli square
     # now convert the cs into a matrix
     cs = cs.reshape((len(es),len(es))) # matrix with the overlaps
@@ -42,6 +42,9 @@ def get_fidelity(MBO,H0,H1,l=1.0,delta=1e-4,
             wfsm = gram_smith(wfsm) # orthogonalize
             from .algebra.algebra import smooth_gauge
             def Uij(ws1,ws2):
+                from .mps import in_backend
+                if in_backend(ws1+ws2): # single call
+                    return ws1[0].MBO.matrix_elements(ws1,None,ws2)
                 m = np.zeros((ngs,ngs),dtype=np.complex) # empty matrix
                 for i in range(ngs):
                   for j in range(ngs):
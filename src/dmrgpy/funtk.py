@@ -27,6 +27,18 @@ def obj2fun(a):
     else: raise
 
 
+def obj2array(a,shape):
+    """
+    Transform a function or an array into an array with a certain shape,
+    the function is called with the indexes of each entry
+    """
+    if callable(a): # evaluate the function in all the entries
+        out = [a(*ind) for ind in np.ndindex(*shape)]
+        out = np.array(out) # convert to array
+        return out.reshape(shape+out.shape[1:]) # entries can be arrays
+    else: return np.array(a) # already an array
+
+
 def obj2mat(a):
     """
     Transform an object into a matrix
@@ -1,5 +1,6 @@
 from . import mps
 import numpy as np
+import os
 
 
 def best_gs(sc,n=1):
@@ -39,7 +40,6 @@ def gs_energy_many(self,n=20,**kwargs):
             emin = e0
         else: self.wf0.clean() # remove wavefunction
         print("Best of",n,i,e0,emin)
-    wf0.rename("psi_GS.mps")
     self.set_initial_wf(wf0) # set the wavefunction
     print("Final energy",self.vev(self.hamiltonian).real)
     return emin
@@ -49,21 +49,22 @@ def gs_energy_single(self,wf0=None,reconverge=None,maxde=None,maxdepth=5):
     Return the ground state energy
     """
     if wf0 is not None: 
-        self.execute(wf0.write) # write wavefunction
         self.set_initial_wf(wf0,reconverge=True) # set the initial wavefunction
     if reconverge is not None: # overwrite skip_dmrg_gs
         self.skip_dmrg_gs = not reconverge # if the computation should be rerun
-    self.execute(lambda: self.setup_task("GS"))
+    self.setup_task("GS")
     self.write_hamiltonian() # write the Hamiltonian to a file
     self.run() # perform the calculation
     # get the ground state energy
-    out = self.execute(lambda: np.genfromtxt("GS_ENERGY.OUT"))
+    out = np.genfromtxt(self.filename("GS_ENERGY.OUT"))
     self.e0 = out # store ground state energy
     self.computed_gs = True
     self.sites_from_file = True
     self.gs_from_file = True
     self.skip_dmrg_gs = True
-    wf0 = mps.MPS(MBO=self,name="psi_GS.mps").copy() # set GS
+    if os.path.isfile(self.filename("psi_GS.mps")): # new wavefunction
+        wf0 = mps.MPS(MBO=self,name="psi_GS.mps") # set GS
+    else: wf0 = self.wf0 # the initial wavefunction was kept
     self.set_initial_wf(wf0) # set the initial wavefunction
     if maxde is not None: # enforce a maximum fluctuation in the energy
       e = self.vev(self.hamiltonian)  
@@ -106,13 +107,13 @@ def gs_energy(self,policy="single",**kwargs):
 def lowest_energy(self,h):
     """Return the lowest energy of the Hamiltonian"""
     raise # not finished yet
-    self.execute(lambda: h.write("hamiltonian.in")) # write Hamiltonian
+    h.write(self.filename("hamiltonian.in")) # write Hamiltonian
     task = {"GS":"true",
             }
     self.task = task
     self.write_task()
     self.run() # perform the calculation
-    out = self.execute(lambda: np.genfromtxt("GS_ENERGY.OUT"))
+    out = np.genfromtxt(self.filename("GS_ENERGY.OUT"))
     return out
 
 
@@ -1,6 +1,8 @@
 # routines to run the code with Julia
 import os
+import numpy as np
 import subprocess
+import threading
 
 dmrgpath = os.path.dirname(os.path.realpath(__file__))
 
@@ -27,11 +29,36 @@ except:
     jlsession = JLdummy()
 
 
+lock = threading.Lock() # a single Julia session for all the threads
+loaded = False # the Julia module is only loaded once
+
+
+def load():
+    """Load the Julia module in the session"""
+    global loaded
+    if loaded: return
+    c = "push!(LOAD_PATH, \""+dmrgpath+"/mpsjulia\"); "
+    c += "using commonmpsjulia"
+    jlsession.eval(c) # evaluate Julia
+    loaded = True
+
+
 def run(self):
     """Execute the Julia program"""
-    import contextlib
-    c = "@suppress_out include(\""+dmrgpath+"/mpsjulia/mpsjulia.jl\");"
-    self.execute(lambda: jlsession.eval(c)) # evaluate Julia
+    c = "@suppress_out run_in_folder(\""+self.path+"\")"
+    with lock: 
+        load() # load the module, just the first time
+        jlsession.eval(c) # evaluate Julia
+
+
+def get_results(self,name):
+    """Return the array with the results of the last run, if any"""
+    name = os.path.realpath(self.filename(name)) # full name
+    with lock:
+        if not loaded: return None
+        out = jlsession.eval("get_result(\""+name+"\")")
+    if out is None: return None
+    return np.array(out,dtype=np.complex128) # return array
 
 
 
@@ -9,7 +9,7 @@ def get_moments_dmrg(self,n=1000):
   self.setup_task("dos",task={"nkpm":str(n)})
   self.write_hamiltonian() # write the Hamiltonian to a file
   self.run() # perform the calculation
-  return self.execute(lambda: np.genfromtxt("KPM_MOMENTS.OUT").transpose()[0])
+  return self.get_results("KPM_MOMENTS.OUT").real
 
 
 
@@ -38,16 +38,14 @@ def get_moments_dynamical_correlator_dmrg(self,name=None,delta=1e-1):
       mi = name[1] # first operator
       mj = name[0] # second operator
       mj = mj.get_dagger()
-      self.execute(lambda: mi.write(name="kpm_multioperator_i.in")) # write
-      self.execute(lambda: mj.write(name="kpm_multioperator_j.in")) # write
+      mi.write(name=self.filename("kpm_multioperator_i.in")) # write
+      mj.write(name=self.filename("kpm_multioperator_j.in")) # write
   else: raise
   self.task = task # assign tasks
   self.write_task() 
   self.write_hamiltonian() # write the Hamiltonian to a file
   self.run() # perform the calculation
-  m = self.execute(lambda: np.genfromtxt("KPM_MOMENTS.OUT").transpose())
-#  return m[1]
-  mus = m[0]+1j*m[1]
+  mus = self.get_results("KPM_MOMENTS.OUT") # read the moments
   from .algebra import kpm
   if self.kpm_extrapolate: 
       return kpm.extrapolate_moments(mus,fac=self.kpm_extrapolate_factor,
@@ -91,14 +89,14 @@ def get_dynamical_correlator(self,n=1000,
     mus = get_moments_dynamical_correlator_dmrg(self,delta=delta,
             name=name,**kwargs) 
     # scale of the dos
-    kpmscales = self.execute(lambda: np.genfromtxt("KPM_SCALE.OUT"))
+    kpmscales = np.genfromtxt(self.filename("KPM_SCALE.OUT"))
     emin = kpmscales[0] # minimum energy
     emax = kpmscales[1] # maximum energy
     scale = kpmscales[2] # scaling of the energies
     # ground state energy
-    e0 = self.execute(lambda: np.genfromtxt("GS_ENERGY.OUT"))
+    e0 = np.genfromtxt(self.filename("GS_ENERGY.OUT"))
     self.e0 = e0 # add this quantity
-    n = self.execute(lambda: np.genfromtxt("KPM_NUM_POLYNOMIALS.OUT"))
+    n = np.genfromtxt(self.filename("KPM_NUM_POLYNOMIALS.OUT"))
     xs = 0.99*np.linspace(-1.0,1.0,int(n*10),endpoint=False) # energies
 #    if self.kpm_extrapolate: kernel = None # no kernel
     ys = generate_profile(mus,xs,use_fortran=False,kernel=kernel) # generate the DOS
@@ -139,21 +137,19 @@ def general_kpm_moments(self,X=None,A=None,B=None,
     else: wfa = wf
     if B is not None: wfb = self.applyoperator(B,wf)
     else: wfb = wf
-    # write the wavefunctions
-    self.execute(lambda: wfa.write(name="wfa.mps"))
-    self.execute(lambda: wfb.write(name="wfb.mps"))
     # write the task
     task = {    "general_kpm": "true",
+                "kpm_wfa":wfa.name,
+                "kpm_wfb":wfb.name,
                 "kpmmaxm":str(self.maxm),
                 "kpm_accelerate":self.kpm_accelerate,
                 "kpm_num_polynomials":str(num_p),
                 "kpm_cutoff":str(self.cutoff),
                 }
-    self.execute(lambda: X.write(name="kpm_operator.in"))
+    X.write(name=self.filename("kpm_operator.in"))
     self.task = task # assign tasks
     self.run() # perform the calculation
-    m = self.execute(lambda: np.genfromtxt("KPM_MOMENTS.OUT").transpose())
-    mus = m[0]+1j*m[1]
+    mus = self.get_results("KPM_MOMENTS.OUT") # read the moments
     # perform extrapolation if 
     if self.kpm_extrapolate: 
       mus = kpm.extrapolate_moments(mus,fac=self.kpm_extrapolate_factor,
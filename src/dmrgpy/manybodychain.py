@@ -1,6 +1,7 @@
 from __future__ import print_function
 import numpy as np
 import os
+import weakref
 from . import mps
 from . import timedependent
 from . import groundstate
@@ -18,6 +19,7 @@ from . import excited
 from . import effectivehamiltonian
 from .writemps import write_sites
 from .mode import dmrgpath
+from . import workspace
 
 
 one = np.matrix(np.identity(3))
@@ -36,9 +38,8 @@ class Coupling():
 class Many_Body_Chain():
   def __init__(self,sites):
       self.sites = sites # list of the sites
-      self.path = os.getcwd()+"/.mpsfolder/" # folder of the calculations
-      self.clean() # clean calculation
-      self.inipath = os.getcwd() # original folder
+      self.path = workspace.new() # unique folder of the calculations
+      self.finalizer = weakref.finalize(self,workspace.remove,self.path)
       self.ns = len(sites) # number of sites
       self.mode = None # no mode (use the input parameter)
       self.exchange = 0 # zero
@@ -52,6 +53,9 @@ class Many_Body_Chain():
       self.sites_from_file = False
       self.excited_gram_schmidt = False # it does not seem very effective
       self.hamiltonian = None # Hamiltonian, as a multioperator
+      self.hermitian_probes = dict() # Hermiticity of operators with MPS
+      self.results_cache = dict() # results of previous calculations
+      self.cache_results = True # reuse the results of equal calculations
       self.hubbard_matrix = np.zeros((self.ns,self.ns)) # empty matrix
       self.use_ampo_hamiltonian = False # use ampo Hamiltonian
   #    self.exchange.append(Coupling(0,self.ns-1,one)) # closed boundary
@@ -83,13 +87,15 @@ class Many_Body_Chain():
       self.kpm_extrapolate = False # use extrapolation
       self.kpm_extrapolate_factor = 2.0 # factor for the extrapolation
       self.kpm_extrapolate_mode = "plain" # mode of the extrapolation
-      os.system("mkdir -p "+self.path) # create folder for the calculations
+      self.backend_server = True # keep mpscpp.x alive between calculations
+      self.binary_results = True # results in binary files (False for text)
+      self.mpo_cache = True # reuse the MPOs of operators already compiled
       self.initialize()
       # and initialize the sites
   def initialize(self):
       self.sites_from_file = False
       self.task = {"write_sites":"true"}
-      self.execute(lambda: write_sites(self)) # write the different sites
+      write_sites(self) # write the different sites
       self.run() # run the calculation
       self.sites_from_file = True
   def setup_julia(self):
@@ -103,10 +109,9 @@ class Many_Body_Chain():
   def get_mode(self,**kwargs):
       from .mode import get_mode
       return get_mode(self,**kwargs)
-  def to_folder(self):
-      """Go to a certain folder"""
-#      self.inipath = os.getcwd() # record the folder
-      os.chdir(self.path) # go to calculation folder
+  def filename(self,name):
+      """Full path of a file in the folder of the calculations"""
+      return os.path.join(self.path,name)
   def copy(self):
       return self.clone() # clone and create a new one
       from copy import deepcopy
@@ -116,14 +121,22 @@ class Many_Body_Chain():
       Clone the object and create a temporal folder
       """
       from copy import deepcopy
-      name = "dmrgpy_clone_"+str(np.random.randint(10000))
-      os.system("rm -rf /tmp/"+name) # clean the new directory
       out = deepcopy(self) # full copy of the object 
-      out.path = "/tmp/"+name # new path
-      out.inipath = os.getcwd() # initial path
-#      print("New path",out.path)
-      os.system("cp -r "+self.path+"  "+out.path) # copy to the new path
+      out.path = workspace.copy(self.path) # new folder with the same files
+      out.finalizer = weakref.finalize(out,workspace.remove,out.path)
+      if out.wf0 is not None: out.wf0.set_MBO(out) # refer to the new folder
       return out # return new object
+  def __getstate__(self):
+      """State for copy and pickle, without the finalizer"""
+      out = self.__dict__.copy()
+      out.pop("finalizer",None) # the folder belongs to this object
+      return out
+  def __setstate__(self,state):
+      """Restore a copy, the folder is still owned by the original"""
+      self.__dict__.update(state)
+      self.finalizer = None # do not remove the folder
+  def __enter__(self): return self
+  def __exit__(self,exc_type,exc_value,traceback): self.clean()
   def set_hamiltonian(self,MO,restart=True): 
       """Set the Hamiltonian"""
       if restart: self.restart() # restar the calculation
@@ -145,24 +158,54 @@ class Many_Body_Chain():
       mbc = self.clone() # clone the object
       mbc.set_hamiltonian(X) 
       return mbc.gs_energy(**kwargs)
-  def to_origin(self): 
-      if os.path.isfile(self.path+"/ERROR"): raise # something wrong
-      os.chdir(self.inipath) # go to original folder
   def restart(self):
       """Restart the calculation"""
       self.computed_gs = False
       self.gs_from_file = False
       self.skip_dmrg_gs = False
       self.wf0 = None # initial file for GS
-  def is_hermitian(self,H):
-      """Check if an operator is Hermitian"""
+  def is_hermitian(self,H,probe=True):
+      """
+      Check if an operator is Hermitian, symbolically with its canonical
+      form, and if that is not conclusive (and probe is True) applying
+      it to a random MPS
+      """
+      from .multioperator import MultiOperator
+      if type(H)==MultiOperator and H.is_hermitian(): return True
+      if not probe: return False
+      key = None # content of the operator
+      if hasattr(H,"get_fingerprint"): key = H.get_fingerprint()
+      if key in self.hermitian_probes: return self.hermitian_probes[key]
       from .mpsalgebra import is_hermitian
-      return is_hermitian(self,H)
+      out = is_hermitian(self,H) # use a random MPS
+      if len(self.hermitian_probes)>=32: self.hermitian_probes.clear()
+      if key is not None: self.hermitian_probes[key] = out # store
+      return out
+  def cache_key(self,name,*objs):
+      """Key identifying a calculation, with the fingerprints of its
+      operators and wavefunctions and the parameters of the backend"""
+      from . import multioperator
+      fs = tuple([o.get_fingerprint() for o in objs])
+      return (name,fs,self.maxm,self.cutoff,self.mpomaxm,
+              multioperator.use_jordan_wigner)
+  def cached(self,key,f):
+      """Return the stored result of a calculation, or compute it. The
+      MPS are stored weakly, so their files are removed once unused"""
+      if not self.cache_results: return f()
+      out = self.results_cache.get(key,None) # stored result
+      if type(out)==mps.WeakMPS: out = out.get() # MPS, if still there
+      if out is not None: return out
+      out = f() # compute
+      if len(self.results_cache)>=256: self.results_cache.clear()
+      if type(out)==mps.MPS: self.results_cache[key] = mps.WeakMPS(out)
+      else: self.results_cache[key] = out # store
+      return out
   def clean(self): 
       """
       Remove the temporal folder
       """
-      os.system("rm -rf "+self.path) # clean temporal folder
+      if self.finalizer is not None: 
+          self.finalizer() # stop the backend and remove the folder
   def vev_MB(self,MO,**kwargs):
       """
       Compute a vacuum expectation value
@@ -173,6 +216,11 @@ class Many_Body_Chain():
       if mode=="DMRG": return vev.vev(self,MO,**kwargs)
       elif mode=="ED": return self.get_ED_obj().vev(MO,**kwargs) # ED object
       else: raise
+  def vev_many(self,MOs,mode="DMRG",**kwargs):
+      """Expectation values of a list of operators, as an array"""
+      mode = self.get_mode(mode=mode) # overwrite mode
+      if mode=="DMRG": return vev.vev_many(self,MOs,**kwargs)
+      return np.array([self.vev(A,mode=mode,**kwargs) for A in MOs])
   def test_ED(self):
       """Test the ED object"""
       self.get_ED_obj().test()
@@ -184,37 +232,53 @@ class Many_Body_Chain():
   def excited_vev(self,MO,**kwargs): return self.excited_vev_MB(MO,**kwargs)
   def set_vijkl(self,f):
       """
-      Create the generalized interaction
+      Create the generalized interaction, f can be a function f(i,j,k,l),
+      an array, or a sparse tensor as a dictionary {(i,j,k,l):v}
       """
-      h = 0
-      C = self.C
-      Cdag = self.Cdag
-      for i in range(self.ns):
-        for j in range(self.ns):
-          for k in range(self.ns):
-            for l in range(self.ns):
-                h = h + f(i,j,k,l)*Cdag[i]*C[j]*Cdag[k]*C[l]
-      h = 0.5*(h+h.get_dagger())
+      from .multioperatortk.builder import HamiltonianBuilder
+      from .multioperatortk import normalorder
+      if type(f) not in [dict,tuple]: # function or dense array
+          f = funtk.obj2array(f,(self.ns,)*4)
+      hb = HamiltonianBuilder() # sum all the terms at once
+      hb.add_vijkl(f,self.Cdag,self.C)
+      h = normalorder.reduce_terms(hb.get_operator()) # remove redundant terms
+      h = h.hermitian_part()
       self.vijkl = h # store
       self.update_hamiltonian()
   def generate_bilinear(self,fun,A,B):
       """Generic bilinear term"""
-      fun = funtk.obj2fun(fun) # set function
-      h = 0 # initialize
-      for i in range(self.ns): # loop
-          for j in range(self.ns): h = h + fun(i,j)*A[i]*B[j]
-      return 0.5*(h + h.get_dagger()) # Hermitian
+      from .multioperatortk.builder import HamiltonianBuilder
+      m = funtk.obj2array(fun,(self.ns,self.ns)) # couplings
+      hb = HamiltonianBuilder() # sum all the terms at once
+      hb.add_bilinear(m,A,B)
+      return hb.get_operator().hermitian_part() # Hermitian
   def update_hamiltonian(self):
       h = self.hopping + self.hubbard + self.pairing 
       h = h + self.vijkl + self.exchange
       self.set_hamiltonian(h)
   def get_dagger(self,m): return m.get_dagger() # dummy method
+  def batch(self):
+      """
+      Collect several calculations and perform them in a single
+      call of the backend, to be used as
+      with chain.batch() as b: 
+          r = b.vev(op)
+      and afterwards r.value contains the result
+      """
+      from .batch import Batch
+      return Batch(self)
   def overlap(self,wf1,wf2,**kwargs):
       """Compute the overlap"""
       return mpsalgebra.overlap(self,wf1,wf2,**kwargs)
   def aMb(self,wf1,M,wf2,**kwargs):
       """Compute the overlap <a|M|b>"""
       return mpsalgebra.overlap_aMb(self,wf1,M,wf2,**kwargs)
+  def matrix_elements(self,bras,M,kets,**kwargs):
+      """Compute the matrix <bras[i]|M|kets[j]>"""
+      return mpsalgebra.matrix_elements(self,bras,M,kets,**kwargs)
+  def gram(self,wfs):
+      """Compute the matrix of overlaps <wfs[i]|wfs[j]>"""
+      return mpsalgebra.gram(self,wfs)
   def operator_norm(self,op,**kwargs):
       """Estimate the norm of an operator"""
       return mpsalgebra.operator_norm(self,op,**kwargs)
@@ -231,6 +295,9 @@ class Many_Body_Chain():
   def applyinverse(self,A,wf,**kwargs):
       """Apply an operator"""
       return mpsalgebra.applyinverse(self,A,wf,**kwargs)
+  def linear_combination(self,cs,wfs,**kwargs):
+      """Compute sum_i cs[i]*wfs[i] with a single compression"""
+      return mpsalgebra.linear_combination(self,cs,wfs,**kwargs)
   def summps(self,wf1,wf2,**kwargs):
       """Apply an operator"""
       return mpsalgebra.summps(self,wf1,wf2,**kwargs)
@@ -256,14 +323,14 @@ class Many_Body_Chain():
       """
       Write the tasks in tasks.in
       """
-      self.execute( lambda : taskdmrg.write_tasks(self)) # write tasks
+      taskdmrg.write_tasks(self) # write tasks
   def write_hamiltonian(self):
       """
       Write the Hamiltonian in a file
       """
       from .writemps import write_sites
-      self.execute(lambda: write_sites(self)) # write the different sites
-      self.execute(lambda: self.hamiltonian.write("hamiltonian.in"))
+      write_sites(self) # write the different sites
+      self.hamiltonian.write(self.filename("hamiltonian.in"))
   def run(self,**kwargs): 
       from .mode import run
       return run(self,**kwargs)
@@ -358,9 +425,7 @@ class Many_Body_Chain():
       """Return the ground state"""
       mode = self.get_mode(mode=mode) # overwrite mode
       if mode=="DMRG": # DMRG mode
-        if self.computed_gs: # if stored, rewrite and return
-            self.wf0.write(name=self.wf0.name,path=self.path)
-            return self.wf0
+        if self.computed_gs: return self.wf0 # already computed
         if best: groundstate.best_gs(self,n=n,**kwargs) # best ground state
         else: self.gs_energy(**kwargs) # perform a ground state calculation
         return self.wf0 # return wavefunction
@@ -383,25 +448,31 @@ class Many_Body_Chain():
       print("Method get_correlator is deprecated, use vev instead")
       from . import spinchain
       from . import fermionchain
-      if type(self)==spinchain.Spin_Chain: 
-          ops = [self.Sz[i]*self.Sz[j] for (i,j) in pairs]
-      elif type(self)==fermionchain.Fermionic_Chain: 
-          ops = [self.Cdag[i]*self.C[j] for (i,j) in pairs]
+      if type(self)==spinchain.Spin_Chain: (A,B) = (self.Sz,self.Sz)
+      elif type(self)==fermionchain.Fermionic_Chain: (A,B) = (self.Cdag,self.C)
       else: raise
-      return np.array([self.vev(o,**kwargs) for o in ops])
+      return correlator.get_pairs(self,A,B,pairs,**kwargs)
+  def correlation_matrix(self,A,B,**kwargs):
+      """Matrix <A_i B_j> for two lists of operators in each site"""
+      return correlator.correlation_matrix(self,A,B,**kwargs)
+  def correlation_matrices(self,ops,**kwargs):
+      """Matrices <A_i B_j> for a list of pairs (A,B), in a single run"""
+      return correlator.correlation_matrices(self,ops,**kwargs)
   def get_file(self,name):
       """Return the electronic density"""
       if not self.computed_gs: self.get_gs() # compute gs
-      self.to_folder() # go to folder
-      m = np.genfromtxt(name) # read file
-      self.to_origin() # go back
-      return m
+      return np.genfromtxt(self.filename(name)) # read file
+  def get_results(self,name):
+      """Return the complex numbers written by the backend in a file"""
+      from . import results
+      if self.itensor_version in ["julia","Julia","jl"]: # returned by Julia
+          from . import juliarun
+          out = juliarun.get_results(self,name)
+          if out is not None: return out
+      return results.read(self.filename(name))
   def execute(self,f):
-      """Execute function in the folder"""
-      self.to_folder() # go to folder
-      out = f()
-      self.to_origin() # go back
-      return out # return result
+      """Execute a function, files are referred with self.filename"""
+      return f() # return result
   def evolution(self,**kwargs):
       """
       Perform time dependent DMRG
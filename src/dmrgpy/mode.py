@@ -11,11 +11,12 @@ def run(self,automatic=False):
     if get_mode(self)=="ED": 
         return # do nothing
     # executable
-    self.execute(lambda : taskdmrg.write_tasks(self)) # write tasks
+    taskdmrg.write_tasks(self) # write tasks
     if self.itensor_version in [2,"2","v2","C++","cpp","c","C"]:
         if os.path.isfile(mpscpp): 
             from . import cpprun
             cpprun.run(self) # run the C++ version
+            if os.path.isfile(self.filename("ERROR")): raise # something wrong
             return
 #    elif self.itensor_version==3: mpscpp = dmrgpath+"/mpscpp3/mpscpp.x" 
     elif self.itensor_version in ["julia","Julia","jl"]:
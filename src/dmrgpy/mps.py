@@ -1,27 +1,118 @@
 from __future__ import print_function
 from copy import deepcopy
 import os
+import shutil
+import weakref
 import numpy as np
 from . import entropy
 from . import multioperator
 
+class MPSFile():
+    """File with an MPS, removed when no MPS object refers to it"""
+    def __init__(self,filename,owned=True):
+        self.filename = filename # full path of the file
+        if owned: self.finalizer = weakref.finalize(self,remove_file,filename)
+        else: self.finalizer = None # file of the user, do not remove
+        self.fp = int.from_bytes(os.urandom(16),"little") # random token
+    def __deepcopy__(self,memo): return self # the file is never modified
+    def get_fingerprint(self):
+        """128-bit integer identifying the file, the files are never
+        modified so a token created with the object is enough"""
+        return self.fp
+
+
+class WeakMPS():
+    """MPS stored without keeping its file alive, for the caches"""
+    def __init__(self,wf):
+        self.state = dict([(k,v) for (k,v) in wf.__dict__.items() if k!="file"])
+        self.file = weakref.ref(wf.file)
+    def get(self):
+        """Return the MPS, or None if its file was already removed"""
+        f = self.file()
+        if f is None: return None
+        out = MPS.__new__(MPS)
+        out.__dict__.update(self.state)
+        out.file = f
+        return out
+
+
+def remove_file(filename):
+    """Remove a file if it exists"""
+    if os.path.isfile(filename): os.remove(filename)
+
+
 class MPS():
-    """Object for an MPS"""
+    """
+    Handle to an MPS stored in the folder of the many body object.
+    The file is never modified by the backend, so copies of the
+    object share it, and it is only read from Python when exported
+    """
     def __init__(self,MBO=None,name="psi_GS.mps"):
 #        self.sc = sc # many body object
 #        self.sc.wf0 = None # no wavefunction
         if MBO is None:
             self.path = os.getcwd() # current directory
             self.MBO = None
+            self.name = name # file of the user
+            self.file = MPSFile(os.path.join(self.path,name),owned=False)
         else:
             self.path = MBO.path # path to the many body object folder
             self.MBO = MBO
-        self.name = name # initial name
+            self.name = id_generator()+".mps" # unique name
+            filename = os.path.join(self.path,self.name)
+            # take the output of the backend, so it is not overwritten
+            os.replace(os.path.join(self.path,name),filename)
+            self.file = MPSFile(filename)
 #        self.factor = 1.0 # factor of the mps
-        self.mps = open(self.path+"/"+name,"rb").read() # read the MPS
-        self.sites = open(self.path+"/sites.sites","rb").read() # read sites
+    def get_fingerprint(self):
+        """128-bit integer identifying the wavefunction"""
+        return self.file.get_fingerprint()
+    @property
+    def mps(self):
+        """Content of the MPS file"""
+        return open(self.file.filename,"rb").read()
+    @property
+    def sites(self):
+        """Content of the sites file"""
+        return open(os.path.join(self.path,"sites.sites"),"rb").read()
+    def __deepcopy__(self,memo):
+        """Copy the object, sharing the file"""
+        out = MPS.__new__(MPS)
+        memo[id(self)] = out
+        for key in self.__dict__: 
+            out.__dict__[key] = deepcopy(self.__dict__[key],memo)
+        return out
+    def __getstate__(self):
+        """State for pickle, including the content of the files"""
+        out = self.__dict__.copy()
+        out["file"] = None
+        if self.file is not None: out["data"] = (self.mps,self.sites) # content
+        return out
+    def __setstate__(self,state):
+        """Restore a pickled object, writing the MPS if it is not there"""
+        data = state.pop("data",None)
+        self.__dict__.update(state)
+        if data is None: return # removed wavefunction
+        (wf,sites) = data
+        filename = os.path.join(self.path,self.name)
+        if os.path.isfile(filename): # the file is owned by the original
+            self.file = MPSFile(filename,owned=False)
+        else:
+            if not os.path.isdir(self.path): self.path = os.getcwd()
+            filename = os.path.join(self.path,self.name)
+            open(filename,"wb").write(wf) # write the MPS
+            sitesfile = os.path.join(self.path,"sites.sites")
+            if not os.path.isfile(sitesfile): open(sitesfile,"wb").write(sites)
+            self.file = MPSFile(filename)
     def set_MBO(self,MBO):
         """Set the MBO"""
+        filename = os.path.join(MBO.path,self.name) # file in the new folder
+        owned = self.file.finalizer is not None # user named files are kept
+        if not os.path.isfile(filename): # copy it to the new folder
+            self.write(path=MBO.path)
+            self.file = MPSFile(filename,owned=owned)
+        elif filename!=self.file.filename: # already there (cloned folder)
+            self.file = MPSFile(filename,owned=owned)
         self.path = MBO.path # path to the many body object folder
         self.MBO = MBO # set the object
     def dot(self,x):
@@ -45,18 +136,22 @@ class MPS():
     def __truediv__(self,x): return self*(1./x)
     def copy(self,name=None):
         """Copy this wavefunction"""
-        out = deepcopy(self) # copy everything
-        if name is None:
-          name = id_generator()+".mps" # create a new name
-        out.name = name
-#        self.execute(lambda: os.system("cp "+self.name+"  "+out.name))
+        out = deepcopy(self) # copy everything, sharing the file
+        if name is not None and name!=self.name: # copy also the file
+          out.write(name=name)
+          out.name = name
+          out.file = MPSFile(os.path.join(out.path,name),owned=False) # user name
         return out
     def write(self,name=None,path=None):
-        """Write the MPS in a folder"""
+        """Export the MPS to a file in a folder"""
         if name is None: name = self.name
         if path is None: path = self.path
-        open(path+"/"+name,"wb").write(self.mps) # write the MPS
-        open(path+"/sites.sites","wb").write(self.sites) # write the sites
+        filename = os.path.join(path,name)
+        if filename==self.file.filename: return # already there
+        shutil.copyfile(self.file.filename,filename) # copy the MPS
+        if path!=self.path: # copy the sites
+            shutil.copyfile(os.path.join(self.path,"sites.sites"),
+                    os.path.join(path,"sites.sites"))
     def get_entropy(self,b=None):
         """Compute entanglement entropy in a bond"""
         if b is None: # compute all 
@@ -87,15 +182,11 @@ class MPS():
             return self.MBO.get_mutual_information(self,i,j)
         else: raise # not implemented
     def rename(self,name):
-        self.execute(lambda: os.system("mv "+self.name+"  "+name))
+        self.write(name=name) # copy the file
         self.name = name
-    def execute(self,f):
-        pwd = os.getcwd() # path
-        os.chdir(self.path) # go
-        f()
-        os.chdir(pwd) # go back
+        self.file = MPSFile(os.path.join(self.path,name),owned=False) # user name
     def clean(self):
-        self.execute(lambda: os.system("rm "+self.name))
+        self.file = None # the file is removed once it is not used
         del self
     def normalize(self):
         """Normalize a wavefunction"""
@@ -124,6 +215,12 @@ class MPS():
 
 
 
+def in_backend(wfs):
+    """Check if the wavefunctions are MPS of a many body chain, so
+    their algebra can be done in a single run of the backend"""
+    return len(wfs)>0 and all([type(w)==MPS and w.MBO is not None for w in wfs])
+
+
 import string
 import random
 
@@ -28,9 +28,9 @@ def exponential_dmrg(self,h,wfa,dt=1.0,nt=1000,nt0=None):
             }
     if self.tevol_custom_exp: task["tevol_custom_exp"] = "true"
     self.task = task # override tasks
-    self.execute(lambda: wfa.write(name="input_wavefunction.mps")) # copy WF
-    self.execute(lambda: h.write(name="hamiltonian.in"))
-    self.execute(lambda: self.run()) # run calculation
+    task["input_wavefunction"] = wfa.name # WF to exponentiate
+    h.write(name=self.filename("hamiltonian.in"))
+    self.run() # run calculation
     wf = mps.MPS(self,name="output_wavefunction.mps").copy() # output
     return wf
 
@@ -50,17 +50,61 @@ def overlap_aMb(self,wf1,A,wf2,mode="DMRG"):
     else: raise
 
 
+def matrix_elements(self,bras,A,kets,hermitian=None):
+    """
+    Compute the matrix <bras[i]|A|kets[j]>, with A a multioperator
+    (None for the overlaps), in a single run of the backend. If the
+    bras and kets are the same and A is Hermitian only half of the
+    elements are computed
+    """
+    from .multioperator import MultiOperator,isnumber
+    nb,nk = len(bras),len(kets)
+    if nb==0 or nk==0: return np.zeros((nb,nk),dtype=np.complex128)
+    if isnumber(A): return A*matrix_elements(self,bras,None,kets)
+    if self.itensor_version in ["julia","Julia","jl"] or \
+            any([type(w)!=mps.MPS for w in bras+kets]) or \
+            (A is not None and (type(A)!=MultiOperator or A.tree is not None)):
+        out = np.zeros((nb,nk),dtype=np.complex128) # one by one
+        for i in range(nb):
+            for j in range(nk):
+                if A is None: out[i,j] = self.overlap(bras[i],kets[j])
+                else: out[i,j] = self.aMb(bras[i],A,kets[j])
+        return out
+    same = [w.name for w in bras]==[w.name for w in kets] # same MPS
+    if hermitian is None: hermitian = A is None or A.is_hermitian()
+    hermitian = hermitian and same
+    def f(): # compute it
+        self.task = {"matrix_elements":"true",
+                "matrix_elements_bras":",".join([w.name for w in bras]),
+                "matrix_elements_kets":",".join([w.name for w in kets]),
+                "matrix_elements_hermitian":hermitian,
+                }
+        if A is not None: # write the operator
+            self.task["matrix_elements_operator"] = "matrix_elements_M.in"
+            A.write(name=self.filename("matrix_elements_M.in"))
+        self.run() # run calculation
+        return self.get_results("MATRIX_ELEMENTS.OUT").reshape((nb,nk))
+    objs = bras + kets + [A for i in range(int(A is not None))]
+    key = self.cache_key(("matrix_elements",nb,A is None,hermitian),*objs)
+    return np.array(self.cached(key,f))
+
+
+def gram(self,wfs):
+    """Compute the matrix of overlaps <wfs[i]|wfs[j]>"""
+    return matrix_elements(self,wfs,None,wfs)
+
+
 def overlap_dmrg(self,wf1,wf2):
     """Compute the overlap between wavefunctions"""
 
-    task = {"overlap":"true",
-            }
-    self.task = task # override tasks
-    wf1.write(name="overlap_wf1.mps") # copy wavefunction
-    wf2.write(name="overlap_wf2.mps") # copy wavefunction
-    self.execute( lambda : self.run()) # run calculation
-    m = self.execute( lambda : np.genfromtxt("OVERLAP.OUT")) # run calculation
-    return m[0] + 1j*m[1]
+    def f(): # compute it
+        self.task = {"overlap":"true",
+                "overlap_wf1":wf1.name,
+                "overlap_wf2":wf2.name,
+                }
+        self.run() # run calculation
+        return self.get_results("OVERLAP.OUT")[0] # read result
+    return self.cached(self.cache_key("overlap",wf1,wf2),f)
 
 
 def overlap_aMb_dmrg(self,wf1,A,wf2):
@@ -78,15 +122,18 @@ def overlap_aMb_dmrg_MO(self,wf1,A,wf2):
     """Compute the overlap between wavefunctions, with A a multioperator"""
     from .multioperator import obj2MO
     A = obj2MO(A) # convert to a MO
-    task = {"overlap_aMb":"true",
-            }
-    self.task = task # override tasks
-    self.execute(lambda: wf1.write(name="overlap_aMb_wf1.mps"))
-    self.execute(lambda: wf2.write(name="overlap_aMb_wf2.mps"))
-    self.execute(lambda: A.write(name="overlap_aMb_M.in"))
-    self.execute(lambda: self.run()) # run calculation
-    m = self.execute(lambda : np.genfromtxt("OVERLAP_aMb.OUT")) # read
-    return m[0] + 1j*m[1]
+    if A.tree is not None: # lazy operator, as a sequence of MPOs
+        from .multioperatortk import lazy
+        return lazy.aMb(self,wf1,A,wf2)
+    def f(): # compute it
+        self.task = {"overlap_aMb":"true",
+                "overlap_aMb_wf1":wf1.name,
+                "overlap_aMb_wf2":wf2.name,
+                }
+        A.write(name=self.filename("overlap_aMb_M.in"))
+        self.run() # run calculation
+        return self.get_results("OVERLAP_aMb.OUT")[0] # read result
+    return self.cached(self.cache_key("aMb",wf1,A,wf2),f)
 
 
 def applyoperator(self,A,wf,**kwargs):
@@ -118,40 +165,74 @@ def summps(self,wf1,wf2,**kwargs):
 
 def summps_dmrg(self,wf1,wf2):
     """Apply operator to a many body wavefunction"""
-    self.execute(lambda: wf1.write(name="summps_wf1.mps")) # write WF
-    self.execute(lambda: wf2.write(name="summps_wf2.mps")) # write WF
     task = {"summps":"true",
+            "summps_wf1":wf1.name,
+            "summps_wf2":wf2.name,
             }
     self.task = task
-    self.execute(lambda : self.run()) # run calculation
+    self.run() # run calculation
     return mps.MPS(self,name="summps_wf3.mps").copy() # copy
 
 
 
+def linear_combination(self,cs,wfs,maxm=None,cutoff=None):
+    """
+    Compute sum_i cs[i]*wfs[i], adding all the wavefunctions at once
+    with a single compression of the result
+    """
+    if len(wfs)==0: raise # nothing to add
+    cs = np.array(cs,dtype=np.complex128) # coefficients
+    if any([type(w)==np.ndarray for w in wfs]): # ED wavefunctions
+        return sum([cs[i]*wfs[i] for i in range(len(wfs))])
+    if self.itensor_version in ["julia","Julia","jl"] or \
+            any([type(w)!=mps.MPS for w in wfs]):
+        out = 0
+        for i in range(len(wfs)): out = out + complex(cs[i])*wfs[i] # one by one
+        return out
+    if maxm is None: maxm = self.maxm # bond dimension
+    if cutoff is None: cutoff = self.cutoff # discarded weight
+    def f(): # compute it
+        tostr = lambda x: ",".join([repr(float(xi)) for xi in x]) # list
+        self.task = {"linear_combination":"true",
+                "linear_combination_wfs":",".join([w.name for w in wfs]),
+                "linear_combination_real":tostr(cs.real),
+                "linear_combination_imag":tostr(cs.imag),
+                "maxm":maxm,"cutoff":cutoff,
+                }
+        self.run() # run calculation
+        return mps.MPS(self,name="linear_combination.mps")
+    key = self.cache_key(("linear_combination",tuple(cs),maxm,cutoff),*wfs)
+    return self.cached(key,f).copy() # copy, sharing the file
+
+
 def applyoperator_dmrg(self,A,wf):
     """Apply operator to a many body wavefunction"""
-    self.execute(lambda: wf.write()) # write WF
-    task = {"applyoperator":"true",
-            "applyoperator_wf0":wf.name,
-            "applyoperator_multioperator":"applyoperator_multioperator.in",
-            "applyoperator_wf1":"applyoperator_wf1.mps",
-            }
-    self.execute(lambda: A.write(name="applyoperator_multioperator.in"))
-    self.task = task
-    self.execute( lambda : self.run()) # run calculation
-    return mps.MPS(self,name="applyoperator_wf1.mps").copy() # copy
+    if getattr(A,"tree",None) is not None: # lazy operator, as a sequence of MPOs
+        from .multioperatortk import lazy
+        return lazy.apply(self,A,wf)
+    def f(): # compute it
+        self.task = {"applyoperator":"true",
+                "applyoperator_wf0":wf.name,
+                "applyoperator_multioperator":"applyoperator_multioperator.in",
+                "applyoperator_wf1":"applyoperator_wf1.mps",
+                }
+        A.write(name=self.filename("applyoperator_multioperator.in"))
+        self.run() # run calculation
+        return mps.MPS(self,name="applyoperator_wf1.mps")
+    out = self.cached(self.cache_key("applyoperator",A,wf),f)
+    return out.copy() # copy, sharing the file
 
 
 def applyinverse_dmrg(self,A,wf,tol=1e-4,maxn=100):
     """Apply operator to a many body wavefunction"""
-    self.execute(lambda: wf.write(name="apply_inverse_wf0.mps")) # write WF
     task = {"apply_inverse":"true",
+            "apply_inverse_wf0":wf.name,
             "cvm_tol":tol,
             "cvm_nit":maxn,
             }
-    self.execute(lambda: A.write(name="apply_inverse_multioperator.in"))
+    A.write(name=self.filename("apply_inverse_multioperator.in"))
     self.task = task
-    self.execute( lambda : self.run()) # run calculation
+    self.run() # run calculation
     return mps.MPS(self,name="apply_inverse_wf1.mps").copy() # copy
 
 
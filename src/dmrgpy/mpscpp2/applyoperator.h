@@ -14,23 +14,46 @@ static auto applyoperator=[]() {
 
 static auto get_summps=[]() {
   // now get the MPS
-  auto psi1 = read_wf("summps_wf1.mps") ; // get the WF
-  auto psi2 = read_wf("summps_wf2.mps") ; // get the WF
+  auto psi1 = read_wf(get_str_default("summps_wf1","summps_wf1.mps")) ; 
+  auto psi2 = read_wf(get_str_default("summps_wf2","summps_wf2.mps")) ; 
   auto psi3 = sum_mps(psi1,psi2) ;
   writeToFile("summps_wf3.mps",psi3);
 };
 
 
+
+// linear combination sum_i c_i |psi_i> of several MPS, given as comma
+// separated lists. The MPS are joined in a direct sum, and compressed
+// a single time with the density matrix of the sum
+static auto linear_combination=[]() {
+  auto names = split_str(get_str("linear_combination_wfs")) ; // MPS
+  auto cr = split_str(get_str("linear_combination_real")) ; // coefficients
+  auto ci = split_str(get_str("linear_combination_imag")) ;
+  std::vector<MPS> psis ;
+  for (int i=0;i<names.size();i++) {
+    auto psi = read_wf(names.at(i)) ;
+    psi *= Cplx(std::stod(cr.at(i)),std::stod(ci.at(i))) ; // weight
+    psis.push_back(psi) ;
+  } ;
+  int maxm = get_int_value("maxm") ; // bond dimension
+  auto cutoff = get_float_value("cutoff") ; // cutoff
+  auto psi = direct_sum_mps(psis) ; // exact sum
+  if (psi.N()>1) psi.orthogonalize({"Maxm",maxm,"Cutoff",cutoff}) ; 
+  writeToFile(get_str_default("linear_combination_output",
+			  "linear_combination.mps"),psi);
+};
+
+
 static auto overlap_aMb=[]() {
   // now get the MPS
-  auto psi1 = read_wf("overlap_aMb_wf1.mps") ; // get the WF
-  auto psi2 = read_wf("overlap_aMb_wf2.mps") ; // get the WF
-  auto A = get_mpo_operator("overlap_aMb_M.in"); // get the operator
+  auto psi1 = read_wf(get_str_default("overlap_aMb_wf1",
+			  "overlap_aMb_wf1.mps")) ; // get the WF
+  auto psi2 = read_wf(get_str_default("overlap_aMb_wf2",
+			  "overlap_aMb_wf2.mps")) ; // get the WF
+  auto A = get_mpo_operator(get_str_default("overlap_aMb_M",
+			  "overlap_aMb_M.in")); // get the operator
   auto c = overlapC(psi1,A,psi2) ; // compute overlap
-  ofstream ofile; // declare
-  ofile.open("OVERLAP_aMb.OUT");  // open file
-  ofile << std::setprecision(20) << real(c) << "  " << imag(c) << endl ;
-  ofile.close() ; // close file
+  write_results(get_str_default("overlap_aMb_output","OVERLAP_aMb.OUT"),{c});
 };
 
 
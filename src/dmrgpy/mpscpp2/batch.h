@@ -0,0 +1,15 @@
+// run several independent tasks in the same call, the parameters of
+// each task are in the groups task_0, task_1, ... of tasks.in
+
+static auto run_batch=[](auto do_tasks) {
+  int n = get_int_value("batch_n") ; // number of tasks
+  read_wf_keep = true ; // the wavefunctions do not change during a batch
+  for (int i=0;i<n;i++) {
+    task_index = i ; // parameters of this task
+    do_tasks() ; // perform this task
+  } ;
+  task_index = -1 ; // back to the common parameters
+  read_wf_keep = false ;
+  if (not persistent) read_wf_stored.clear() ; // remove the stored WFs
+}
+;
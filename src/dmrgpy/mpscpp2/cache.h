@@ -0,0 +1,18 @@
+// objects kept in memory between tasks, used when mpscpp.x
+// runs as a persistent process (see server.h)
+
+#include <sstream>
+#include <map>
+
+
+static bool persistent = false ; // true if running as a persistent process
+
+
+// return the full content of a file (empty if it does not exist)
+static auto file_content=[](std::string filename) {
+  ifstream f(filename, ios::binary); // open file
+  std::stringstream s;
+  if (f.good()) s << f.rdbuf(); // read everything
+  return s.str() ;
+}
+;
@@ -1,10 +1,94 @@
 // check if this task should be performed
 
+// The file tasks.in is read once per run, and its entries are kept in
+// memory. It contains a group "tasks" with the parameters of the run,
+// and optionally groups "task_0", "task_1", ... with the parameters of
+// each task of a batch (see taskdmrg.py for the schema)
+//
+//   tasks
+//   {
+//    maxm = 30
+//    batch_n = 2
+//   }
+//   task_0
+//   {
+//    vev = true
+//   }
+
+#include <map>
+#include <vector>
+#include <sstream>
+
+static std::string tasks_file = "tasks.in" ; // file with the tasks
+
+typedef std::map<std::string,std::string> TaskGroup ; // entries of a group
+static TaskGroup task_common ; // parameters of all the tasks
+static std::vector<TaskGroup> task_list ; // parameters of each task
+static int task_index = -1 ; // current task of the batch (-1 for none)
+
+
+// remove spaces at the beginning and end
+static auto strip_str=[](std::string s) {
+  auto i0 = s.find_first_not_of(" \t\r") ;
+  if (i0==std::string::npos) return std::string("") ;
+  auto i1 = s.find_last_not_of(" \t\r") ;
+  return s.substr(i0,i1-i0+1) ;
+}
+;
+
+
+// split a comma separated list
+static auto split_str=[](std::string s) {
+  std::vector<std::string> out ;
+  std::stringstream ss(s) ;
+  for (std::string w; std::getline(ss,w,',');) out.push_back(strip_str(w)) ;
+  return out ;
+}
+;
+
+
+// read all the groups in the tasks file
+static auto read_tasks=[](std::string filename) {
+  task_common.clear() ;
+  task_list.clear() ;
+  ifstream f(filename) ; // open file
+  std::string line,group ;
+  while (std::getline(f,line)) {
+    line = strip_str(line.substr(0,line.find("#"))) ; // remove comments
+    if ((line=="") or (line=="{")) continue ;
+    if (line=="}") { group = "" ; continue ; } ; // end of the group
+    auto i = line.find("=") ;
+    if (i==std::string::npos) { // start of a group
+      group = line ;
+      if (group.rfind("task_",0)==0) task_list.push_back(TaskGroup()) ;
+      continue ;
+    } ;
+    auto key = strip_str(line.substr(0,i)) ;
+    auto value = strip_str(line.substr(i+1)) ;
+    if (group.rfind("task_",0)==0) task_list.back()[key] = value ;
+    else task_common[key] = value ;
+  } ;
+}
+;
+
+
+// value of an entry, first in the current task, then in the common ones
+static auto task_value=[](std::string name, std::string df) {
+  if (task_index>=0) {
+    auto &t = task_list.at(task_index) ;
+    if (t.count(name)>0) return t.at(name) ;
+  } ;
+  if (task_common.count(name)>0) return task_common.at(name) ;
+  return df ;
+}
+;
+
+
 static auto check_task = [](auto name){
 // bool check_task(auto name) {
-  auto input = InputGroup("tasks.in","tasks");
-  auto dotask = input.getYesNo(name,false);
-  return dotask ;
+  auto v = task_value(name,"false") ;
+  for (auto &c : v) c = tolower(c) ;
+  return (v=="true") or (v=="yes") or (v=="t") or (v=="y") or (v=="1") ;
 }
 ;
 
@@ -14,34 +98,37 @@ static auto check_task = [](auto name){
 // functions to get data from the input file
 
 static auto get_int_value= [](auto name) {
-  auto input = InputGroup("tasks.in","tasks");
-  auto N = input.getInt(name,1);
-  return N ;
+  auto v = task_value(name,"") ;
+  if (v=="") return 1 ;
+  return int(std::stod(v)) ;
 }
 ;
 
 
 
 static auto get_float_value= [](auto name) {
-  auto input = InputGroup("tasks.in","tasks");
-  auto N = input.getReal(name,0.0);
-  return N ;
+  auto v = task_value(name,"") ;
+  if (v=="") return 0.0 ;
+  return std::stod(v) ;
 }
 ;
 
 
 
 static auto get_str= [](auto name) {
-  auto input = InputGroup("tasks.in","tasks");
-  return input.getString(name,"");
+  return task_value(name,"") ;
+}
+;
+
+
+static auto get_str_default= [](auto name, std::string df) {
+  return task_value(name,df) ;
 }
 ;
 
 
 static auto get_bool= [](auto name) {
-  auto input = InputGroup("tasks.in","tasks");
-  auto dotask = input.getYesNo(name,false);
-  return dotask ;
+  return check_task(name) ;
 }
 ;
 
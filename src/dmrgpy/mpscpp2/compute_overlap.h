@@ -1,10 +1,38 @@
 static auto compute_overlap=[]() {
-  ofstream myfile;
-  auto wf1 = read_wf("overlap_wf1.mps") ; // read first wavefunction 
-  auto wf2 = read_wf("overlap_wf2.mps") ; // read second wavefunction 
+  auto wf1 = read_wf(get_str_default("overlap_wf1","overlap_wf1.mps")) ; 
+  auto wf2 = read_wf(get_str_default("overlap_wf2","overlap_wf2.mps")) ; 
   auto out = overlapC(wf1,wf2) ; // compute overlap
-  myfile.open("OVERLAP.OUT");
-  myfile << std::setprecision(20) << real(out) << endl;  // compute
-  myfile << std::setprecision(20) << imag(out) << endl;  // compute
+  write_results(get_str_default("overlap_output","OVERLAP.OUT"),{out});
+}
+;
+
+
+
+// matrix <bra_i|A|ket_j> for lists of wavefunctions, with A the operator
+// in the file matrix_elements_operator, or the identity if it is empty.
+// If the operator is Hermitian and the bras and kets are the same, only
+// half of the matrix is computed
+static auto matrix_elements=[]() {
+  std::vector<MPS> bras,kets ; // wavefunctions
+  for (auto &n : split_str(get_str("matrix_elements_bras"))) 
+	  bras.push_back(read_wf(n)) ;
+  for (auto &n : split_str(get_str("matrix_elements_kets"))) 
+	  kets.push_back(read_wf(n)) ;
+  auto opname = get_str("matrix_elements_operator") ; // file of the operator
+  auto hermitian = get_bool("matrix_elements_hermitian") ; // symmetry
+  int nb = bras.size() , nk = kets.size() ;
+  std::vector<Cplx> cs(nb*nk,0.0) ; // matrix, by rows
+  auto A = MPO() ; 
+  if (opname!="") A = get_mpo_operator(opname) ; // operator
+  for (int i=0;i<nb;i++) {
+    for (int j=0;j<nk;j++) {
+      if (hermitian and (j<i)) { // already computed
+        cs[i*nk+j] = std::conj(cs[j*nk+i]) ; continue ; } ;
+      if (opname=="") cs[i*nk+j] = overlapC(bras[i],kets[j]) ;
+      else cs[i*nk+j] = overlapC(bras[i],A,kets[j]) ;
+    } ;
+  } ;
+  write_results(get_str_default("matrix_elements_output",
+			  "MATRIX_ELEMENTS.OUT"),cs);
 }
 ;
@@ -0,0 +1,74 @@
+// matrices of two point correlators <A_i B_j> for all the pairs of sites
+//
+// For each row i the orthogonality center is moved to site i, and the
+// environment with A_i is extended to the right and to the left, site
+// by site, closing it with B_j at each step. Several pairs of operators
+// can be given, as comma separated lists, and all of them are computed
+// in the same sweep. Fermionic operators are given by their local part
+// (A, Adag), and the Jordan-Wigner strings are included as F operators
+// between the two sites:
+//   i<j   (a_i F_i) F_{i+1} ... F_{j-1} b_j
+//   i>j   (F_j b_j) F_{j+1} ... F_{i-1} a_i
+//   i=j   a_i b_i
+
+
+static auto correlation_matrix=[]() {
+  auto sites = get_sites(); // read sites
+  auto psi = read_wf(get_str("correlation_matrix_wf")) ; // wavefunction
+  psi /= sqrt(overlap(psi,psi)); // normalize
+  auto namesa = split_str(get_str("correlation_matrix_A")) ; // first ones
+  auto namesb = split_str(get_str("correlation_matrix_B")) ; // second ones
+  auto fermionic = split_str(get_str("correlation_matrix_fermionic")) ;
+  int N = sites.N() ; // number of sites
+  int np = namesa.size() ; // number of pairs of operators
+  std::vector<Cplx> cs(np*N*N,0.0) ; // matrices, by rows
+  auto op = [&](std::string name, int k) { ITensor o = sites.op(name,k) ;
+	                                    return o ; } ;
+  for (int i=1;i<=N;i++) { // loop over rows
+    psi.position(i) ; // left and right sites are the identity
+    auto ket = psi.A(i) ;
+    for (int p=0;p<np;p++) { // loop over pairs of operators
+    auto isf = (fermionic.at(p)=="1") ; // Jordan-Wigner strings
+    auto &namea = namesa.at(p) , &nameb = namesb.at(p) ;
+    auto c0 = p*N*N + (i-1)*N - 1 ; // position of the row
+    auto oi = op(namea,i) ; // operator in site i
+    cs[c0+i] = (dag(prime(ket,Site))*multSiteOps(oi,op(nameb,i))
+		    *ket).cplx() ; // diagonal
+    if (i<N) { // sites on the right
+      auto ir = commonIndex(psi.A(i),psi.A(i+1),Link) ; // right link
+      if (isf) oi = multSiteOps(oi,op("F",i)) ; // string
+      auto L = ket*oi*dag(prime(prime(ket,Site),ir)) ; // environment
+      for (int j=i+1;j<=N;j++) {
+        auto jl = commonIndex(psi.A(j),psi.A(j-1),Link) ; // left link
+	auto C = L*psi.A(j)*op(nameb,j) ;
+        C *= dag(prime(prime(psi.A(j),Site),jl)) ; // close it
+        cs[c0+j] = C.cplx() ;
+	if (j==N) break ;
+	L *= psi.A(j) ; // extend the environment
+	if (isf) L *= op("F",j)*dag(prime(prime(psi.A(j),Site),Link)) ;
+	else L *= dag(prime(psi.A(j),Link)) ;
+      } ;
+    } ;
+    if (i>1) { // sites on the left
+      auto il = commonIndex(psi.A(i),psi.A(i-1),Link) ; // left link
+      auto R = ket*op(namea,i)*dag(prime(prime(ket,Site),il)) ; // environment
+      for (int j=i-1;j>=1;j--) {
+        auto jr = commonIndex(psi.A(j),psi.A(j+1),Link) ; // right link
+	auto oj = op(nameb,j) ;
+	if (isf) oj = multSiteOps(op("F",j),oj) ; // string
+	auto C = R*psi.A(j)*oj ;
+        C *= dag(prime(prime(psi.A(j),Site),jr)) ; // close it
+        cs[c0+j] = C.cplx() ;
+	if (j==1) break ;
+	R *= psi.A(j) ; // extend the environment
+	if (isf) R *= op("F",j)*dag(prime(prime(psi.A(j),Site),Link)) ;
+	else R *= dag(prime(psi.A(j),Link)) ;
+      } ;
+    } ;
+    } ;
+  } ;
+  write_results(get_str_default("correlation_matrix_output",
+			  "CORRELATION_MATRIX.OUT"),cs);
+  return 0; // dummy return
+}
+;
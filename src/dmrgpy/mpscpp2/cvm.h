@@ -77,7 +77,8 @@ static auto apply_inverse=[]() {
     auto tol = get_float_value("cvm_tol") ; // GS energy
     auto args = Args("Cutoff",cutoff,"Maxm",maxm); // MPS arguments
     auto A = get_mpo_operator("apply_inverse_multioperator.in");
-    auto wf = read_wf("apply_inverse_wf0.mps") ; 
+    auto wf = read_wf(get_str_default("apply_inverse_wf0",
+			    "apply_inverse_wf0.mps")) ; 
     auto x = bicstab(A, wf, tol, max_it, args);
     writeToFile("apply_inverse_wf1.mps",x);
     return 0;
@@ -1,7 +1,67 @@
 // read an auto Hamiltonian from file
 
+static std::string binary_magic = "DMRGPYMO" ; // binary operator files
+
+
+// terms of an operator in the binary format written by multioperator.write
+struct OperatorTerms {
+    std::vector<std::string> names ; // names of the operators
+    std::vector<long long> lens,codes,sites ; // factors and sites (from 1)
+    std::vector<std::complex<double>> cs ; // coefficients
+} ;
+
+
+// check if a file contains an operator in the binary format
+static auto is_binary_operator=[](std::string filename) {
+    ifstream f(filename, ios::binary); // file to read
+    std::string magic(binary_magic.size(),' ') ; // first bytes of the file
+    f.read(&magic[0],magic.size()) ;
+    return (f and (magic==binary_magic)) ;
+};
+
+
+// read the terms of an operator in the binary format
+static auto read_binary_terms=[](std::string filename) {
+    ifstream f(filename, ios::binary); // file to read
+    f.seekg(binary_magic.size()); // skip the magic bytes
+    std::vector<long long> head(4); // terms, factors, names, size of names
+    f.read((char*)head.data(),4*sizeof(long long));
+    auto nt = head[0] , nf = head[1] ;
+    std::string ns(head[3],' ') ; // names separated by newlines
+    f.read(&ns[0],head[3]);
+    OperatorTerms out ;
+    std::stringstream nss(ns) ;
+    for (std::string n; std::getline(nss,n);) out.names.push_back(n) ;
+    out.lens.resize(nt) ; out.cs.resize(nt) ;
+    out.codes.resize(nf) ; out.sites.resize(nf) ;
+    f.read((char*)out.lens.data(),nt*sizeof(long long));
+    f.read((char*)out.cs.data(),nt*sizeof(std::complex<double>));
+    f.read((char*)out.codes.data(),nf*sizeof(long long));
+    f.read((char*)out.sites.data(),nf*sizeof(long long));
+    if (not f) { cout << "Wrong operator file " << filename << endl ;
+                 exit(EXIT_FAILURE) ; } ;
+    return out ;
+};
+
+
+// read an operator in the binary format written by multioperator.write
+static auto get_ampo_binary=[](auto ampo,std::string filename) {
+    auto op = read_binary_terms(filename) ; // terms of the operator
+    long long k = 0 ; // current factor
+    for (long long i=0;i<(long long)op.lens.size();i++) { // loop over terms
+      auto t = HTerm() ; // product of operators
+      for (long long j=0;j<op.lens[i];j++,k++) 
+	      t.add(op.names[op.codes[k]],op.sites[k]) ;
+      t *= Cplx(op.cs[i]) ; // coefficient
+      ampo.add(t) ; // add to the sum
+    } ;
+    return ampo ;
+};
+
+
 static auto get_ampo_operator=[](auto ampo,std::string filename) {
-    ifstream hfile; // file to read
+    if (is_binary_operator(filename)) return get_ampo_binary(ampo,filename);
+    ifstream hfile; // file to read, in text format
     hfile.open(filename); // file with the operator
     int numterms ; // number of terms in the sum
     auto cr=0.0;
@@ -18,7 +78,7 @@ static auto get_ampo_operator=[](auto ampo,std::string filename) {
 
 
 
-static auto get_mpo_operator=[](std::string filename) {
+static auto compile_mpo_operator=[](std::string filename) {
 	auto sites = get_sites(); // read sites
 	auto ampo = AutoMPO(sites); // generate ampo
 	ampo = get_ampo_operator(ampo,filename) ; // generate ampo
@@ -27,3 +87,58 @@ static auto get_mpo_operator=[](std::string filename) {
 	return toMPO<ITensor>(ampo,{"Maxm",mpomaxm,"Exact",false}); // return mpo
 };
 
+
+
+// 128-bit digest of a string (two FNV-1a hashes with different seeds),
+// written in hexadecimal
+static auto content_digest=[](std::string s) {
+	unsigned long long h1 = 14695981039346656037ULL ; // FNV offset
+	unsigned long long h2 = 1099511628211ULL*h1 + s.size() ; // other seed
+	for (unsigned char c : s) {
+	  h1 = (h1 ^ c)*1099511628211ULL ; // FNV-1a step
+	  h2 = (h2 ^ c)*1099511628211ULL ;
+	  h2 ^= h2 >> 29 ; // decorrelate from the first hash
+	} ;
+	std::stringstream out ; // hexadecimal digits
+	out << std::hex << std::setfill('0') << std::setw(16) << h1 ;
+	out << std::setw(16) << h2 ;
+	return out.str() ;
+};
+
+
+// return the MPO of an operator, reusing the ones already compiled
+// (kept in memory by a persistent process, and in files otherwise).
+// Operators are identified by a digest of the sites, the operator and
+// the bond dimension. The files are 32 slots chosen with the digest,
+// and the digest is stored next to each MPO, so a stale file in a
+// reused folder just compiles the operator again
+static auto get_mpo_operator=[](std::string filename) {
+	if (not get_bool("mpo_cache")) return compile_mpo_operator(filename);
+	static std::map<std::string,MPO> cached_mpos ; // stored MPOs
+	auto key = sites_key() + file_content(filename) ; // operator
+	key += std::to_string(get_int_value("mpomaxm")) ; // bond dimension
+	key = content_digest(key) ; // keep only the digest
+	if (cached_mpos.count(key)==1) return cached_mpos.at(key) ; // in memory
+	if (persistent) { // keep it in memory
+	  auto A = compile_mpo_operator(filename) ; // compile the operator
+	  if (cached_mpos.size()>=32) cached_mpos.clear() ; // too many
+	  cached_mpos[key] = A ; // store
+	  return A ;
+	} ;
+	auto sites = get_sites(); // read sites
+	auto slot = key.substr(key.size()-2) ; // last byte of the digest
+	slot = std::to_string(std::stoi(slot,nullptr,16) % 32) ; // slot
+	auto cachefile = "mpo_cache_"+slot+".mpo" ; // stored MPO
+	auto keyfile = "mpo_cache_"+slot+".key" ; // digest of the stored MPO
+	auto A = MPO(sites) ; // initialize
+	if (ifstream(cachefile).good() and (file_content(keyfile)==key)) {
+	  readFromFile(cachefile,A) ; // same operator
+	  return A ;
+	} ;
+	A = compile_mpo_operator(filename) ; // compile the operator
+	std::remove(keyfile.c_str()) ; // invalid while the MPO is written
+	writeToFile(cachefile,A) ; // store for the next calls
+	ofstream fk(keyfile, ios::binary) ; fk << key ; // key of this MPO
+	return A ;
+};
+
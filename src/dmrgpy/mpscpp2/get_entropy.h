@@ -4,7 +4,7 @@ static auto get_entropy=[]() {
   //Given an MPS or IQMPS called "psi",
   //and some particular bond "b" (1 <= b < psi.N())
   //across which we want to compute the von Neumann entanglement
-  auto psi = read_wf("wavefunction.mps"); 
+  auto psi = read_wf(get_str_default("entropy_wf","wavefunction.mps")); 
   auto b = get_int_value("bond_entropy") ; // bond to compute
   //"Gauge" the MPS to site b
   psi.position(b); 
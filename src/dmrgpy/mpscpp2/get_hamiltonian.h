@@ -37,7 +37,7 @@ static auto get_ampo=[](auto sites) {
 
 
 static auto get_hamiltonian=[](auto sites) {
-    return get_mpo_operator("hamiltonian.in") ;
+    return get_mpo_operator("hamiltonian.in") ; // compiled Hamiltonian
 }
 ;
 
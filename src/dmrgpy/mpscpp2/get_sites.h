@@ -95,12 +95,28 @@ auto generate_sites() { // function to generate the sites
 
 
 
+// key identifying the sites currently in the folder
+std::string sites_key() {
+    auto key = file_content("sites.in") ; // type of sites
+    if (check_task("gs_from_file") or check_task("sites_from_file"))
+      key += file_content("sites.sites") ; // indexes of the sites
+    return key ;
+}
+
+
 auto get_sites() { // function to get the sites
+    static std::string cached_key = "" ; // key of the stored sites
+    static std::vector<SpinX> cached_sites ; // stored sites
+    auto key = sites_key() ; // current key
+    if ((key==cached_key) and (cached_sites.size()==1)) 
+        return cached_sites.at(0) ;
     auto sites = generate_sites() ;  // generate the sites
     // overwrite the sites
     if (check_task("gs_from_file")) readFromFile("sites.sites",sites);
     if (check_task("sites_from_file")) readFromFile("sites.sites",sites);
     cout << "Number of sites " << sites.N() << endl ;
+    cached_key = key ; // store for the next call
+    cached_sites.assign(1,sites) ;
     return sites ;
 }
 
@@ -113,13 +129,14 @@ auto write_sites() { // function to get the sites
 
 
 int site_type(int index) {
-    static int called = 0; // define a variable to check the calling
+    static std::string called = ""; // content of the file already read
     ifstream sfile; // file to read
     static int N; // number of sites
     static auto stypes = std::vector<int>(1); // define a dummy one
     int out = -1;
-    // first call, read the file
-    if (called==0) { 
+    // first call (or new sites), read the file
+    auto content = file_content("sites.in") ; // current sites
+    if (called!=content) { 
       int nm;
       sfile.open("sites.in"); // file with the sites
       sfile >> N; // read the number of sites and number of projections
@@ -130,7 +147,7 @@ int site_type(int index) {
 //        if (i-1==index) out = nm ; 
         }
       sfile.close() ;
-      called = 1; // next time do not read
+      called = content; // next time do not read
       };
     out = stypes.at(index); // get the value
     cout << index << " site is of type  " << out << endl ;
@@ -1,8 +1,7 @@
 // compute the KPM moments for matrix m and vectors vi and vj
 // and a shift in the energy
 static auto moments_vi_vj_shift=[](auto m, auto vi, auto vj, int n, auto shift) {
-  ofstream myfile;
-  myfile.open("KPM_MOMENTS.OUT"); // open file
+  std::vector<Cplx> mus; // moments
   int kpmmaxm = get_int_value("kpmmaxm") ; // bond dimension for KPM
   auto v = vi*1.0 ; // initialize
   auto am = vi*1.0 ; // initialize
@@ -11,18 +10,19 @@ static auto moments_vi_vj_shift=[](auto m, auto vi, auto vj, int n, auto shift)
   auto ap = a*1.0 ; // initialize
   auto bk = overlapC(vj,v) ; // overlap
   auto bk1 = overlapC(vj,a) ; // overlap
-  myfile << std::setprecision(20) << real(bk) << endl;
-  myfile << std::setprecision(20) << real(bk1) << endl;
+  mus.push_back(bk); // store
+  mus.push_back(bk1); // store
   int i ;
   for(i=0;i<n;i++) {
     ap = exactApplyMPO(a,m,{"Maxm",kpmmaxm,"Cutoff",1E-7}) ; // apply
     ap = 2.0*sum(ap,shift*a,{"Maxm",kpmmaxm,"Cutoff",1E-7}) ; // shift
     ap = sum(ap,-1.0*am,{"Maxm",kpmmaxm,"Cutoff",1E-7}) ; // recursion relation
     bk = overlapC(vj,ap) ; // compute term 
-    myfile << std::setprecision(20) << real(bk) << endl;
+    mus.push_back(bk); // store
     am = a*1.0; // next iteration
     a = ap*1.0; // next iteration
   } ;
+  write_results("KPM_MOMENTS.OUT",mus); // write moments
   return 0 ;
 } ;
 
@@ -53,8 +53,8 @@ static auto get_moments_spismj_brute=[](auto sites, auto H, int n, int i, int j)
 static auto general_kpm=[]()
 {
   auto sites = get_sites(); // Get the different sites
-  auto wfa = read_wf("wfa.mps") ; // first wavefunction
-  auto wfb = read_wf("wfb.mps") ; // first wavefunction
+  auto wfa = read_wf(get_str_default("kpm_wfa","wfa.mps")) ; // first WF
+  auto wfb = read_wf(get_str_default("kpm_wfb","wfb.mps")) ; // second WF
   auto m = get_mpo_operator("kpm_operator.in") ;
   auto num_pol = get_int_value("kpm_num_polynomials");
   moments_vi_vj(m,wfa,wfb,num_pol) ; //compute the KPM moments
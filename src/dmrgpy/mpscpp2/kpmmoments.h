@@ -3,9 +3,8 @@ static auto moments_vi_vj_full=[](auto m, auto vi, auto vj, int n) {
   // technique use to apply the mpo
 //  auto fitmpo = get_bool("fitmpo_kpm") ;
 //  fitmpo = false ; // this does not work ok
-  ofstream myfile; // file for the moments
+  std::vector<Cplx> mus; // moments
   ofstream entropyfile; // file for the entropies
-  myfile.open("KPM_MOMENTS.OUT"); // open file
   entropyfile.open("KPM_ENTROPY.OUT"); // open file
   int kpmmaxm = get_int_value("kpmmaxm") ; // bond dimension for KPM
   auto kpmcutoff = get_float_value("kpm_cutoff") ; // bond dimension for KPM
@@ -19,10 +18,8 @@ static auto moments_vi_vj_full=[](auto m, auto vi, auto vj, int n) {
   auto bk = overlapC(vj,v) ; // overlap
   auto bk1 = overlapC(vj,a) ; // overlap
   int cindex = v.N()/2 ; // central site
-  myfile << std::setprecision(20) << real(bk) << "  "
-                       << std::setprecision(20)<< imag(bk) << endl;
-  myfile << std::setprecision(20) << real(bk1) << "  "
-                       << std::setprecision(20)<< imag(bk1) << endl;
+  mus.push_back(bk); // store
+  mus.push_back(bk1); // store
   entropyfile << entropy(v,cindex) << endl ;
   entropyfile << entropy(a,cindex) << endl ;
   int i ;
@@ -32,14 +29,13 @@ static auto moments_vi_vj_full=[](auto m, auto vi, auto vj, int n) {
     ap = exactApplyMPO(a,m,{"Maxm",kpmmaxm,"Cutoff",kpmcutoff}) ;
     ap = sum(2.0*ap,-1.0*am,{"Maxm",kpmmaxm,"Cutoff",kpmcutoff}) ; // recursion relation
     bk = overlapC(vj,ap) ; // compute term 
-    myfile << std::setprecision(20) << real(bk) << "  "
-                       << std::setprecision(20)<< imag(bk) << endl;
+    mus.push_back(bk); // store
     entropyfile << entropy(ap,cindex) << endl ;
     am = a*1.0; // next iteration
     a = ap*1.0; // next iteration
   } ;
   entropyfile.close();
-  myfile.close();
+  write_results("KPM_MOMENTS.OUT",mus); // write moments
   return 0 ;
 } ;
 
@@ -50,8 +46,7 @@ static auto moments_vi_vj_full=[](auto m, auto vi, auto vj, int n) {
 // two KPM vectors are the same
 static auto moments_vi_accelerated=[](auto m, auto vi, int n) {
   // technique use to apply the mpo
-  ofstream myfile; // file for the moments
-  myfile.open("KPM_MOMENTS.OUT"); // open file
+  std::vector<Cplx> mus; // moments
   int kpmmaxm = get_int_value("kpmmaxm") ; // bond dimension for KPM
   auto kpmcutoff = get_float_value("kpm_cutoff") ; // bond dimension for KPM
   auto v = vi*1.0 ; // initialize
@@ -63,10 +58,8 @@ static auto moments_vi_accelerated=[](auto m, auto vi, int n) {
   auto bk1 = overlapC(vi,a) ; // overlap
   auto mu0 = bk ; // save the zeroth
   auto mu1 = bk1 ; // save the first
-  myfile << std::setprecision(20) << real(bk) << "  "
-                       << std::setprecision(20)<< imag(bk) << endl;
-  myfile << std::setprecision(20) << real(bk1) << "  "
-                       << std::setprecision(20)<< imag(bk1) << endl;
+  mus.push_back(bk); // store
+  mus.push_back(bk1); // store
   int i ;
   for(i=0;i<n/2;i++) {
     ap = exactApplyMPO(a,m,{"Maxm",kpmmaxm,"Cutoff",kpmcutoff}) ;
@@ -75,14 +68,12 @@ static auto moments_vi_accelerated=[](auto m, auto vi, int n) {
     bk1 = overlapC(a,ap) ; // compute overlap term 
     bk = 2*bk - mu0; // correction due to the trick
     bk1 = 2*bk1 - mu1; // correction due to the trick
-    myfile << std::setprecision(20) << real(bk) << "  "
-                       << std::setprecision(20)<< imag(bk) << endl;
-    myfile << std::setprecision(20) << real(bk1) << "  "
-                       << std::setprecision(20)<< imag(bk1) << endl;
+    mus.push_back(bk); // store
+    mus.push_back(bk1); // store
     am = a*1.0; // next iteration
     a = ap*1.0; // next iteration
   } ;
-  myfile.close();
+  write_results("KPM_MOMENTS.OUT",mus); // write moments
   return 0 ;
 } ;
 
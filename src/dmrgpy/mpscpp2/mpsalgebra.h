@@ -51,3 +51,38 @@ static auto sum_mps=[](auto A1,auto A2) {
 }
 ;
 
+
+
+// defined in ITensor (mpsalgs.cc), joins two link indices
+namespace itensor {
+void plussers(Index const& l1, Index const& l2, Index& sumind,
+		ITensor& first, ITensor& second) ;
+}
+
+
+// direct sum of several MPS, without any truncation (as addAssumeOrth
+// does for two of them). The bond dimension is the sum of the bond
+// dimensions of the MPS, so it should be compressed afterwards
+static auto direct_sum_mps=[](std::vector<MPS> const& psis) {
+  auto L = psis.at(0) ;
+  int N = L.N() ; // number of sites
+  for (int k=1;k<psis.size();k++) {
+    auto &R = psis.at(k) ;
+    if (N==1) { L.Aref(1) += R.A(1) ; continue ; } ; // no links
+    L.primelinks(0,4) ;
+    auto first = std::vector<ITensor>(N) , second = std::vector<ITensor>(N) ;
+    for (int i=1;i<N;i++) { // join the links
+      auto r = rightLinkInd(L,i) ;
+      plussers(rightLinkInd(L,i),rightLinkInd(R,i),r,first[i],second[i]) ;
+    } ;
+    L.Aref(1) = L.A(1)*first.at(1) + R.A(1)*second.at(1) ;
+    for (int i=2;i<N;i++) 
+      L.Aref(i) = dag(first.at(i-1))*L.A(i)*first.at(i)
+	      + dag(second.at(i-1))*R.A(i)*second.at(i) ;
+    L.Aref(N) = dag(first.at(N-1))*L.A(N) + dag(second.at(N-1))*R.A(N) ;
+    L.noprimelink() ;
+  } ;
+  return L ;
+}
+;
+
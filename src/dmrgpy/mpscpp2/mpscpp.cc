@@ -12,6 +12,8 @@ using namespace std;
 
 
 #include"check_task.h" // read the different tasks
+#include"cache.h" // objects kept in memory between tasks
+#include"results.h" // write the results in files
 #include"get_sites.h" // get the sites from a file
 #include"mpsalgebra.h" // functions to deal with MPS
 #include"get_sweeps.h" // get the sweep info
@@ -19,7 +21,7 @@ using namespace std;
 #include"get_ampo_operator.h" // get an arbitrary AMPO operator
 #include"operators.h" // read the different tasks
 #include"get_hamiltonian.h" // get the hoppings (in case there are)
-#include"read_wf.h" // this does not work yet
+#include"read_wf.h" // read wavefunctions from files
 #include"get_gs.h" // compute ground state energy and wavefunction
 #include"bandwidth.h"  // return the bandwidth of the hamiltonian
 #include"get_excited.h" // compute excited states
@@ -34,15 +36,16 @@ using namespace std;
 #include"reduced_dm.h" // Reduced density matrix
 #include"dynamical_correlator_excited.h" // dynamical correlator with exited
 #include"vev.h" // VEV
+#include"correlation_matrix.h" // correlators for all pairs of sites
 #include"applyoperator.h" // apply operator to a vector
 #include"pureapplyoperator.h" // apply a pure operator to a vector
 #include"get_random_mps.h" // get a random MPS
+#include"batch.h" // several tasks in a single call
+#include"server.h" // persistent mode
 
 
-int 
-main()
+static auto do_tasks=[]()
     {
-    system("touch ERROR") ; // create error file
 
 
     // read the number of sites
@@ -70,17 +73,21 @@ main()
     if (check_task("cvm"))  cvm_dynamical_correlator() ; // CVM
 // overlap task
     if (check_task("overlap"))  compute_overlap() ; // compute overlap
+    if (check_task("matrix_elements"))  matrix_elements() ; // matrices
     if (check_task("time_evolution"))  quench() ; // time evolution
     if (check_task("exponential_eMwf"))  exponential_eMwf() ; 
     if (check_task("evolution_AeiHtB"))  evolution_AeiHtB() ; // time evolution
     if (check_task("evolution_measure"))  evolution_measure() ; // time evol
     if (check_task("density_matrix"))  reduced_dm() ; // DM
     if (check_task("vev"))  vev() ; // Vacuum expectation value
+    if (check_task("vev_many"))  vev_many() ; // several VEVs
+    if (check_task("correlation_matrix"))  correlation_matrix() ; 
     if (check_task("applyoperator"))  applyoperator() ; 
     if (check_task("pureapplyoperator"))  pureapplyoperator() ; 
     if (check_task("gen_pureoperator"))  gen_pureoperator() ; 
     if (check_task("overlap_aMb"))  overlap_aMb() ; 
     if (check_task("summps"))  get_summps() ; 
+    if (check_task("linear_combination"))  linear_combination() ; 
     if (check_task("random_mps"))  get_random_mps() ; 
     if (check_task("distribution"))  get_moments_distribution() ; 
     if (check_task("general_kpm"))  general_kpm() ; 
@@ -88,6 +95,33 @@ main()
 //    if (check_task("excited_vev"))  excited_vev() ; // VEV excited
     if (check_task("dynamical_correlator_excited"))  
 	    dynamical_correlator_excited(); // DM
+    return 0;
+    }
+;
+
+
+
+static auto run_tasks=[]()
+    {
+    system("touch ERROR") ; // create error file
+    read_tasks(tasks_file) ; // read all the tasks once
+    if (check_task("batch")) run_batch(do_tasks) ; // several tasks
+    else do_tasks() ; // tasks in tasks.in
     system("rm -f ERROR") ; // remove error file
     return 0;
     }
+;
+
+
+
+int 
+main(int argc, char* argv[])
+    {
+    // persistent mode, wait for requests
+    if ((argc>1) and (std::string(argv[1])=="--server")) {
+      persistent = true ; // objects are kept in memory
+      serve(run_tasks) ;
+      return 0;
+    } ;
+    return run_tasks() ; // run the tasks once
+    }
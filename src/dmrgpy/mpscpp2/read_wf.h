@@ -1,11 +1,36 @@
-// this does not work yet
+// read wavefunctions from files
+#include <map>
+#include <sys/stat.h>
+
+static bool read_wf_keep = false ; // keep the MPS in memory (batches)
+static std::map<std::string,MPS> read_wf_stored ; // stored MPS
+
+
+// size and modification time of a file, to know if it changed
+static auto file_stamp=[](std::string filename) {
+  struct stat s ;
+  if (stat(filename.c_str(),&s)!=0) return std::string("") ; // no file
+  return std::to_string(s.st_size)+"_"+std::to_string(s.st_mtim.tv_sec)
+	  +"_"+std::to_string(s.st_mtim.tv_nsec) ;
+}
+;
+
 
 auto read_wf(std::string name="psi_GS.mps") {
+  // a persistent process keeps the last wavefunctions in memory,
+  // they are only read again if the files changed
+  auto key = name ;
+  if (persistent) key = name+"_"+file_stamp(name)+"_"
+	  +file_stamp("sites.sites") ;
+  if ((read_wf_keep or persistent) and (read_wf_stored.count(key)>0))
+      return read_wf_stored.at(key) ; // already read
   auto sites = get_sites();
 //  readFromFile("sites_file",sites);
   sites = get_sites() ;
   readFromFile("sites.sites",sites);
   auto psi = MPS(sites);
   readFromFile(name,psi);
+  if (persistent and (read_wf_stored.size()>=8)) read_wf_stored.clear() ;
+  if (read_wf_keep or persistent) read_wf_stored.insert({key,psi}) ; // store
   return psi ;
 }
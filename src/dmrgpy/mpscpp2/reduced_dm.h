@@ -30,18 +30,11 @@ static auto reduced_dm=[]() {
 //      }
 //  ;
   // function to write the data
-  ofstream filerdm; // file for the DM
-  filerdm.open("DM.OUT"); // open file
-  filerdm.close(); //close file
-  auto doPrint = [](auto z) { 
-          ofstream filerdm; // file for the DM
-          filerdm.open("DM.OUT", ios::out | ios::app ); // open file
-	  filerdm << std::setprecision(8) << real(z) << "  " ;
-	  filerdm << std::setprecision(8) << imag(z) << endl ;
-          filerdm.close(); //close file
-  };
+  std::vector<Cplx> zs; // elements of the DM
+  auto doPrint = [&zs](auto z) { zs.push_back(z); }; // store
 //  auto doPrint = [](auto x) { cout << x << endl; };
   // evaluate the tensor in the function
   cout << rho << endl;
   rho.visit(doPrint); // loop over tensor
+  write_results("DM.OUT",zs); // write the DM
 };
@@ -0,0 +1,28 @@
+// write a list of complex numbers in a file, either as a binary
+// .npy file (complex128) or, if binary_results = false, as text
+// with two columns "real  imag"
+
+static auto write_results=[](std::string filename, std::vector<Cplx> const& v) {
+  if (get_bool("binary_results")) { // binary format
+    std::string header = "{'descr': '<c16', 'fortran_order': False, ";
+    header += "'shape': (" + std::to_string(v.size()) + ",), }" ;
+    int size = 10 + header.size() + 1 ; // size of the full header
+    header += std::string((64 - size%64)%64,' ') + "\n" ; // align
+    uint16_t hsize = header.size() ; // size of the dictionary
+    ofstream ofile(filename, ios::binary) ; // open file
+    ofile.write("\x93NUMPY\x01\x00",8) ; // magic string and version
+    ofile.put(char(hsize & 0xff)) ; // little endian header size
+    ofile.put(char(hsize >> 8)) ;
+    ofile.write(header.data(),header.size()) ; // header
+    ofile.write(reinterpret_cast<const char*>(v.data()),
+		    v.size()*sizeof(Cplx)) ; // data
+    ofile.close() ; // close file
+  }
+  else { // text format
+    ofstream ofile(filename) ; // open file
+    for (auto z : v) ofile << std::setprecision(20) << real(z) << "  " 
+	                     << std::setprecision(20) << imag(z) << endl ;
+    ofile.close() ; // close file
+  } ;
+}
+;
@@ -0,0 +1,32 @@
+// persistent mode of mpscpp.x, the program stays alive and runs
+// the tasks in tasks.in each time it is requested through stdin
+//   run  -> execute the tasks, answer "done"
+//   quit -> stop the program
+
+#include <unistd.h>
+
+
+static auto server_reply=[](int channel, std::string message) {
+  message += "\n" ;
+  write(channel,message.c_str(),message.size()) ; // send answer
+}
+;
+
+
+static auto serve=[](auto run_tasks) {
+  int channel = dup(1) ; // keep the original stdout for the answers
+  server_reply(channel,"ready") ; // tell that the program is alive
+  std::string line ;
+  while (std::getline(cin,line)) { // wait for requests
+    if (line=="quit") break ;
+    if (line=="run") {
+      freopen("status.txt","w",stdout) ; // log of this request
+      run_tasks() ; // perform the calculation
+      fflush(stdout) ;
+      cout.flush() ;
+      server_reply(channel,"done") ; // tell that it finished
+    }
+  }
+  close(channel) ;
+}
+;
@@ -58,8 +58,7 @@ static auto quench=[]() {
   if (get_bool("tevol_custom_exp")) 
     expH = evoloperator(MPO(ampo),dt) ; // create Hamiltonian
   else expH = toExpH<ITensor>(ampo,dt*Cplx_i); 
-  ofstream fileevol; // file for the evolution
-  fileevol.open("TIME_EVOLUTION.OUT"); // time evolution
+  std::vector<Cplx> zs; // time evolution
   auto psi1 = exactApplyMPO(psi,A1,args) ;
   auto psi2 = exactApplyMPO(psi,A2,args) ;
 //  normalize(psi1); // normalize
@@ -73,11 +72,9 @@ static auto quench=[]() {
 	      psi1 *= norm0 ; // restore initial norm
 	      auto z = overlapC(psi2,psi1) ; // overlap
 //	      auto z = overlapC(psi,psi1) ; // overlap
-	      // write in a file
-	      fileevol << std::setprecision(20) << real(z) << "  "
-                       << std::setprecision(20)<< imag(z) << endl;
+	      zs.push_back(z); // store
   } ;
-  fileevol.close(); // close file
+  write_results("TIME_EVOLUTION.OUT",zs); // write the evolution
   writeToFile("psi_time_evolution.mps",psi1);
 };
 
@@ -99,8 +96,7 @@ static auto evolution_AeiHtB=[]() {
   if (get_bool("tevol_custom_exp")) 
     expH = evoloperator(MPO(ampo),dt) ; // create Hamiltonian
   else expH = toExpH<ITensor>(ampo,dt*Cplx_i); 
-  ofstream fileevol; // file for the evolution
-  fileevol.open("TIME_EVOLUTION.OUT"); // time evolution
+  std::vector<Cplx> zs; // time evolution
   auto psi1 = read_wf(get_str("wfa_time_evolution.mps")) ;
   auto psi2 = read_wf(get_str("wfb_time_evolution.mps")) ;
   auto fittd = get_bool("tevol_fit_td") ; // use fitting method
@@ -109,11 +105,9 @@ static auto evolution_AeiHtB=[]() {
 	      if (not fittd) psi1 = exactApplyMPO(expH,psi1,args); // evolve
 	      auto z = overlapC(psi2,psi1) ; // overlap
 //	      auto z = overlapC(psi,psi1) ; // overlap
-	      // write in a file
-	      fileevol << std::setprecision(20) << real(z) << "  "
-                       << std::setprecision(20)<< imag(z) << endl;
+	      zs.push_back(z); // store
   } ;
-  fileevol.close(); // close file
+  write_results("TIME_EVOLUTION.OUT",zs); // write the evolution
   writeToFile("psi_time_evolution.mps",psi1);
 };
 
@@ -124,7 +118,8 @@ static auto evolution_measure=[]() {
   // now get the operators
   auto A = get_mpo_operator("time_evolution_multioperator.in");
   auto H = get_hamiltonian(sites) ; // get the ampo for the Hamiltonian
-  auto psi = read_wf("psi_evolve_and_measure.mps") ; 
+  auto psi = read_wf(get_str_default("evolve_and_measure_wf",
+			  "psi_evolve_and_measure.mps")) ; 
   int maxm = get_int_value("maxm") ; // bond dimension
   auto cutoff = get_float_value("cutoff") ; // cutoff
   // apply the first operator
@@ -140,18 +135,15 @@ static auto evolution_measure=[]() {
   if (get_bool("tevol_custom_exp")) 
     expH = evoloperator(MPO(ampo),dt) ; // create Hamiltonian
   else expH = toExpH<ITensor>(ampo,dt*Cplx_i); 
-  ofstream fileevol; // file for the evolution
-  fileevol.open("TIME_EVOLUTION.OUT"); // time evolution
+  std::vector<Cplx> zs; // time evolution
   auto fittd = get_bool("tevol_fit_td") ; // use fitting method
   for (it=0;it<nt;it++) { // loop
 	      if (fittd) fitApplyMPO(psi,expH,psi,args) ; // evolve
 	      if (not fittd) psi = exactApplyMPO(expH,psi,args); // evolve
               auto z = overlapC(psi,A,psi) ;
-	      // write in a file
-	      fileevol << std::setprecision(20) << real(z) << "  "
-                       << std::setprecision(20)<< imag(z) << endl;
+	      zs.push_back(z); // store
   } ;
-  fileevol.close(); // close file
+  write_results("TIME_EVOLUTION.OUT",zs); // write the evolution
   writeToFile("psi_evolve_and_measure.mps",psi);
 };
 
@@ -179,7 +171,8 @@ static auto exponential_eMwf=[]() {
   if (get_bool("tevol_custom_exp")) 
     expH = custom_exp(MPO(ampo),taui) ; // custom exponential
   else expH = toExpH<ITensor>(ampo,taui); // exponential
-  auto psi1 = read_wf("input_wavefunction.mps") ;
+  auto psi1 = read_wf(get_str_default("input_wavefunction",
+			  "input_wavefunction.mps")) ;
   for (int it=1;it<=nt;it++) { // loop
 	      psi1 = exactApplyMPO(expH,psi1,args); // evolve
   };
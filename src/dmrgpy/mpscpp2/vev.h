@@ -5,7 +5,8 @@ static auto vev=[]() {
   psi /= sqrt(overlap(psi,psi)); // normalize
   // now read the operator from tasks.in, this routine assumes
   // that there will be a multioperator
-  auto A = get_mpo_operator("vev_multioperator.in"); // get the operator
+  auto A = get_mpo_operator(get_str_default("vev_multioperator",
+			  "vev_multioperator.in")); // get the operator
   auto npow = get_int_value("pow_vev") ; // power of the VEV
   auto c = 0.0i +1i*0.0 ;
   if (npow==1) {c = overlapC(psi,A,psi); } // first power
@@ -19,10 +20,7 @@ static auto vev=[]() {
 	  };
 	  c = overlapC(psi,A,psi1) ; // compute the overlap
 	  };
-  ofstream ofile; // declare
-  ofile.open("VEV.OUT");  // open file
-  ofile << std::setprecision(20) << real(c) << "  " << imag(c) << endl ;
-  ofile.close() ; // close file
+  write_results(get_str_default("vev_output","VEV.OUT"),{c}); // write
   return 0; // dummy return
 } ;
 
@@ -30,6 +28,83 @@ static auto vev=[]() {
 
 
 
+// expectation value of a product of local operators, with the
+// orthogonality center of psi in its first site (see vev_many)
+static auto local_product_vev=[](MPS &psi, std::map<int,ITensor> const& ops) {
+  auto i0 = ops.begin()->first , i1 = ops.rbegin()->first ; // first and last
+  psi.position(i0) ; // sites on the left and right are the identity
+  if (i0==i1) { // single site
+    auto ket = psi.A(i0) ;
+    return (dag(prime(ket,Site))*ops.at(i0)*ket).cplx() ;
+  } ;
+  auto ir = commonIndex(psi.A(i0),psi.A(i0+1),Link) ; // link to the right
+  auto C = psi.A(i0)*ops.at(i0)*dag(prime(prime(psi.A(i0),Site),ir)) ;
+  for (int k=i0+1;k<i1;k++) { // sites in between
+    C *= psi.A(k) ;
+    if (ops.count(k)>0) C *= ops.at(k)*dag(prime(prime(psi.A(k),Site),Link)) ;
+    else C *= dag(prime(psi.A(k),Link)) ;
+  } ;
+  auto jl = commonIndex(psi.A(i1),psi.A(i1-1),Link) ; // link to the left
+  C *= psi.A(i1)*ops.at(i1) ;
+  C *= dag(prime(prime(psi.A(i1),Site),jl)) ;
+  return C.cplx() ;
+}
+;
+
+
+
+// expectation values of several operators with the same wavefunction.
+// Operators whose terms are products of local (non fermionic) operators
+// are contracted directly with the MPS, sweeping the orthogonality
+// center from left to right, the rest are converted to MPO
+static auto vev_many=[]() {
+  auto sites = get_sites(); // read sites
+  auto psi = read_wf(get_str("vev_many_wf")) ; // read the wavefunction
+  psi /= sqrt(overlap(psi,psi)); // normalize
+  auto n = get_int_value("vev_many_n") ; // number of operators
+  auto prefix = get_str_default("vev_many_prefix","vev_many_") ; // files
+  std::vector<Cplx> cs(n,0.0) ; // expectation values
+  // local terms as (first site, operator, coefficient, local operators)
+  std::vector<std::tuple<int,int,Cplx,std::map<int,ITensor>>> terms ;
+  for (int i=0;i<n;i++) {
+    auto filename = prefix+std::to_string(i)+".in" ; // file of the operator
+    auto local = is_binary_operator(filename) ; // check if it is local
+    OperatorTerms op ;
+    if (local) {
+      op = read_binary_terms(filename) ;
+      for (auto &name : op.names) if ((name!="") and (name[0]=='C')) local = false ;
+    } ;
+    if (not local) { // use the MPO
+      cs[i] = overlapC(psi,get_mpo_operator(filename),psi) ; 
+      continue ; 
+    } ;
+    long long k = 0 ; // current factor
+    for (long long j=0;j<(long long)op.lens.size();j++) { // loop over terms
+      std::map<int,ITensor> ops ; // product in each site
+      for (long long l=0;l<op.lens[j];l++,k++) {
+        auto s = op.sites[k] ;
+        ITensor o = sites.op(op.names[op.codes[k]],s) ; // local operator
+        if (ops.count(s)>0) ops[s] = multSiteOps(ops[s],o) ; // same site
+        else ops[s] = o ;
+      } ;
+      if (ops.size()==0) cs[i] += Cplx(op.cs[j]) ; // identity
+      else terms.push_back(std::make_tuple(ops.begin()->first,i,
+			      Cplx(op.cs[j]),ops)) ;
+    } ;
+  } ;
+  // sort by the first site, so the orthogonality center moves forward
+  std::stable_sort(terms.begin(),terms.end(),[](auto &a, auto &b) {
+		  return std::get<0>(a) < std::get<0>(b) ; }) ;
+  for (auto &t : terms) 
+    cs[std::get<1>(t)] += std::get<2>(t)*local_product_vev(psi,std::get<3>(t)) ;
+  write_results(get_str_default("vev_many_output","VEV_MANY.OUT"),cs); 
+  return 0; // dummy return
+}
+;
+
+
+
+
 static auto excited_vev=[]() {
   auto A = get_mpo_operator("vev_multioperator.in"); // get the operator
   auto sites = get_sites(); // Get the different sites
@@ -37,13 +112,10 @@ static auto excited_vev=[]() {
   auto sweeps = get_sweeps(); // get sweeps
   auto nexcited = get_int_value("nexcited") ; // get excited states
   auto wfs = get_excited(); // get excited states
-  ofstream filevev;
-  filevev.open("VEV.OUT"); // open file
+  std::vector<Cplx> cs; // expectation values
   for(int i=0;i<nexcited;i++) {
               auto c = overlapC(wfs.at(i),A,wfs.at(i)); // compute overlap
-	      filevev << std::setprecision(16) << real(c) << "  ";
-	      filevev << std::setprecision(16) << imag(c) << "  ";
-	      filevev << endl;
+	      cs.push_back(c); // store
   };
-  filevev.close(); // close file
+  write_results("VEV.OUT",cs); // write
 };
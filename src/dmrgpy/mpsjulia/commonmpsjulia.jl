@@ -4,6 +4,8 @@ module commonmpsjulia
 using ITensors
 using Serialization
 export get_gs,get_bool,get_vev,dynamical_correlator_kpm,applyoperator,general_kpm,overlap,exponential,summps,get_sites
+export get_many_vev,run_tasks,run_in_folder,get_result
+include("resident.jl")
 include("read_operator.jl")
 include("read_wf.jl")
 include("get_input.jl")
@@ -13,4 +15,5 @@ include("write_in_file.jl")
 include("get_vev.jl")
 include("kpm.jl")
 include("mpsalgebra.jl")
+include("run_tasks.jl")
 end
@@ -8,7 +8,7 @@ function get_gs(sites)
   ampo = read_operator("hamiltonian.in")
   H = MPO(ampo,sites)
   if get_bool("gs_from_file")
-	  psi0 = load_mps("psi_GS.mps")
+	  psi0 = load_mps(get_input_string("starting_file_gs","psi_GS.mps"))
 	  if get_bool("skip_dmrg_gs") 
 		  return psi0
 	  end
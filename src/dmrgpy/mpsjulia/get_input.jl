@@ -1,15 +1,21 @@
-function get_input_string(name::String,default::String="")
-  out = ""
-  open("tasks.in") do file
-      for ln in eachline(file)
-	  l = replace(ln," "=>"")
-	  l = split(l,"=")
-	  if name==l[1]
-		  out = l[2]
-          end
+const input = Dict{String,String}() # content of tasks.in
+
+
+function read_input()
+  """Read all the entries of tasks.in"""
+  empty!(input)
+  for ln in eachline("tasks.in")
+      l = replace(ln," "=>"")
+      l = split(l,"=")
+      if length(l)>1
+	      input[string(l[1])] = string(l[2])
       end
   end
-  out = string(out)
+end
+
+
+function get_input_string(name::String,default::String="")
+  out = get(input,name,"")
   if out==""
 	  return default
   end
@@ -21,7 +21,7 @@ function get_vev()
                 out = inner(wf,wf)
             end
     end
-    write_in_file("VEV.OUT",convert(Complex,out))
+    write_results("VEV.OUT",[out])
 #    print(out)
 end
 
@@ -30,14 +30,15 @@ function get_many_vev()
     sites = get_sites() # get the sites
     wf = get_gs(sites) # get the ground state wavefunction
     nvev = get_int("num_vev") # number of vev
-    write_in_file("VEV.OUT","","w")
+    outs = [] # expectation values
     for i=1:nvev
 	name = string("vev_multioperator_",i,"_.in") # name of the file
         Am = read_operator(name) # read operator
         A = MPO(Am,sites) # get the operator
         out = inner(wf,A,wf)
-        write_in_file("VEV.OUT",out,"a")
+        push!(outs,out) # store
     end
+    write_results("VEV.OUT",outs)
 #    print(out)
 end
 
@@ -56,15 +56,14 @@ function get_moments(A,B,H,wf,n)
 	am = 1.0*vi # define
 	bk = inner(vj,vi) # scalar product
 	bk1 = inner(vj,a) # scalar product
-	write_in_file("KPM_MOMENTS.OUT",bk,"w")
-	write_in_file("KPM_MOMENTS.OUT",bk1,"a")
+	mus = [bk,bk1] # moments
 	for i=1:n # loop over polynomials
 	  @time bk,am,a = kpm_iterate(am,a,H,vj,maxdim) # perform one iteration
-	  write_in_file("KPM_MOMENTS.OUT",bk,"a")
+	  push!(mus,bk) # store
 #	  truncate!(a,maxdim=maxdim) 
 #	  truncate!(am,maxdim=maxdim) 
-#	  write_in_file("KPM_MOMENTS.OUT",bk,"a")
         end
+	write_results("KPM_MOMENTS.OUT",mus)
 end
 
 function kpm_iterate(am,a,H,vj,maxdim)
@@ -82,20 +81,20 @@ function general_kpm()
         """Compute the moments using the KPM recursion"""
         sites = get_sites()
         maxdim = get_int("maxm")
-	vi = load_mps("wfa.mps")
-	vj = load_mps("wfb.mps")
+	vi = load_mps(get_input_string("kpm_wfa","wfa.mps"))
+	vj = load_mps(get_input_string("kpm_wfb","wfb.mps"))
 	H = MPO(read_operator("kpm_operator.in"),sites)
         a = contract(H,vi;maxdim=maxdim) # first vector
         am = 1.0*vi # define
         bk = inner(vj,vi) # scalar product
         bk1 = inner(vj,a) # scalar product
-        write_in_file("KPM_MOMENTS.OUT",convert(Complex,bk),"w")
-        write_in_file("KPM_MOMENTS.OUT",convert(Complex,bk1),"a")
+        mus = [bk,bk1] # moments
 	n = get_int("kpm_num_polynomials")
         for i=1:n # loop over polynomials
           @time bk,am,a = kpm_iterate(am,a,H,vj,maxdim) # perform one iteration
-	  write_in_file("KPM_MOMENTS.OUT",convert(Complex,bk),"a")
+	  push!(mus,bk) # store
         end
+        write_results("KPM_MOMENTS.OUT",mus)
 end
 
 
@@ -14,8 +14,8 @@ end
 
 function summps()
 	sites = get_sites()
-	psi1 = load_mps("summps_wf1.mps")
-	psi2 = load_mps("summps_wf2.mps")
+	psi1 = load_mps(get_input_string("summps_wf1","summps_wf1.mps"))
+	psi2 = load_mps(get_input_string("summps_wf2","summps_wf2.mps"))
 	maxdim = get_int("maxm")
 	psi3 = add(psi1,psi2,maxdim=maxdim)
 	save_mps("summps_wf3.mps",psi3)
@@ -29,7 +29,8 @@ function exponential()
 	maxdim = get_int("maxm")
 	cutoff = get_float("cutoff")
 	H = read_mpo("hamiltonian.in")  # input wavefunction
-	psi1 = load_mps("input_wavefunction.mps") # Operator to exponentiate
+	psi1 = load_mps(get_input_string("input_wavefunction",
+				   "input_wavefunction.mps")) # input WF
 	nt0 = get_int("tevol_n") # number of steps
 	tau = dtr + im*dti # evolution time
 	taui = tau/nt0 # small time step
@@ -49,10 +50,10 @@ end
 
 
 function overlap()
-	wf1 = load_mps("overlap_wf1.mps")
-	wf2 = load_mps("overlap_wf2.mps")
+	wf1 = load_mps(get_input_string("overlap_wf1","overlap_wf1.mps"))
+	wf2 = load_mps(get_input_string("overlap_wf2","overlap_wf2.mps"))
 	c = inner(wf1,wf2)
-	write_in_file("OVERLAP.OUT",convert(Complex,c),"w")
+	write_results("OVERLAP.OUT",[c])
 end
 
 
@@ -1,6 +1,40 @@
 using ITensors
 
+const binary_magic = "DMRGPYMO" # first bytes of binary operator files
+
+# read an operator in the binary format written by multioperator.write
+function read_operator_binary(name::String)
+	f = open(name,"r")
+	skip(f,length(binary_magic)) # magic bytes
+	head = Vector{Int64}(undef,4) # terms, factors, names, size of names
+	read!(f,head)
+	ns = split(String(read(f,head[4])),"\n") # names of the operators
+	lens = Vector{Int64}(undef,head[1]) # factors of each term
+	cs = Vector{ComplexF64}(undef,head[1]) # coefficients
+	codes = Vector{Int64}(undef,head[2]) # codes of the factors
+	sites = Vector{Int64}(undef,head[2]) # sites of the factors
+	read!(f,lens) ; read!(f,cs) ; read!(f,codes) ; read!(f,sites)
+	close(f)
+	ampo = AutoMPO() # create AMPO
+	k = 0 # current factor
+	for i=1:head[1] # loop over terms
+		out = Any[cs[i]] # coupling
+		for j=1:lens[i] # loop over terms in the product
+			k += 1
+			push!(out,String(ns[codes[k]+1])) # name of the operator
+			push!(out,sites[k]) # site
+		end
+		ampo += tuple(out...) # Add to the MPO
+	end
+	return ampo # return MPO
+end
+
+
 function read_operator(name::String)
+	f = open(name,"r")
+	magic = String(read(f,length(binary_magic))) # first bytes
+	close(f)
+	if magic==binary_magic return read_operator_binary(name) end
 	ls = readlines(name) # lines in the file
 	nterms = parse(Int,ls[1]) # number of terms in the operator
 	ampo = AutoMPO() # create AMPO
@@ -1,11 +1,17 @@
 
-
 function save_mps(filename,psi)
 	serialize(filename,psi)
 end
 
 
 function load_mps(filename)
-  return deserialize(filename)
+  if !resident[] return deserialize(filename) end
+  # the wavefunctions stay in memory, the files of the
+  # MPS handles are never modified by the backend
+  key = file_stamp(filename)
+  if haskey(stored_mps,key) return stored_mps[key] end
+  if length(stored_mps)>=8 empty!(stored_mps) end
+  psi = deserialize(filename)
+  stored_mps[key] = psi # store
+  return psi
 end
-
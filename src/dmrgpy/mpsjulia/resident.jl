@@ -0,0 +1,31 @@
+# objects kept in the Julia session between calls, when the module
+# is loaded once from Python (see juliarun.py)
+
+const resident = Ref(false) # true if running inside a Python session
+const stored_mps = Dict{String,Any}() # wavefunctions already read
+const stored_results = Dict{String,Vector{ComplexF64}}() # results
+
+
+function file_stamp(name::String)
+  """Full name, size and modification time of a file"""
+  return string(abspath(name),"_",filesize(name),"_",mtime(name))
+end
+
+
+function get_result(name::String)
+  """Return the result written in a certain file, or nothing"""
+  return get(stored_results,name,nothing)
+end
+
+
+function run_in_folder(path::String)
+  """Perform the tasks of a certain folder"""
+  resident[] = true # keep objects in memory
+  folder = string(realpath(path),"/") # results of this folder
+  for name in collect(keys(stored_results)) # remove the previous ones
+    if startswith(name,folder) delete!(stored_results,name) end
+  end
+  cd(path) do
+    run_tasks()
+  end
+end
@@ -35,3 +35,28 @@ function write_in_file(name::String,a::Array,mode="w")
 end
 
 
+
+function write_results(name::String,a::Array)
+  """Write complex numbers, as a binary .npy file or as text"""
+  a = convert(Array{ComplexF64},vec(a)) # complex numbers
+  if resident[] && get_bool("binary_results") # return it, without files
+    stored_results[abspath(name)] = a
+    return
+  end
+  if !get_bool("binary_results") # text format
+    write_in_file(name,"","w") # empty file
+    for x in a; write_in_file(name,x,"a"); end
+    return
+  end
+  header = string("{'descr': '<c16', 'fortran_order': False, ",
+                  "'shape': (",length(a),",), }")
+  header = string(header," "^mod(-(length(header)+11),64),"\n") # align
+  open(name,"w") do io
+	  write(io,UInt8[0x93]) # magic string
+	  write(io,"NUMPY") # magic string
+	  write(io,UInt8[1,0]) # version
+	  write(io,htol(UInt16(length(header)))) # size of the header
+	  write(io,header) # header
+	  write(io,htol.(a)) # data
+  end
+end
@@ -1,4 +1,5 @@
 import numbers
+import os
 import types
 import collections
 import numpy as np
@@ -14,49 +15,214 @@ def isnumber(x):
 
 ampo_counter = 0
 use_jordan_wigner = True
+lazy_terms = 10000 # larger products are kept as trees (multioperatortk/lazy)
+written = dict() # files already written, and the content written in them
+names = [] # names of the operators, the position is their code
+codes = dict() # code of each name of an operator
+
+
+def name2code(name):
+    """Integer code of the name of an operator"""
+    c = codes.get(name,None)
+    if c is None: # new name
+        c = len(names)
+        codes[name] = c
+        names.append(name)
+    return c
+
+
+def get_codes(ns):
+    """Codes of a list of names of operators"""
+    return np.array([name2code(n) for n in ns],dtype=np.int64)
+
+
+def get_offsets(l):
+    """Offsets of the terms, given the number of factors in each one"""
+    out = np.zeros(len(l)+1,dtype=np.int64)
+    np.cumsum(l,out=out[1:])
+    return out
+
+
+def get_ranges(starts,l):
+    """Concatenation of the ranges starts[i],...,starts[i]+l[i]-1"""
+    n = np.sum(l) # total number of indexes
+    shift = np.repeat(starts - get_offsets(l)[:-1],l) # start of each range
+    return shift + np.arange(n,dtype=np.int64)
 
 
 class MultiOperator():
     """
     Object to deal with multioperators in mpscpp.x
+
+    The terms are stored in arrays, with the coefficient of each term,
+    the number of factors in each term, and the code of the name (see
+    name2code) and the site of each factor. The arrays are never
+    modified, so sums share them, and are concatenated when needed.
     """
+    __slots__ = ["name","chunks","nchunks","last","tidy","arrays",
+            "stamp","jw","herm","tree","fp"]
     def __init__(self,name=None,c=1.0,term=True): # do nothing
         global ampo_counter
-        self.op = [] # empty list of sums of products
         if name is None:
             self.name = "ampo_operator_"+str(ampo_counter)
             ampo_counter += 1
         else: self.name = name
-        self.i = -1 # initialize
+        self.chunks = [] # list with the arrays of the terms
+        self.nchunks = 0 # elements of the list used by this object
+        self.last = None # term being built, [coefficient,codes,sites]
+        self.tidy = False # remove terms with zero weight
+        self.tree = None # expression of a lazy operator
+        self.modified() # no content computed yet
         if term: self.new_term(c=c) # generate the first term
+    def modified(self):
+        """Forget everything computed from the terms, that changed"""
+        self.stamp = object() # identifies the current content
+        self.arrays = None # concatenated arrays
+        self.jw = None # Jordan-Wigner expansion
+        self.herm = None # symbolic check of Hermiticity
+        self.fp = None # fingerprint
+    def flush(self):
+        """Store the term being built"""
+        if self.last is None: return
+        (c,cs,ss) = self.last
+        self.last = None
+        self.append([(np.array([c],dtype=np.complex128),
+            np.array([len(cs)],dtype=np.int64),
+            np.array(cs,dtype=np.int64),np.array(ss,dtype=np.int64))])
+    def append(self,chunks):
+        """Add arrays of terms, at the end of the list if possible"""
+        if len(self.chunks)!=self.nchunks: # somebody else extended it
+            self.chunks = self.chunks[0:self.nchunks] # own copy
+        self.chunks.extend(chunks)
+        self.nchunks = len(self.chunks)
+    def get_chunks(self):
+        """List with the arrays of the terms"""
+        if self.tree is not None and self.nchunks==0: self.expand()
+        self.flush()
+        return self.chunks[0:self.nchunks]
+    def get_arrays(self):
+        """Return the coefficients, the offsets of the terms, and the
+        codes of the names and sites of the factors"""
+        if self.arrays is None:
+            cs = self.get_chunks()
+            if len(cs)==0: # no terms
+                ch = (np.zeros(0,dtype=np.complex128),
+                        np.zeros(0,dtype=np.int64),
+                        np.zeros(0,dtype=np.int64),
+                        np.zeros(0,dtype=np.int64))
+            elif len(cs)==1: ch = cs[0] # nothing to do
+            else: ch = tuple([np.concatenate([x[i] for x in cs])
+                for i in range(4)])
+            if self.tidy: # remove terms with zero weight
+                keep = np.abs(ch[0])>1e-8 # terms to keep
+                if not np.all(keep):
+                    fkeep = np.repeat(keep,ch[1]) # factors to keep
+                    ch = (ch[0][keep],ch[1][keep],ch[2][fkeep],ch[3][fkeep])
+                self.tidy = False
+            self.chunks,self.nchunks = [ch],1 # compact
+            self.arrays = (ch[0],get_offsets(ch[1]),ch[2],ch[3])
+        return self.arrays
+    @property
+    def op(self):
+        """Terms as a list [[c,[name,site],...],...] (read only)"""
+        (c,off,co,ss) = self.get_arrays()
+        ns = [names[k] for k in co.tolist()] # names of the factors
+        ss = ss.tolist() # sites of the factors
+        off = off.tolist() # offsets
+        out = []
+        for (k,ck) in enumerate(c.tolist()): # loop over terms
+            out.append([ck]+[[ns[j],ss[j]] for j in range(off[k],off[k+1])])
+        return out
+    def __getstate__(self):
+        """State for pickle, with the names instead of their codes"""
+        (c,off,co,ss) = self.get_arrays()
+        return {"name":self.name,"c":c,"off":off,"sites":ss,
+                "names":[names[k] for k in co.tolist()]}
+    def __setstate__(self,state):
+        """Restore a pickled object"""
+        co = np.array([name2code(n) for n in state["names"]],dtype=np.int64)
+        off = state["off"]
+        self.name = state["name"]
+        self.chunks = [(state["c"],off[1:]-off[:-1],co,state["sites"])]
+        self.nchunks = 1
+        self.last = None
+        self.tidy = False
+        self.tree = None
+        self.modified()
+    def expand(self):
+        """Compute the terms of a lazy operator"""
+        from .multioperatortk import lazy
+        out = lazy.expand(self.tree) # operator with all the terms
+        (c,off,co,ss) = out.get_arrays()
+        self.chunks,self.nchunks = [(c,off[1:]-off[:-1],co,ss)],1
+    def drop_tree(self):
+        """Expand a lazy operator, before modifying its terms"""
+        if self.tree is not None:
+            self.get_chunks()
+            self.tree = None
     def add_operator(self,name,i):
         """Store operator"""
-        self.op[self.i].append([name,i]) # append that name
+        self.drop_tree()
+        if self.last is None: # continue the last stored term
+            (c,off,co,ss) = self.get_arrays()
+            if len(c)==0: raise # no term
+            j = off[-2] # first factor of the last term
+            self.chunks = [(c[:-1],off[1:-1]-off[:-2],co[:j],ss[:j])]
+            self.nchunks = 1
+            self.last = [c[-1],co[j:].tolist(),ss[j:].tolist()]
+        self.last[1].append(name2code(name)) # append that name
+        self.last[2].append(i) # and site
+        self.modified()
     def new_term(self,c=1.0):
         """Add a new term"""
-        self.i += 1 # increase the counter
-        self.op.append([c]) # initialize
+        self.drop_tree()
+        self.flush() # store the previous one
+        self.last = [c,[],[]] # initialize
+        self.modified()
     def simplify(self):
-        from .multioperatortk import sympymultioperator
-        return sympymultioperator.simplifyMO(self)
+        """Canonical form, with the equal products merged"""
+        from .multioperatortk import canonical
+        return canonical.canonicalize(self)
+    def normal_order(self):
+        """Normal ordered form of the fermionic products, with the equal
+        products merged and the vanishing ones removed"""
+        from .multioperatortk import normalorder
+        return normalorder.normal_order(self)
     def max_op_prod(self):
         """Maximum number of oprators in a product"""
     def get_bandwidth(self,MBO):
         """Get the bandwidth"""
         return MBO.bandwidth(self)
+    def hermitian_part(self):
+        """Return (A + A^dagger)/2, with the equal products merged"""
+        from .multioperatortk import canonical
+        out = canonical.merge(0.5*(self + self.get_dagger()))
+        out.herm = True # Hermitian by construction
+        return out
     def is_hermitian(self):
-        """Check if an operator is hermitian"""
-        dh = self - self.get_dagger() ; dh = dh.simplify()
-        return dh==0
+        """Check if an operator is hermitian, using its canonical form.
+        The result is stored, until the operator is modified"""
+        if self.herm is None: 
+            self.herm = (self - self.get_dagger()).is_zero()
+        return self.herm
     def is_antihermitian(self):
         """Check if an operator is antiHermitian"""
-        dh = self + self.get_dagger() ; dh = dh.simplify()
-        return dh==0
+        return (self + self.get_dagger()).is_zero()
     def is_zero(self):
-        return self.simplify()==0
+        """Check if the canonical form has no terms"""
+        return len(self.simplify().get_arrays()[0])==0
     def copy(self):
-        from copy import deepcopy
-        return deepcopy(self) # return a copy
+        """Return a copy, sharing the arrays"""
+        self.flush()
+        out = MultiOperator.__new__(MultiOperator)
+        out.name = self.name
+        out.chunks,out.nchunks = self.chunks,self.nchunks
+        out.last,out.tidy,out.arrays = None,self.tidy,self.arrays
+        out.stamp,out.jw = self.stamp,self.jw # same content
+        out.herm,out.tree,out.fp = self.herm,self.tree,self.fp
+        return out # return a copy
+    def __copy__(self): return self.copy()
+    def __deepcopy__(self,memo): return self.copy() # arrays are not modified
     def get_dagger(self):
         return get_dagger(self)
     def __neg__(self):
@@ -69,10 +235,17 @@ class MultiOperator():
         """Sum operation"""
         if a is None: return self.copy() # return the Hamiltonian
         elif type(a)==MultiOperator: # if it is a multioperator
+          if self.tree is not None or a.tree is not None: # lazy sum
+              from .multioperatortk import lazy
+              return lazy.add(self,a)
+          chunks = a.get_chunks() # terms of the second one
           out = self.copy() # create a copy
-          out.op = self.op + a.op # sum the two operators
-          out.i = self.i + a.i + 1 # increase the index
-          out.clean()
+          out.append(chunks) # sum the two operators
+          out.tidy = True # remove the terms with zero weight
+          out.modified()
+          if self.fp is not None: # update the fingerprint
+              from .multioperatortk import fingerprint
+              out.fp = (self.fp + a.get_fingerprint()) % fingerprint.p
           return out # return the sum
         elif isnumber(a): # if it is a number
             return self+a*identity() # return identity
@@ -89,41 +262,53 @@ class MultiOperator():
         else: raise
     def multiply_scalar(self,a):
         if not isnumber(a): raise # number
-        out = self.copy()
-        for i in range(len(out.op)):
-            out.op[i][0] = out.op[i][0]*a # multiply
-        return out
+        if self.tree is not None: # lazy operator
+            from .multioperatortk import lazy
+            return lazy.scale(a,self)
+        (c,off,co,ss) = self.get_arrays()
+        return from_arrays(c*a,off,co,ss,name=self.name,tidy=False)
     def __mul__(self,a):
         """Compute the product between two multioperators"""
         if type(a)==MultiOperator: return self.multiply_MO(a)
         elif type(a)==np.ndarray: raise  # prevent using rmul in array
         elif isnumber(a): return self.multiply_scalar(a)
         else: return NotImplemented
+    def __pow__(self,n):
+        """Power with a non-negative integer, lazy if it is large"""
+        from .multioperatortk import lazy
+        return lazy.power(self,n)
     def multiply_MO(self,a):
-        out = self.copy() # copy operator
-        out.i = (self.i+1)*(a.i+1) # total number of terms
-        out.op = [] # empty list
-        for io in self.op: # loop over first operator
-          for jo in a.op: # loop over second operator
-              o = [io[0]*jo[0]] # compute coefficient
-              o = o + [io[i] for i in range(1,len(io))] # add
-              o = o + [jo[i] for i in range(1,len(jo))] # add
-              out.op.append(o) # store contribution
-        out.clean()
-        return out # return operator
+        """Product of two multioperators, lazy if it is large"""
+        from .multioperatortk import lazy
+        return lazy.product(self,a)
     def clean(self):
         """Remove terms with zero weight"""
-        op = []
-        for o in self.op:
-            if abs(o[0])>1e-8: op.append(o) # store
-        self.i = self.i - (len(self.op)-len(op)) # redefine
-        self.op = op # redefine
+        self.tidy = True
+        self.arrays = None
+        self.get_arrays() # remove them
+        self.modified()
+    def get_jordan_wigner(self):
+        """Jordan-Wigner expansion, computed once for each content"""
+        if self.jw is None: self.jw = jordan_wigner(self)
+        return self.jw
     def write(self,name=None):
-        """Write in a file"""
+        """Write in a file, unless it already contains this operator"""
         if name is None: name = self.name+".in"
-        if use_jordan_wigner: m = jordan_wigner(self)
+        key = (self.stamp,use_jordan_wigner) # content of the file
+        if written.get(name)==key and os.path.isfile(name): return
+        if use_jordan_wigner: m = self.get_jordan_wigner()
         else: m = self
         write(m,name)
+        written[name] = key # store
+    def get_fingerprint(self):
+        """128-bit integer identifying the terms, independent of their
+        order (see multioperatortk/fingerprint.py)"""
+        if self.fp is None:
+            from .multioperatortk import fingerprint
+            if self.tree is not None and self.nchunks==0: # not expanded
+                self.fp = fingerprint.tree_fingerprint(self.tree)
+            else: self.fp = fingerprint.fingerprint(*self.get_arrays())
+        return self.fp
     def get_dict(self):
         """Return the dictionary to be used in tasks.in"""
         d = dict()
@@ -144,10 +329,39 @@ class MultiOperator():
         return d
 
 
+def multiply_arrays(A,B):
+    """Product of two multioperators, each term with each term"""
+    (c1,off1,co1,ss1) = A.get_arrays()
+    (c2,off2,co2,ss2) = B.get_arrays()
+    n1,n2 = len(c1),len(c2) # number of terms
+    l1 = np.repeat(off1[1:]-off1[:-1],n2) # factors of the first ones
+    l2 = np.tile(off2[1:]-off2[:-1],n1) # factors of the second ones
+    off = get_offsets(l1+l2) # offsets of the products
+    i1 = get_ranges(np.repeat(off1[:-1],n2),l1) # factors to take
+    i2 = get_ranges(np.tile(off2[:-1],n1),l2) # factors to take
+    j1 = get_ranges(off[:-1],l1) # where to put them
+    j2 = get_ranges(off[:-1]+l1,l2) # where to put them
+    co = np.zeros(off[-1],dtype=np.int64) # codes
+    ss = np.zeros(off[-1],dtype=np.int64) # sites
+    co[j1],co[j2] = co1[i1],co2[i2]
+    ss[j1],ss[j2] = ss1[i1],ss2[i2]
+    c = np.outer(c1,c2).reshape(-1) # coefficients
+    return from_arrays(c,off,co,ss,name=A.name) # return operator
+
+
 def zero():
     return MultiOperator(term=True,c=0.0)
 
 
+def from_arrays(c,off,co,ss,name=None,tidy=True):
+    """Create a multioperator from the arrays of the terms"""
+    out = MultiOperator(name=name,term=False)
+    out.chunks = [(c,off[1:]-off[:-1],co,ss)] # store
+    out.nchunks = 1
+    out.tidy = tidy # remove terms with zero weight
+    return out
+
+
 def identity():
     op = MultiOperator(term=True,c=1.0)
     op.add_operator("Id",1)
@@ -155,38 +369,47 @@ def identity():
 
 def MO2list(self):
     """Conver a multioperator into a list"""
+    (c,off,co,ss) = self.get_arrays()
+    ns = [names[k] for k in co.tolist()] # names of the factors
+    ss = (ss+1).tolist() # sites of the factors, starting in 1
+    off = off.tolist() # offsets
     out = []
-    for iop in self.op: # loop over operators
-        o = []
-        o.append(iop[0].real) # real part
-        o.append(iop[0].imag) # imaginary part
-        for i in range(len(iop)-1): # loop over terms
-          otmp = iop[i+1]
-          o.append(otmp[0])
-          o.append(otmp[1]+1)
+    for (k,ck) in enumerate(c.tolist()): # loop over operators
+        o = [ck.real,ck.imag] # real and imaginary part
+        for j in range(off[k],off[k+1]): # loop over terms
+          o.append(ns[j])
+          o.append(ss[j])
         out.append(o)
     return out
 
 
+binary_magic = b"DMRGPYMO" # first bytes of the binary files of operators
+
+
 def write(MO,name):
-    """Write a multioperator in a file"""
-    write_ampo(MO2list(MO),name) # write in a file
-
-
-def write_ampo(out,name):
-    f = open(name,"w")
-    f.write(str(len(out))+"\n") # number of lines
-    for o in out:
-      n = (len(o)-2)//2 # number of terms
-      if n>=200: raise # C++ code needs to be recompiled
-      f.write(str((len(o)-2)//2)+"\n") # number of terms
-      for io in o:
-          f.write(str(io)+"  ")
-      f.write("\n")
+    """
+    Write a multioperator in a binary file, read by get_ampo_operator.h
+    and read_operator.jl. The file contains the magic bytes, the number
+    of terms, factors and names (int64), the names separated by newlines,
+    and then the arrays with the number of factors of each term (int64),
+    the coefficients (complex128), and the code in the list of names and
+    the site (starting in 1) of each factor (int64)
+    """
+    (c,off,co,ss) = MO.get_arrays()
+    u,inv = np.unique(co,return_inverse=True) # names used in the operator
+    ns = "\n".join([names[k] for k in u.tolist()]).encode() # names
+    head = np.array([len(c),len(co),len(u),len(ns)],dtype="<i8")
+    f = open(name,"wb")
+    f.write(binary_magic) # identify the format
+    f.write(head.tobytes()) # sizes
+    f.write(ns) # names of the operators
+    np.diff(off).astype("<i8").tofile(f) # number of factors of each term
+    c.astype("<c16").tofile(f) # coefficients
+    inv.reshape(-1).astype("<i8").tofile(f) # codes of the factors
+    (ss+1).astype("<i8").tofile(f) # sites of the factors, starting in 1
     f.close()
 
 
-
 def obj2MO(a,name="multioperator"):
     """
     Convert an input in a multioperator
@@ -235,7 +458,11 @@ def MO2vijkl(mo):
 
 def MO2matrix(MO,obj):
     """Given a certain object containing the method "get_operator",
-    return a matrix"""
+    return a matrix. The matrices are stored in the object, for each
+    fingerprint of the multioperator"""
+    if getattr(obj,"MO_matrices",None) is None: obj.MO_matrices = dict()
+    key = MO.get_fingerprint() # content of the operator
+    if key in obj.MO_matrices: return obj.MO_matrices[key]
     out = 0.0
     for iop in MO.op: # loop over components
         otmp = iop[0]*obj.get_identity() # factor
@@ -243,69 +470,49 @@ def MO2matrix(MO,obj):
             term = iop[i+1] # get this term
             otmp = otmp@obj.get_operator(term[0],term[1]) # multiply
         out = out + otmp
+    if len(obj.MO_matrices)>=32: obj.MO_matrices.clear()
+    obj.MO_matrices[key] = out # store
     return out # return matrix
 
 
 def jordan_wigner(MO):
     """Use Jordan Wigner transformationin a multioperator"""
     from .multioperatortk import jordanwigner
-    m = 0 # initialize output
-    for ii in range(len(MO.op)): # loop over operators
-        opi = MO.op[ii] # take this term
-        n = len(opi)-1 # number of terms in the product
-        c = opi[0] # take the complex value
-        mi = list2MO(opi) # default output
-        ls = [opi[kk+1][0] for kk in range(n)] # names of operators
-        try:
-          if (n==1): # one point operator
-              i = opi[1][1]
-              if "C" in ls or "Cdag" in ls:
-                  mi = c*jordanwigner.one_fermion(ls[0],i)
-          elif (n==2): # two point operators
-              i,j = opi[1][1],opi[2][1]
-              if "C" in ls or "Cdag" in ls:
-                  mi = c*jordanwigner.two_fermions(ls[0],i,ls[1],j)
-          elif (n==4): # four point operators
-              i,j,k,l = opi[1][1],opi[2][1],opi[3][1],opi[4][1]
-              if "C" in ls or "Cdag" in ls:
-                  mi = c*jordanwigner.four_fermions(ls[0],i,ls[1],j,ls[2],
-                          k,ls[3],l) 
-          else: 
-              if "C" in ls or "Cdag" in ls: raise # not implemented
-        except: # brute force 
-            inds = [opi[kk+1][1] for kk in range(n)]
-            mi = c*jordanwigner.product2jw(ls,inds)
-        m = m + mi
-    return m
+    return jordanwigner.jordan_wigner(MO)
+
+
+
+dagger_names = {"C":"Cdag","Cdag":"C","A":"Adag","Adag":"A",
+        "Sp":"Sm","Sm":"Sp","S+":"S-","S-":"S+",
+        "Sig":"SigDag","SigDag":"Sig","Tau":"TauDag","TauDag":"Tau"}
+dagger_table = np.zeros(0,dtype=np.int64) # code of the dagger of each code
+
 
+def dagger_codes():
+    """Array with the code of the dagger of each name"""
+    global dagger_table
+    if len(dagger_table)<len(names): # new names
+        dagger_table = get_codes([dagger_names.get(n,n) for n in list(names)])
+    return dagger_table
 
 
 def get_dagger(self,conjugate=True):
-    """Return the dagger of a multioperator"""
-    m = 0 # initialize
-    for opi in self.op: # loop over terms
-        n = len(opi) # number of terms in the product
-        c = opi[0] # coefficient
-        mi = np.conjugate(c) # initialize
-        for i in range(1,n): # loop over terms in the product
-            name = opi[i][0] # name
-            jj = opi[i][1] # index
-            if name=="C": name2="Cdag"
-            elif name=="Cdag": name2="C"
-            elif name=="A": name2="Adag"
-            elif name=="Adag": name2="A"
-            elif name=="Sp": name2="Sm"
-            elif name=="S+": name2="S-"
-            elif name=="Sm": name2="Sp"
-            elif name=="S-": name2="S+"
-            elif name=="Sig": name2="SigDag"
-            elif name=="Tau": name2="TauDag"
-            elif name=="SigDag": name2="Sig"
-            elif name=="TauDag": name2="Tau"
-            else: name2 = name
-            mi = obj2MO([[name2,jj]])*mi
-        m = m + mi # add contribution
-    return m # return MO
+    """Return the dagger of a multioperator, reversing the order of the
+    factors of all the terms at once"""
+    if self.tree is not None: # lazy operator
+        from .multioperatortk import lazy
+        return lazy.dagger(self)
+    (c,off,co,ss) = self.get_arrays()
+    l = off[1:]-off[:-1] # factors of each term
+    e = np.where(l==0)[0] # empty products, they are identities
+    if len(e)>0:
+        co = np.insert(co,off[e],name2code("Id"))
+        ss = np.insert(ss,off[e],1)
+        l[e] = 1
+        off = get_offsets(l)
+    t = np.repeat(np.arange(len(c)),l) # term of each factor
+    rev = off[t] + off[t+1] - 1 - np.arange(len(co)) # reversed factors
+    return from_arrays(np.conjugate(c),off,dagger_codes()[co[rev]],ss[rev])
 
 
 
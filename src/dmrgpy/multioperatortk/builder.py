@@ -0,0 +1,109 @@
+# build multioperators from couplings given as arrays
+#
+# The operators are sums of products of operators taken from lists,
+# as sum_ij t[i,j] A[i]*B[j]. Instead of summing the products one by
+# one, all of them are expanded at once into the arrays of the terms.
+
+import numpy as np
+from .. import multioperator
+
+
+def term_table(ops):
+    """Arrays with the terms of a list of multioperators, and the first
+    term and number of terms of each operator"""
+    ops = [multioperator.obj2MO(o) for o in ops]
+    arrs = [o.get_arrays() for o in ops] # terms of each operator
+    count = np.array([len(a[0]) for a in arrs],dtype=np.int64)
+    start = multioperator.get_offsets(count)[:-1] # first term
+    c = np.concatenate([a[0] for a in arrs]+[np.zeros(0,dtype=np.complex128)])
+    l = np.concatenate([a[1][1:]-a[1][:-1] for a in arrs]
+            +[np.zeros(0,dtype=np.int64)]) # factors of each term
+    co = np.concatenate([a[2] for a in arrs]+[np.zeros(0,dtype=np.int64)])
+    ss = np.concatenate([a[3] for a in arrs]+[np.zeros(0,dtype=np.int64)])
+    return (c,l,co,ss,start,count)
+
+
+def expand_products(c,idx,tables):
+    """
+    Terms of sum_k c[k]*ops_0[idx[k,0]]*ops_1[idx[k,1]]*..., with
+    the lists of operators given by their tables (see term_table)
+    """
+    # pool with the terms of all the tables
+    tl = np.concatenate([t[1] for t in tables]) # factors of each term
+    toff = multioperator.get_offsets(tl) # first factor of each term
+    tco = np.concatenate([t[2] for t in tables]) # codes
+    tss = np.concatenate([t[3] for t in tables]) # sites
+    shift = multioperator.get_offsets([len(t[0]) for t in tables])
+    c = np.array(c,dtype=np.complex128)
+    idx = np.array(idx,dtype=np.int64).reshape((len(c),len(tables)))
+    ts = np.zeros((len(c),0),dtype=np.int64) # term of each operator
+    for (p,t) in enumerate(tables): # expand the terms of each position
+        n = t[5][idx[:,p]] # number of terms of the operators
+        r = np.repeat(np.arange(len(c)),n) # product of each new term
+        tp = multioperator.get_ranges(t[4][idx[:,p]],n) # terms
+        c = c[r]*t[0][tp] # coefficients
+        idx = idx[r]
+        ts = np.concatenate([ts[r],tp[:,None]+shift[p]],axis=1)
+    ts = ts.reshape(-1) # terms in the order of the products
+    l = np.sum(tl[ts].reshape((len(c),len(tables))),axis=1) # factors
+    fs = multioperator.get_ranges(toff[ts],tl[ts]) # factors in order
+    return (c,l.astype(np.int64),tco[fs],tss[fs])
+
+
+class HamiltonianBuilder():
+    """
+    Build a multioperator from couplings given as arrays, summing
+    all the terms in a single pass, to be used as
+    b = HamiltonianBuilder()
+    b.add_bilinear(t,chain.Cdag,chain.C) # sum_ij t[i,j] Cdag[i]*C[j]
+    h = b.get_operator()
+    """
+    def __init__(self,tol=1e-12):
+        self.chunks = [] # arrays of the terms
+        self.tol = tol # couplings smaller than this are skipped
+    def add_products(self,c,idx,*ops):
+        """Add sum_k c[k]*ops[0][idx[k,0]]*ops[1][idx[k,1]]*..."""
+        c = np.array(c,dtype=np.complex128).reshape(-1)
+        idx = np.array(idx,dtype=np.int64).reshape((len(c),len(ops)))
+        keep = np.abs(c)>self.tol # skip zero couplings
+        tables = [term_table(o) for o in ops]
+        self.chunks.append(expand_products(c[keep],idx[keep],tables))
+    def add_tensor(self,t,*ops):
+        """Add sum_ij... t[i,j,...]*ops[0][i]*ops[1][j]*..."""
+        t = np.array(t)
+        idx = np.array(np.nonzero(np.abs(t)>self.tol)).T # nonzero entries
+        self.add_products(t[tuple(idx.T)],idx,*ops)
+    def add_sparse(self,v,*ops):
+        """Add the terms of a sparse tensor, given as a dictionary
+        {(i,j,...):v} or as a tuple (indexes,values)"""
+        if type(v)==dict: idx,c = list(v.keys()),list(v.values())
+        else: idx,c = v
+        self.add_products(c,np.array(idx).reshape((len(c),len(ops))),*ops)
+    def add_fields(self,b,S):
+        """Add sum_i b[i,a]*S[a][i], with b an N x 3 array"""
+        b = np.array(b)
+        S = [s for Sa in S for s in Sa] # flat list, S[a][i] is a*N+i
+        self.add_tensor(b.T.reshape(-1),S)
+    def add_bilinear(self,m,A,B):
+        """Add sum_ij m[i,j]*A[i]*B[j]"""
+        self.add_tensor(m,A,B)
+    def add_exchange(self,J,S):
+        """Add sum_ij,ab J[i,j,a,b]*S[a][i]*S[b][j], with J an
+        N x N x 3 x 3 array and S the list [Sx,Sy,Sz]"""
+        J = np.array(J)
+        n = J.shape[0]
+        S = [s for Sa in S for s in Sa] # flat list, S[a][i] is a*N+i
+        t = J.transpose(2,0,3,1).reshape((3*n,3*n)) # in the flat list
+        self.add_tensor(t,S,S)
+    def add_vijkl(self,v,Cdag,C):
+        """Add sum_ijkl v[i,j,k,l]*Cdag[i]*C[j]*Cdag[k]*C[l], with v
+        a dense array or a sparse tensor (see add_sparse)"""
+        if type(v)==dict or type(v)==tuple: 
+            self.add_sparse(v,Cdag,C,Cdag,C)
+        else: self.add_tensor(v,Cdag,C,Cdag,C)
+    def get_operator(self,name=None):
+        """Return the multioperator with all the terms"""
+        out = multioperator.MultiOperator(name=name,term=False)
+        out.append(list(self.chunks)) # all the terms
+        out.tidy = True # remove terms with zero weight
+        return out
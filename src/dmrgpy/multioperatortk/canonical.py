@@ -0,0 +1,117 @@
+# canonical form of a multioperator, without sympy
+#
+# The factors of each product are sorted by site, keeping the order of
+# the operators in the same site. Operators in different sites commute,
+# except fermionic operators that anticommute. Then the equal products
+# are merged, and the terms with zero weight removed.
+
+import numpy as np
+from .. import multioperator
+
+fermions = ["C","Cdag"] # operators that anticommute in different sites
+nilpotent = ["C","Cdag"] # operators whose square in a site is zero
+
+
+def remove_identities(c,off,co,ss):
+    """Remove the identities in products with other operators, products
+    with only identities become a single identity"""
+    l = off[1:]-off[:-1] # factors of each term
+    nt = len(c) # number of terms
+    tid = np.repeat(np.arange(nt),l) # term of each factor
+    isid = co==multioperator.name2code("Id") # identities
+    nop = np.bincount(tid,weights=~isid,minlength=nt) # other factors
+    first = np.arange(len(co))==off[:-1][tid] # first factor of its term
+    keep = (~isid) | (first & (nop[tid]==0)) # factors to keep
+    l = np.bincount(tid[keep],minlength=nt).astype(np.int64) # new number
+    co,ss = co[keep],ss[keep]
+    empty = l==0 # terms without factors, they are identities
+    if np.any(empty): # add an identity to them
+        ids = multioperator.get_codes(["Id"]*np.sum(empty)) # identities
+        co = np.concatenate([co,ids])
+        ss = np.concatenate([ss,np.ones(np.sum(empty),dtype=np.int64)])
+        c = np.concatenate([c[~empty],c[empty]]) # move them to the end
+        l = np.concatenate([l[~empty],np.ones(np.sum(empty),dtype=np.int64)])
+    return c,l,co,ss
+
+
+def canonical_products(c,cos,sss):
+    """Sort the products with the same number of factors, given as the
+    rows of the arrays of codes and sites, and merge the equal ones"""
+    n,L = cos.shape
+    isf = np.isin(cos,multioperator.get_codes(fermions)) # fermions
+    sign = np.ones(n) # sign of the permutation of fermions
+    for p in range(L): # loop over pairs of factors
+        for q in range(p+1,L):
+            swap = (sss[:,p]>sss[:,q]) & isf[:,p] & isf[:,q]
+            sign[swap] *= -1
+    order = np.argsort(sss,axis=1,kind="stable") # sort by site
+    cos = np.take_along_axis(cos,order,axis=1)
+    sss = np.take_along_axis(sss,order,axis=1)
+    c = c*sign
+    if L>1: # squares of nilpotent operators
+        isn = np.isin(cos,multioperator.get_codes(nilpotent))
+        sq = (cos[:,1:]==cos[:,:-1]) & (sss[:,1:]==sss[:,:-1]) & isn[:,1:]
+        c = c*(~np.any(sq,axis=1)) # those are zero
+    return merge_products(c,cos,sss)
+
+
+def merge_products(c,cos,sss):
+    """Merge the equal products with the same number of factors, given as
+    the rows of the arrays of codes and sites"""
+    n,L = cos.shape
+    if n==0 or L==0: keys = np.zeros((n,1),dtype=np.int64) # all equal
+    else: # a single integer for each factor
+        bs = int(sss.max()).bit_length() # bits of the sites
+        keys = (cos<<bs) | sss
+        w = int(keys.max()).bit_length() # bits of a factor
+        if L*w<63: # a single integer for each row
+            keys = np.sum(keys<<(w*np.arange(L-1,-1,-1)),axis=1)[:,None]
+    if keys.shape[1]==1: order = np.argsort(keys[:,0]) # sort the rows
+    else: order = np.lexsort(keys.T[::-1])
+    keys = keys[order]
+    new = np.ones(n,dtype=bool) # first row of each group of equal ones
+    new[1:] = np.any(keys[1:]!=keys[:-1],axis=1)
+    inv = np.zeros(n,dtype=np.int64) # group of each row
+    inv[order] = np.cumsum(new)-1
+    first = order[new] # a row of each group
+    cr = np.bincount(inv,weights=c.real,minlength=len(first))
+    ci = np.bincount(inv,weights=c.imag,minlength=len(first))
+    return cr+1j*ci,cos[first],sss[first]
+
+
+def canonicalize(MO,tol=1e-8):
+    """Return the canonical form of a multioperator"""
+    (c,off,co,ss) = MO.get_arrays()
+    (c,l,co,ss) = remove_identities(c,off,co,ss)
+    return group_products(MO,c,l,co,ss,canonical_products,tol)
+
+
+def merge(MO,tol=1e-8):
+    """Merge the equal products of a multioperator, without reordering
+    their factors"""
+    (c,off,co,ss) = MO.get_arrays()
+    return group_products(MO,c,off[1:]-off[:-1],co,ss,merge_products,tol)
+
+
+def group_products(MO,c,l,co,ss,f,tol):
+    """Apply a function to the products with the same number of factors,
+    and return the multioperator with the output"""
+    off = multioperator.get_offsets(l)
+    cs,ls,cos,sss = [],[],[],[] # output
+    for L in np.unique(l): # loop over number of factors
+        if np.all(l==L): # all the terms, no need to select them
+            (ci,coi,ssi) = f(c,co.reshape((-1,L)),ss.reshape((-1,L)))
+        else:
+            ts = np.where(l==L)[0] # terms with this number
+            inds = off[ts][:,None] + np.arange(L)[None,:] # factors
+            (ci,coi,ssi) = f(c[ts],co[inds],ss[inds])
+        keep = np.abs(ci)>tol # remove zeros
+        cs.append(ci[keep])
+        ls.append(np.full(np.sum(keep),L,dtype=np.int64))
+        cos.append(coi[keep].reshape(-1))
+        sss.append(ssi[keep].reshape(-1))
+    if len(cs)==0: return multioperator.MultiOperator(name=MO.name,term=False)
+    c,l = np.concatenate(cs),np.concatenate(ls)
+    co,ss = np.concatenate(cos),np.concatenate(sss)
+    return multioperator.from_arrays(c,multioperator.get_offsets(l),co,ss,
+            name=MO.name,tidy=False)
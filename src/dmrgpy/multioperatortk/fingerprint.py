@@ -0,0 +1,88 @@
+# fingerprints of multioperators
+#
+# The fingerprint of an operator sum_k c_k P_k is the 128-bit integer
+#   sum_k w(c_k) h(P_k) mod p
+# with p = 2^127-1, h(P) a hash of the product (names, sites and order
+# of the factors), and w(c) a hash of the exact bits of the coefficient.
+# It does not depend on the order of the terms, and the fingerprint of
+# the concatenation of two lists of terms is the sum of the fingerprints.
+# It is used as the key of cached results, so operators whose
+# coefficients differ in any bit have different fingerprints.
+
+import hashlib
+import numpy as np
+from .. import multioperator
+
+p = 2**127-1 # prime modulus
+name_table = [] # hashes of the names of the operators, for each code
+
+
+def digest(x):
+    """128-bit integer hash of a string or bytes"""
+    if type(x)==str: x = x.encode()
+    return int.from_bytes(hashlib.blake2b(x,digest_size=16).digest(),"little")
+
+
+def name_hashes():
+    """Arrays with two 64-bit hashes of the name of each code"""
+    global name_table
+    if len(name_table)<len(multioperator.names): # new names
+        name_table = [digest(n) for n in multioperator.names]
+    h = np.array(name_table,dtype=object)
+    return ((h>>64).astype(np.uint64),(h & (2**64-1)).astype(np.uint64))
+
+
+def mix(x):
+    """Mix the bits of 64-bit integers (splitmix64)"""
+    x = x ^ (x >> np.uint64(30))
+    x = x * np.uint64(0xbf58476d1ce4e5b9)
+    x = x ^ (x >> np.uint64(27))
+    x = x * np.uint64(0x94d049bb133111eb)
+    return x ^ (x >> np.uint64(31))
+
+
+def term_hashes(off,co,ss):
+    """Hashes of the products, as integers modulo p"""
+    with np.errstate(over="ignore"):
+        out = []
+        pos = np.arange(len(co)) - np.repeat(off[:-1],off[1:]-off[:-1])
+        for (k,hn) in enumerate(name_hashes()): # two 64-bit lanes
+            f = hn[co] ^ mix(ss.astype(np.uint64) + np.uint64(k+1))
+            f = mix(f + mix(pos.astype(np.uint64) + np.uint64(7))) # factors
+            cs = np.zeros(len(co)+1,dtype=np.uint64)
+            np.cumsum(f,out=cs[1:]) # sum the factors of each product
+            t = cs[off[1:]] - cs[off[:-1]] # sum for each term
+            out.append(mix(t + (off[1:]-off[:-1]).astype(np.uint64)))
+    return (out[0].astype(object)<<64 | out[1].astype(object)) % p
+
+
+def weights(c):
+    """Hash of the exact value of each coefficient, as integers modulo p"""
+    c = np.asarray(c,dtype=np.complex128) + 0.0 # no negative zeros
+    b = np.ascontiguousarray(c).view(np.uint64) # real and imaginary bits
+    (br,bi) = (b[0::2],b[1::2])
+    with np.errstate(over="ignore"):
+        w1 = mix(mix(br + np.uint64(0x9e3779b97f4a7c15)) ^ bi)
+        w2 = mix(mix(bi + np.uint64(0x632be59bd9b4e019)) ^ br)
+    return (w1.astype(object)<<64 | w2.astype(object)) % p
+
+
+def fingerprint(c,off,co,ss):
+    """Fingerprint of the arrays of a multioperator"""
+    if len(c)==0: return 0 # no terms
+    return int(np.dot(weights(c),term_hashes(off,co,ss))) % p
+
+
+def tree_fingerprint(tree):
+    """Fingerprint of a lazy operator (see lazy.py), without expanding it"""
+    if tree[0]=="sum": # linear
+        return sum([A.get_fingerprint() for A in tree[1]]) % p
+    elif tree[0]=="prod":
+        fs = [str(A.get_fingerprint()) for A in tree[1]]
+        return digest("prod_"+"_".join(fs)) % p
+    elif tree[0]=="scale":
+        w = weights(np.array([tree[1]],dtype=np.complex128))[0]
+        return digest("scale_"+str(w)+"_"+str(tree[2].get_fingerprint())) % p
+    elif tree[0]=="pow":
+        return digest("pow_"+str(tree[2])+"_"+str(tree[1].get_fingerprint())) % p
+    else: raise
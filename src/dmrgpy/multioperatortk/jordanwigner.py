@@ -1,3 +1,4 @@
+import numpy as np
 from .. import multioperator
 
 def obj2MO(a): return multioperator.obj2MO([a])
@@ -81,3 +82,84 @@ def product2jw(ns,inds):
 
 
 
+
+
+
+# direct transformation of the products, without multiplying
+# multioperators. A fermion in site s becomes F_0...F_{s-1} A_s, then
+# the operators are sorted by site, taking into account that F and A
+# anticommute in the same site, and the strings are simplified with
+# F F = 1, F A = A and F Adag = -Adag
+
+local = {"C":"A","Cdag":"Adag"} # fermions, and their local operators
+odd = ["A","Adag"] # local operators that anticommute with F
+products = dict() # products already transformed
+
+
+def product_jw(ns,ss):
+    """Transform a product of operators, given by their names and sites,
+    return the sign and the names and sites of the new product"""
+    key = (ns,ss)
+    if key in products: return products[key] # already computed
+    isf = [n in local for n in ns] # fermionic operators
+    ns = [local.get(n,n) for n in ns] # local operators
+    sign = 1
+    for j in range(len(ns)): # the strings of fermions move to the left
+        if not isf[j]: continue
+        for k in range(j): # across anticommuting operators in their site
+            if ns[k] in odd and ss[k]<ss[j]: sign = -sign
+    # sites with an odd number of F, below an odd number of fermions
+    fs = sorted([s for (s,f) in zip(ss,isf) if f],reverse=True)
+    fs.append(0) # last interval
+    strings = set()
+    for p in range(0,len(fs)-1,2): strings.update(range(fs[p+1],fs[p]))
+    # group the operators by site, the F of each site goes first
+    order = sorted(range(len(ns)),key=lambda k: ss[k]) # stable sort
+    sites = sorted(strings.union(ss)) # sites in the output
+    nout,sout = [],[]
+    k = 0 # position in the sorted operators
+    for s in sites:
+        g = [] # operators in this site
+        while k<len(order) and ss[order[k]]==s: 
+            g.append(ns[order[k]])
+            k += 1
+        if s in strings: # absorb the F
+            if len(g)>0 and g[0]=="A": pass # F A = A
+            elif len(g)>0 and g[0]=="Adag": sign = -sign # F Adag = -Adag
+            else: g = ["F"] + g
+        nout += g
+        sout += [s]*len(g)
+    out = (sign,nout,sout)
+    if len(products)>100000: products.clear() # do not grow forever
+    products[key] = out
+    return out
+
+
+def jordan_wigner(MO):
+    """Jordan-Wigner transformation of a multioperator"""
+    from ..multioperator import names,get_codes,from_arrays,get_offsets
+    (c,off,co,ss) = MO.get_arrays()
+    fcodes = get_codes(list(local)) # codes of the fermions
+    isf = np.isin(co,fcodes) # fermionic factors
+    l = off[1:]-off[:-1] # factors of each term
+    tid = np.repeat(np.arange(len(c)),l) # term of each factor
+    hasf = np.bincount(tid,weights=isf,minlength=len(c))>0 # with fermions
+    if not np.any(hasf): return MO # nothing to do
+    keep = ~hasf[tid] # factors of terms without fermions
+    cs,ls,cos,sss = [c[~hasf]],[l[~hasf]],[co[keep]],[ss[keep]]
+    co,ss,off = co.tolist(),ss.tolist(),off.tolist()
+    c2,l2,co2,ss2 = [],[],[],[]
+    for t in np.where(hasf)[0].tolist(): # loop over fermionic terms
+        ns = tuple([names[i] for i in co[off[t]:off[t+1]]])
+        (sign,nt,st) = product_jw(ns,tuple(ss[off[t]:off[t+1]]))
+        c2.append(sign*c[t])
+        l2.append(len(nt))
+        co2 += nt
+        ss2 += st
+    cs.append(np.array(c2,dtype=np.complex128))
+    ls.append(np.array(l2,dtype=np.int64))
+    cos.append(get_codes(co2))
+    sss.append(np.array(ss2,dtype=np.int64))
+    l = np.concatenate(ls)
+    return from_arrays(np.concatenate(cs),get_offsets(l),np.concatenate(cos),
+            np.concatenate(sss),name=MO.name,tidy=False)
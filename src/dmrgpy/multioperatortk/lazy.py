@@ -0,0 +1,183 @@
+# lazy multioperators, kept as expression trees
+#
+# Products of large operators have as many terms as the product of the
+# number of terms of the factors. Those products (and their sums,
+# multiples and powers) are kept as a tree in MultiOperator.tree, with
+# the forms
+#   ("sum",[A,B,...])   A + B + ...
+#   ("prod",[A,B,...])  A*B*..., applied from the right
+#   ("scale",c,A)       c*A
+#   ("pow",A,n)         A**n
+# Applied to a wavefunction, the tree is evaluated as a sequence of MPO
+# applications, and it is only expanded when its terms are needed.
+
+import numpy as np
+from .. import multioperator
+
+
+def node(tree):
+    """Multioperator with a certain tree"""
+    out = multioperator.MultiOperator(term=False)
+    out.tree = tree
+    return out
+
+
+def plain(A):
+    """Expanded version of a multioperator"""
+    if A.tree is None: return A
+    A.get_chunks() # expand the tree
+    out = A.copy()
+    out.tree,out.fp = None,None # fingerprint of the terms
+    return out
+
+
+def expand(tree):
+    """Expand a tree into a multioperator with all the terms"""
+    if tree[0]=="sum":
+        out = plain(tree[1][0])
+        for A in tree[1][1:]: out = out + plain(A)
+        return out
+    elif tree[0]=="prod":
+        out = plain(tree[1][0])
+        for A in tree[1][1:]: out = multioperator.multiply_arrays(out,plain(A))
+        return out
+    elif tree[0]=="scale": return plain(tree[2]).multiply_scalar(tree[1])
+    elif tree[0]=="pow":
+        out = multioperator.identity()
+        for i in range(tree[2]):
+            out = multioperator.multiply_arrays(out,plain(tree[1]))
+        return out
+    else: raise
+
+
+def nterms(A):
+    """Number of terms of the expanded multioperator"""
+    if A.tree is None:
+        n = sum([len(ch[0]) for ch in A.chunks[0:A.nchunks]])
+        if A.last is not None: n += 1 # term being built
+        return n
+    elif A.tree[0]=="sum": return sum([nterms(B) for B in A.tree[1]])
+    elif A.tree[0]=="prod": return int(np.prod([nterms(B) for B in A.tree[1]]))
+    elif A.tree[0]=="scale": return nterms(A.tree[2])
+    elif A.tree[0]=="pow": return nterms(A.tree[1])**A.tree[2]
+    else: raise
+
+
+def is_lazy(n):
+    """Check if an operator with n terms should be kept as a tree"""
+    return n>multioperator.lazy_terms
+
+
+def add(A,B):
+    """Sum of two multioperators, one of them a tree"""
+    ts = [] # terms of the sum
+    for X in [A,B]:
+        if X.tree is not None and X.tree[0]=="sum": ts += X.tree[1]
+        else: ts.append(X)
+    return node(("sum",ts))
+
+
+def product(A,B):
+    """Product of two multioperators, as a tree if it is large"""
+    if A.tree is None and B.tree is None and not is_lazy(nterms(A)*nterms(B)):
+        return multioperator.multiply_arrays(A,B) # expand it
+    fs = [] # factors of the product
+    for X in [A,B]:
+        if X.tree is not None and X.tree[0]=="prod": fs += X.tree[1]
+        else: fs.append(X)
+    return node(("prod",fs))
+
+
+def scale(c,A):
+    """Multiply a tree by a number"""
+    if A.tree[0]=="scale": return node(("scale",c*A.tree[1],A.tree[2]))
+    return node(("scale",c,A))
+
+
+def power(A,n):
+    """Power of a multioperator"""
+    if int(n)!=n or n<0: raise # only non-negative integers
+    n = int(n)
+    if n==0: return multioperator.identity()
+    if n==1: return A.copy()
+    if A.tree is None and not is_lazy(nterms(A)**n):
+        return expand(("pow",A,n)) # expand it
+    return node(("pow",A,n))
+
+
+def dagger(A):
+    """Dagger of a tree"""
+    t = A.tree
+    if t[0]=="sum": return node(("sum",[B.get_dagger() for B in t[1]]))
+    elif t[0]=="prod":
+        return node(("prod",[B.get_dagger() for B in reversed(t[1])]))
+    elif t[0]=="scale": return node(("scale",np.conjugate(t[1]),t[2].get_dagger()))
+    elif t[0]=="pow": return node(("pow",t[1].get_dagger(),t[2]))
+    else: raise
+
+
+def split_sum(ts):
+    """Sum of the expanded terms of a sum, and list of the other ones"""
+    P = [A for A in ts if A.tree is None] # expanded ones
+    L = [A for A in ts if A.tree is not None] # trees
+    if len(P)==0: return None,L
+    out = P[0]
+    for A in P[1:]: out = out + A # sum them
+    return out,L
+
+
+def apply(MBO,A,wf,c=1.0):
+    """Compute c*A|wf>, with A a tree"""
+    if A.tree is None: # expanded operator
+        if c!=1.0: A = c*A
+        return MBO.applyoperator(A,wf)
+    t = A.tree
+    if t[0]=="scale": return apply(MBO,t[2],wf,c*t[1])
+    elif t[0]=="sum":
+        P,L = split_sum(t[1]) # expanded operators in a single MPO
+        wfs = [apply(MBO,B,wf,c) for B in L]
+        if P is not None: wfs = [apply(MBO,P,wf,c)] + wfs
+        if len(wfs)==1: return wfs[0]
+        return MBO.linear_combination(np.ones(len(wfs)),wfs) # sum them
+    elif t[0]=="prod":
+        for B in reversed(t[1][1:]): wf = apply(MBO,B,wf) # from the right
+        return apply(MBO,t[1][0],wf,c)
+    elif t[0]=="pow":
+        for i in range(t[2]-1): wf = apply(MBO,t[1],wf)
+        return apply(MBO,t[1],wf,c)
+    else: raise
+
+
+def aMb(MBO,wf1,A,wf2):
+    """Compute <wf1|A|wf2>, with A a tree"""
+    if A.tree is None: return MBO.aMb(wf1,A,wf2) # expanded operator
+    t = A.tree
+    if t[0]=="scale": return t[1]*aMb(MBO,wf1,t[2],wf2)
+    elif t[0]=="sum":
+        P,L = split_sum(t[1]) # expanded operators in a single MPO
+        out = sum([aMb(MBO,wf1,B,wf2) for B in L])
+        if P is not None: out += aMb(MBO,wf1,P,wf2)
+        return out
+    elif t[0]=="prod": # apply all the factors but the last one
+        for B in reversed(t[1][1:]): wf2 = apply(MBO,B,wf2)
+        return aMb(MBO,wf1,t[1][0],wf2)
+    elif t[0]=="pow":
+        for i in range(t[2]-1): wf2 = apply(MBO,t[1],wf2)
+        return aMb(MBO,wf1,t[1],wf2)
+    else: raise
+
+
+def vev(MBO,A,wf):
+    """Compute <wf|A|wf>, with A a tree"""
+    if A.tree is None: return MBO.vev(A,wf=wf) # expanded operator
+    t = A.tree
+    if t[0]=="scale": return t[1]*vev(MBO,t[2],wf)
+    elif t[0]=="sum":
+        P,L = split_sum(t[1]) # expanded operators in a single MPO
+        out = sum([vev(MBO,B,wf) for B in L])
+        if P is not None: out += vev(MBO,P,wf)
+        return out
+    elif t[0]=="pow" and t[1].tree is None: # powers in the backend
+        return MBO.vev(t[1],wf=wf,npow=t[2])
+    else: # normalized, as the VEV in the backend
+        return aMb(MBO,wf,A,wf)/MBO.overlap(wf,wf)
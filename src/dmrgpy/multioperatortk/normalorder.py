@@ -0,0 +1,107 @@
+# normal ordering of fermionic multioperators
+#
+# The products of C, Cdag and N (written as Cdag C) are reordered with
+# all the Cdag on the left, sorted by increasing site, and the C on the
+# right, sorted by decreasing site, so the dagger of a normal ordered
+# product is normal ordered too. Each exchange of two fermions changes
+# the sign, and exchanging C_i Cdag_i gives the additional product
+# without both operators. Products with two equal operators vanish, and
+# the equal products are merged. Terms with other operators are kept.
+
+import numpy as np
+from .. import multioperator
+from . import canonical
+
+fermions = ["C","Cdag","N"] # operators that are normal ordered
+
+
+def expand_densities(c,l,co,ss):
+    """Write each N as Cdag C"""
+    (cC,cCd,cN) = multioperator.get_codes(fermions)
+    isn = co==cN # densities
+    if not np.any(isn): return c,l,co,ss
+    rep = np.where(isn,2,1) # number of factors for each one
+    tid = np.repeat(np.arange(len(c)),l) # term of each factor
+    l = np.bincount(tid,weights=rep,minlength=len(c)).astype(np.int64)
+    idx = np.repeat(np.arange(len(co)),rep) # original factor
+    first = np.ones(len(idx),dtype=bool) # first copy of the factor
+    first[1:] = idx[1:]!=idx[:-1]
+    co,ss = co[idx],ss[idx]
+    co[isn[idx] & first] = cCd # N = Cdag C
+    co[isn[idx] & ~first] = cC
+    return c,l,co,ss
+
+
+def sort_products(c,cos,sss,S):
+    """Sort the products with the same number of factors, given as rows
+    of the arrays of codes and sites. Return the sorted products and the
+    products generated by the anticommutators, with two factors less"""
+    (cC,cCd,cN) = multioperator.get_codes(fermions)
+    n,L = cos.shape
+    cos,sss,c = cos.copy(),sss.copy(),c.copy()
+    new = [] # products from the anticommutators
+    for p in range(L): # odd-even transposition sort
+        for k in range(p%2,L-1,2): # pairs of neighbors
+            key = np.where(cos[:,k:k+2]==cCd,sss[:,k:k+2],2*S-sss[:,k:k+2])
+            swap = key[:,0]>key[:,1] # not ordered
+            if not np.any(swap): continue
+            delta = swap & (cos[:,k]==cC) & (sss[:,k]==sss[:,k+1])
+            if np.any(delta): # C_i Cdag_i = 1 - Cdag_i C_i
+                keep = np.delete(np.arange(L),[k,k+1])
+                new.append((c[delta],cos[delta][:,keep],sss[delta][:,keep]))
+            c[swap] *= -1 # anticommute
+            cos[swap,k],cos[swap,k+1] = cos[swap,k+1],cos[swap,k].copy()
+            sss[swap,k],sss[swap,k+1] = sss[swap,k+1],sss[swap,k].copy()
+    if L>1: # products with two equal operators vanish
+        eq = (cos[:,1:]==cos[:,:-1]) & (sss[:,1:]==sss[:,:-1])
+        c = c*(~np.any(eq,axis=1))
+    return (c,cos,sss),new
+
+
+def normal_order(MO,tol=1e-8):
+    """Return the normal ordered form of a multioperator"""
+    (c,off,co,ss) = MO.get_arrays()
+    (c,l,co,ss) = canonical.remove_identities(c,off,co,ss)
+    nt = len(c) # number of terms
+    tid = np.repeat(np.arange(nt),l) # term of each factor
+    isf = np.isin(co,multioperator.get_codes(fermions))
+    pure = np.bincount(tid,weights=~isf,minlength=nt)==0 # only fermions
+    fpure = pure[tid] # factors of those terms
+    out = [(c[~pure],l[~pure],co[~fpure],ss[~fpure])] # other terms
+    (c,l,co,ss) = expand_densities(c[pure],l[pure],co[fpure],ss[fpure])
+    S = int(ss.max())+1 if len(ss)>0 else 1 # number of sites
+    off = multioperator.get_offsets(l)
+    pools = dict() # products with each number of factors
+    for L in np.unique(l):
+        ts = np.where(l==L)[0]
+        inds = off[ts][:,None] + np.arange(L)[None,:] # factors
+        pools[int(L)] = [(c[ts],co[inds],ss[inds])]
+    while len(pools)>0: # from the longest products
+        L = max(pools.keys())
+        ps = pools.pop(L)
+        ci = np.concatenate([p[0] for p in ps])
+        if L==0: # identities
+            ids = multioperator.get_codes(["Id"]*len(ci))
+            out.append((ci,np.ones(len(ci),dtype=np.int64),ids,
+                np.ones(len(ci),dtype=np.int64)))
+            continue
+        coi = np.concatenate([p[1] for p in ps]).reshape((-1,L))
+        ssi = np.concatenate([p[2] for p in ps]).reshape((-1,L))
+        (ci,coi,ssi),new = sort_products(ci,coi,ssi,S)
+        out.append((ci,np.full(len(ci),L,dtype=np.int64),
+            coi.reshape(-1),ssi.reshape(-1)))
+        if len(new)>0: pools.setdefault(L-2,[]).extend(new)
+    (c,l,co,ss) = [np.concatenate([o[i] for o in out]) for i in range(4)]
+    l = l.astype(np.int64)
+    out = multioperator.from_arrays(c,multioperator.get_offsets(l),
+            co.astype(np.int64),ss.astype(np.int64),name=MO.name,tidy=False)
+    out = canonical.merge(out,tol=tol) # merge the equal products
+    out.herm = MO.herm # same operator
+    return out
+
+
+def reduce_terms(MO,tol=1e-8):
+    """Normal ordered form, if it has less terms than the original"""
+    out = normal_order(MO,tol=tol)
+    if len(out.get_arrays()[0])<len(MO.get_arrays()[0]): return out
+    return MO
@@ -18,15 +18,14 @@ class StaticOperator():
 
 def pure_applyoperator_dmrg(self,A,wf):
     """Apply a pure operator to a many body wavefunction"""
-    self.execute(lambda: wf.write(name="pureapplyoperator_wf1.mps")) 
     task = {"pureapplyoperator":"true",
-            "pureapplyoperator_wf0":"pureapplyoperator_wf1.mps",
+            "pureapplyoperator_wf0":wf.name,
             "pureapplyoperator_operator":"pureapplyoperator_operator.mpo",
             "pureapplyoperator_wf1":"pureapplyoperator_wf1.mps",
             }
-    self.execute(lambda: open(self.path+"/pureapplyoperator_operator.mpo","wb").write(A))
+    open(self.filename("pureapplyoperator_operator.mpo"),"wb").write(A)
     self.task = task
-    self.execute(lambda : self.run()) # run calculation
+    self.run() # run calculation
     return MPS(self,name="pureapplyoperator_wf1.mps").copy() # copy
 
 
@@ -36,9 +35,9 @@ def generate_SO(A,MBO):
             "gen_pureoperator_operator_in":"gen_pureoperator_operator.in",
             "gen_pureoperator_operator_out":"gen_pureoperator_operator.mpo",
             }
-    MBO.execute(lambda: A.write(name="gen_pureoperator_operator.in"))
+    A.write(name=MBO.filename("gen_pureoperator_operator.in"))
     MBO.task = task
-    MBO.execute(lambda : MBO.run()) # run calculation
-    return open(MBO.path+"/gen_pureoperator_operator.mpo","rb").read() 
+    MBO.run() # run calculation
+    return open(MBO.filename("gen_pureoperator_operator.mpo"),"rb").read() 
 
 
@@ -1,6 +1,5 @@
 from sympy import *
 import numbers
-from .. import multioperator as classicMO
 
 class MultiOperator(Symbol):
     """Multioperator class"""
@@ -13,7 +12,7 @@ class MultiOperator(Symbol):
         return self*c
     def write(self,*args):
         """Write in file"""
-        return classicMO.write_ampo(symbol2MO(self,*args))
+        return symbol2MO(self).write(*args) # binary format
 
 
 def simplifyMO(self):
@@ -9,8 +9,8 @@ def random_mps_dummy(self,normalize=True):
     task = {"random_mps":"true",
             }
     self.task = task
-    self.execute( lambda : taskdmrg.write_tasks(self)) # write tasks
-    self.execute( lambda : self.run()) # run calculation
+    taskdmrg.write_tasks(self) # write tasks
+    self.run() # run calculation
     out = MPS(self,name="random.mps").copy() # copy
     norm = np.sqrt(out.overlap(out))
     return (1./norm)*out # return the eigenvector 
@@ -0,0 +1,15 @@
+# read the results written by the backends
+
+import numpy as np
+
+magic = b"\x93NUMPY" # first bytes of a .npy file
+
+
+def read(name):
+    """Read a list of complex numbers, either from a binary or text file"""
+    f = open(name,"rb")
+    binary = f.read(len(magic))==magic # check the format
+    f.close()
+    if binary: return np.load(name) # binary .npy file
+    m = np.genfromtxt(name).reshape(-1,2) # text file with two columns
+    return m[:,0] + 1j*m[:,1] # return complex numbers
@@ -5,6 +5,8 @@ from .algebra import algebra
 from . import effectivehamiltonian
 from . import pychainwrapper
 from . import multioperator
+from . import funtk
+from .multioperatortk.builder import HamiltonianBuilder
 
 class Coupling():
   def __init__(self,i,j,g):
@@ -53,11 +55,12 @@ class Spin_Chain(Many_Body_Chain):
     def SS(self,i,j):
         return self.Sx[i]*self.Sx[j] + self.Sy[i]*self.Sy[j] + self.Sz[i]*self.Sz[j]
     def set_fields(self,fun):
-        h = 0
-        for i in range(self.ns):
-            b = fun(i)
-            for j in range(3):  h = h + b[j]*self.Si[j][i]
-        self.fields = h
+        """Set the magnetic fields, fun can be a function fun(i) or an
+        N x 3 array"""
+        b = funtk.obj2array(fun,(self.ns,)) # fields in each site
+        hb = HamiltonianBuilder() # sum all the terms at once
+        hb.add_fields(b,self.Si)
+        self.fields = hb.get_operator()
         self.hamiltonian = self.exchange + self.fields # update Hamiltonian
     def test(self,ntries=3,**kwargs):
         """Check the anticommunation relations"""
@@ -71,18 +74,20 @@ class Spin_Chain(Many_Body_Chain):
             if i==j: op = op - 1j*Sz[i]
             if not self.is_zero_operator(op,**kwargs): raise
     def set_exchange(self,fun):
-        """Set the exchange coupling between sites"""
-        h = 0
-        for i in range(self.ns): # loop
-          for j in range(self.ns):  # loop
-            g = fun(i,j).real # call the function
-            if np.sum(np.abs(fun(i,j)-fun(j,i)))>1e-5: raise # something wrong
-            one = np.identity(3) # identity matrix
-            g = g*one # multiply by the identity
-            for ii in range(3):
-              for jj in range(3):
-                  h = h + g[ii,jj]*self.Si[ii][i]*self.Si[jj][j]
-        self.exchange = h # exchange matrix
+        """Set the exchange coupling between sites, fun can be a function
+        fun(i,j) or an array, with numbers or 3x3 matrices as entries.
+        A matrix J_ij gives sum_ab J_ij[a,b] S^a_i S^b_j, with all its
+        entries (older versions only kept the diagonal), and it must
+        fulfill J_ji = J_ij^T"""
+        g = funtk.obj2array(fun,(self.ns,self.ns)) # couplings
+        gt = g.swapaxes(0,1) # couplings J_ji
+        if g.ndim==4: gt = gt.swapaxes(2,3) # transpose the matrices
+        if np.max(np.abs(g-gt))>1e-5: raise # something wrong
+        g = g.real
+        if g.ndim==2: g = g[:,:,None,None]*np.identity(3) # isotropic
+        hb = HamiltonianBuilder() # sum all the terms at once
+        hb.add_exchange(g,self.Si)
+        self.exchange = hb.get_operator() # exchange matrix
         self.hamiltonian = self.exchange + self.fields # update Hamiltonian
     def get_ED_obj(self):
         if self.has_ED_obj: 
@@ -97,9 +102,8 @@ class Spin_Chain(Many_Body_Chain):
         from . import pychainwrapper
         return pychainwrapper.get_full_hamiltonian(self)
     def get_magnetization(self,**kwargs):
-        mx = [self.vev(self.Sx[i],**kwargs) for i in range(self.ns)]
-        my = [self.vev(self.Sy[i],**kwargs) for i in range(self.ns)]
-        mz = [self.vev(self.Sz[i],**kwargs) for i in range(self.ns)]
+        ms = self.vev_many(self.Sx+self.Sy+self.Sz,**kwargs) # all at once
+        (mx,my,mz) = ms.reshape((3,self.ns))
         np.savetxt("MAGNETIZATION.OUT",np.array([mx,my,mz]).T)
         return np.array([mx,my,mz]).real
     def get_effective_hamiltonian(self,**kwargs):
@@ -39,34 +39,71 @@ def select_task(self,mode="GS"):
 
 
 
-def write_tasks(self):
-  fo = open("tasks.in","w")
-  fo.write("tasks\n{\n")
-  #
-  if self.use_ampo_hamiltonian: 
-      fo.write(" use_ampo_hamiltonian = true\n")
+# type of the entries of tasks.in, shared with the backends
+# (check_task.h and get_input.jl), other entries are written as strings
+schema = {
+    "maxm":int, "mpomaxm":int, "nsweeps":int, "noise":float, "cutoff":float,
+    "binary_results":bool, "mpo_cache":bool, "use_ampo_hamiltonian":bool,
+    "gs_from_file":bool, "starting_file_gs":str, "skip_dmrg_gs":bool,
+    "sites_from_file":bool, "batch":bool, "batch_n":int,
+    "batch_tasks":list, # list of dictionaries, one per task of the batch
+    "pow_vev":int, "tevol_nt":int, "tevol_dt":float,
+    "kpm_num_polynomials":int, "cvm_nit":int, "cvm_tol":float,
+    "vev_many_n":int, "matrix_elements_hermitian":bool,
+    }
+
+
+def get_parameters(self):
+  """Parameters common to all the tasks"""
+  out = dict()
+  if self.use_ampo_hamiltonian: out["use_ampo_hamiltonian"] = True
   if self.gs_from_file and self.wf0 is not None: 
-      self.execute(self.wf0.write) # write WF
-      fo.write(" gs_from_file = true\n")
-      fo.write(" starting_file_gs = "+self.wf0.name+"\n") # starting WF
-      fo.write(" skip_dmrg_gs = "+obj2str(self.skip_dmrg_gs)+"\n") # starting WF
-  else: fo.write(" gs_from_file = false\n")
-  for key in self.task:
-    fo.write(key+" = "+obj2str(self.task[key])+"\n")
-  if self.sites_from_file: 
-      fo.write(" sites_from_file = true\n")
-#("GS = true\ngap = false\ncorrelator = false\n}\n")
+      out["gs_from_file"] = True
+      out["starting_file_gs"] = self.wf0.name # starting WF
+      out["skip_dmrg_gs"] = self.skip_dmrg_gs # use it as it is
+  else: out["gs_from_file"] = False
+  if self.sites_from_file: out["sites_from_file"] = True
   # parameters of dmrg algorithm
-  fo.write(" maxm = "+str(self.maxm)+"\n") # maximum bond dimension
-  fo.write(" mpomaxm = "+str(self.mpomaxm)+"\n") # maximum bond dimension
-  fo.write(" noise = "+str(self.noise)+"\n") # maximum bond dimension
-  fo.write(" cutoff = "+str(self.cutoff)+"\n") # maximum discarded weight
-  fo.write(" nsweeps = "+str(self.nsweeps)+"\n") # maximum discarded weight
-  ### this is a special addition to allow for generic interactions ###
-  fo.write("}\n")
+  out["maxm"] = self.maxm # maximum bond dimension
+  out["mpomaxm"] = self.mpomaxm # maximum bond dimension of the MPO
+  out["noise"] = self.noise # noise
+  out["cutoff"] = self.cutoff # maximum discarded weight
+  out["nsweeps"] = self.nsweeps # number of sweeps
+  out["binary_results"] = self.binary_results # format of the results
+  out["mpo_cache"] = self.mpo_cache # reuse MPOs
+  return out
+
+
+def write_tasks(self,name="tasks.in"):
+  """Write the tasks and parameters in a file, read once by the backend"""
+  params = get_parameters(self) # common parameters
+  tasks = [] # tasks of a batch
+  for key in self.task:
+    if schema.get(key,None)==list: tasks = self.task[key]
+    else: params[key] = self.task[key] # overwrite
+  fo = open(self.filename(name),"w")
+  write_group(fo,"tasks",params) # common parameters
+  for (i,task) in enumerate(tasks): # parameters of each task
+    write_group(fo,"task_"+str(i),task)
   fo.close()
 
 
+def write_group(fo,name,d):
+  """Write a group of entries in a file"""
+  fo.write(name+"\n{\n")
+  for key in d: fo.write(" "+key+" = "+value2str(key,d[key])+"\n")
+  fo.write("}\n")
+
+
+def value2str(key,a):
+  """Convert an entry into a string, with the type of the schema"""
+  t = schema.get(key,None) # type of this entry
+  if t==bool and type(a)==str: a = a.lower() in ["true","yes","t","y","1"]
+  elif t==int: a = int(float(a)) # integer
+  elif t in [float,bool,str]: a = t(a) # enforce the type
+  return obj2str(a)
+
+
 
 def obj2str(a):
     """
@@ -50,7 +50,7 @@ class Thermal_Spin_Chain():
             self.MBChain.hamiltonian = self.hamiltonian # overwrite
             return wf0
     def set_hamiltonian(self,h):
-        self.hamiltonian = (h + h.get_dagger())/2.
+        self.hamiltonian = h.hermitian_part()
         self.computed_gs = False
 
                 
@@ -31,16 +31,16 @@ def evolution_dmrg_DC(self,name="XX",nt=10000,dt=0.1,restart=True,**kwargs):
             "tevol_dt":str(dt),
             }
     self.task = task # override tasks
-    if restart: # restart the calculation
-      self.execute(lambda: os.system("cp psi_GS.mps psi_time_evolution.mps"))
+    if restart and self.wf0 is not None: # restart the calculation
+      self.wf0.write(name="psi_time_evolution.mps")
     name[0] = name[0].get_dagger()
-    self.execute(lambda: name[0].write(name="dc_multioperator_i.in"))
-    self.execute(lambda: name[1].write(name="dc_multioperator_j.in"))
-    self.execute( lambda : taskdmrg.write_tasks(self)) # write tasks
-    self.execute( lambda : self.run()) # run calculation
-    cs = self.get_file("TIME_EVOLUTION.OUT").transpose() # time evolution
+    name[0].write(name=self.filename("dc_multioperator_i.in"))
+    name[1].write(name=self.filename("dc_multioperator_j.in"))
+    taskdmrg.write_tasks(self) # write tasks
+    self.run() # run calculation
+    cs = self.get_results("TIME_EVOLUTION.OUT") # time evolution
     ts = np.array([dt*ii for ii in range(nt)]) # times
-    return ts,cs[0].real-1j*cs[1] # return
+    return ts,np.conjugate(cs) # return
 
 
 
@@ -70,14 +70,14 @@ def evolve_and_measure_dmrg(self,operator=None,nt=1000,h=None,
             }
     self.task = task # override tasks
     if wf is None: wf = self.wf0 # get ground state
-    wf.write(name="psi_evolve_and_measure.mps") # copy wavefunction
-    self.execute(lambda: h.write(name="hamiltonian.in"))
-    self.execute(lambda: operator.write(name="time_evolution_multioperator.in"))
-    self.execute( lambda : taskdmrg.write_tasks(self)) # write tasks
-    self.execute( lambda : self.run()) # run calculation
-    cs = self.get_file("TIME_EVOLUTION.OUT").transpose() # time evolution
+    task["evolve_and_measure_wf"] = wf.name # wavefunction to evolve
+    h.write(name=self.filename("hamiltonian.in"))
+    operator.write(name=self.filename("time_evolution_multioperator.in"))
+    taskdmrg.write_tasks(self) # write tasks
+    self.run() # run calculation
+    cs = self.get_results("TIME_EVOLUTION.OUT") # time evolution
     ts = np.array([dt*ii for ii in range(int(nt))]) # times
-    return ts,cs[0].real-1j*cs[1] # return
+    return ts,np.conjugate(cs) # return
 
 
 def evolution_ABA(self,A=None,B=None,mode="DMRG",wf=None,**kwargs):
@@ -28,17 +28,43 @@ def multi_vev(self,MO,wf=None,npow=1,**kwargs):
     if MO.name!="vev_multioperator": raise
     if npow==0: return 1.0
     if wf is None: wf = self.get_gs() # get the ground state
-    wf.write(name="wf_vev.mps") # write wavefunction
-    taskd = MO.get_dict() # get the dictionary
-    self.task["vev"] = "true" # do a VEV
-    self.task["wf_vev"] = "wf_vev.mps" # WF to use VEV
-    self.task["pow_vev"] = int(npow) # power
-    self.write_task() # write the tasks in a file
-    self.write_hamiltonian() # write the Hamiltonian to a file
-    self.execute(lambda: MO.write()) # write multioperator
-    self.run() # perform the calculation
-    m = self.execute(lambda: np.genfromtxt("VEV.OUT"))
-    return m[0]+1j*m[1] # return result
+    if MO.tree is not None: # lazy operator, as a sequence of MPOs
+        from .multioperatortk import lazy
+        return lazy.vev(self,MO**npow,wf)
+    def f(): # compute it
+        self.task = {"vev":"true", # do a VEV
+                "wf_vev":wf.name, # WF to use VEV
+                "pow_vev":int(npow), # power
+                }
+        self.write_hamiltonian() # write the Hamiltonian to a file
+        MO.write(name=self.filename(MO.name+".in")) # write multioperator
+        self.run() # perform the calculation
+        return self.get_results("VEV.OUT")[0] # return result
+    return self.cached(self.cache_key(("vev",int(npow)),MO,wf),f)
+
+
+def vev_many(self,MOs,wf=None,npow=1,**kwargs):
+    """
+    Compute the VEVs of a list of multioperators with the same
+    wavefunction, in a single run of the backend
+    """
+    MOs = [multioperator.obj2MO(A,name="vev_multioperator") 
+            if type(A)!=multioperator.MultiOperator else A for A in MOs]
+    if wf is None: wf = self.get_gs() # get the ground state
+    if npow!=1 or self.itensor_version in ["julia","Julia","jl"] or \
+            any([A.tree is not None for A in MOs]): # one by one
+        return np.array([multi_vev(self,A,wf=wf,npow=npow) for A in MOs])
+    if len(MOs)==0: return np.zeros(0,dtype=np.complex128)
+    def f(): # compute them
+        self.task = {"vev_many":"true", # do several VEVs
+                "vev_many_wf":wf.name, # WF to use
+                "vev_many_n":len(MOs), # number of operators
+                }
+        for (i,A) in enumerate(MOs): # write the operators
+            A.write(name=self.filename("vev_many_"+str(i)+".in"))
+        self.run() # perform the calculation
+        return self.get_results("VEV_MANY.OUT") # return result
+    return np.array(self.cached(self.cache_key("vev_many",wf,*MOs),f))
 
 
 def vev(*args,**kwargs):
@@ -0,0 +1,30 @@
+# folders where the calculations of each object are performed
+
+import os
+import shutil
+import tempfile
+
+# root of the folders, it can be set with the DMRGPY_SCRATCH variable
+# (e.g. to a tmpfs or a fast local disk), otherwise the system default
+scratch = os.environ.get("DMRGPY_SCRATCH",None)
+
+
+def new():
+    """Create a new unique folder for a calculation"""
+    if scratch is not None: os.makedirs(scratch,exist_ok=True)
+    return tempfile.mkdtemp(prefix="dmrgpy_",dir=scratch)
+
+
+def copy(path):
+    """Create a new unique folder, with a copy of the files in path"""
+    out = new() # new folder
+    os.rmdir(out) # remove, so that it can be copied
+    shutil.copytree(path,out) # copy all the files
+    return out
+
+
+def remove(path):
+    """Stop the backend running in a folder, and remove it"""
+    from .cpprun import stop_worker
+    stop_worker(path) # stop the persistent process
+    shutil.rmtree(path,ignore_errors=True) # remove the folder
@@ -1,14 +1,15 @@
 import numpy as np
+import os
 from . import funtk
 from . import ampotk
 from . import multioperator
 
 def write_hamiltonian(self):
-    self.execute(lambda: write_sites(self)) # write the different sites
+    write_sites(self) # write the different sites
     if self.use_ampo_hamiltonian: # use Hamiltonian as an MPO
         if self.hamiltonian is not None: # Hamiltonian object created 
             h = self.hamiltonian
-            self.execute(lambda: h.write("hamiltonian.in"))
+            h.write(self.filename("hamiltonian.in"))
         else: ampotk.write_all(self)
     else: # conventional way
       raise # no longer used
@@ -23,7 +24,7 @@ def write_hamiltonian(self):
 
 def write_hubbard(self):
   """Write exchange in a file"""
-  fo = open("hubbard.in","w")
+  fo = open(self.filename("hubbard.in"),"w")
   cs = self.hubbard
   fo.write(str(len(cs))+"\n")
   for key in self.hubbard: # loop
@@ -39,7 +40,7 @@ def write_hubbard(self):
 
 def write_hoppings(self):
   """Write exchange in a file"""
-  fo = open("hoppings.in","w")
+  fo = open(self.filename("hoppings.in"),"w")
   cs = self.hoppings
   fo.write(str(len(cs))+"\n")
   for key in self.hoppings: # loop
@@ -58,7 +59,7 @@ def write_hoppings(self):
 
 def write_spinful_hoppings(self):
   """Write exchange in a file"""
-  fo = open("spinful_hoppings.in","w")
+  fo = open(self.filename("spinful_hoppings.in"),"w")
   cs = self.spinful_hoppings
   if type(cs)==type(dict()): # dictionary type
     fo.write(str(4*len(cs))+"\n")
@@ -99,7 +100,7 @@ def write_pairing(self):
   Write pairings in a file
   """
   cs = funtk.fun2list(self.pairing,self.ns) # get the list with couplings
-  fo = open("pairing.in","w")
+  fo = open(self.filename("pairing.in"),"w")
   fo.write(str(len(cs))+"\n")
   for c in cs: # loop
     fo.write(str(c[0])+"  ")
@@ -118,7 +119,7 @@ def write_pairing(self):
 
 def write_fields(self):
   """Write fields in a file"""
-  fo = open("fields.in","w")
+  fo = open(self.filename("fields.in"),"w")
   fo.write(str(len(self.fields))+"\n")
   for i in range(len(self.fields)): # loop
     fo.write(str(i)+"  ")
@@ -128,9 +129,13 @@ def write_fields(self):
 
 
 def write_sites(self):
-  fo = open("sites.in","w")
-  fo.write(str(self.ns)+"\n") # write number of sites
-  for si in self.sites: fo.write(str(si)+"\n")
+  name = self.filename("sites.in")
+  out = str(self.ns)+"\n" # number of sites
+  for si in self.sites: out += str(si)+"\n"
+  if os.path.isfile(name): # do not rewrite if nothing changed
+    if open(name).read()==out: return
+  fo = open(name,"w")
+  fo.write(out)
   fo.close()
 
 
@@ -138,7 +143,7 @@ def write_sites(self):
 
 def write_exchange(self):
   """Write exchange in a file"""
-  fo = open("exchange.in","w")
+  fo = open(self.filename("exchange.in"),"w")
   cs = self.exchange
   out = [] # empty list
   stored = [] # empty list
@@ -189,7 +194,7 @@ def matrix2string(m):
 
 def write_sweeps(self):
   """Write sweep info"""
-  fo = open("sweeps.in","w")
+  fo = open(self.filename("sweeps.in"),"w")
   fo.write("sweeps\n{\n")
   fo.write("nsweeps = "+str(self.sweep["n"])+"\n")
   fo.write("maxm = "+str(self.sweep["maxm"])+"\n")
@@ -201,7 +206,7 @@ def write_sweeps(self):
 
 def write_vijkl(self):
   """Write exchange in a file"""
-  fo = open("vijkl.in","w")
+  fo = open(self.filename("vijkl.in"),"w")
   if self.vijkl is None: # nothing provided
       fo.write("0\n") 
   elif callable(self.vijkl): # function provided